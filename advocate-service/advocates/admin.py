@@ -1,19 +1,63 @@
 # advocates/admin.py
 from django.contrib import admin
-from .models import User, Specialization, AdvocateProfile, AdvocateTeam, TeamMember
+from casebridge_common.changelist import EstimatedCountAdminMixin
+
+from .models import User, DirectoryUser, Specialization, AdvocateProfile, AdvocateTeam, TeamMember
+
+# `users` belongs to user-service. Changelists below show user ids rather
+# than joining it, and search by email through the local directory replica.
+DIRECTORY_SEARCH_LIMIT = 100
+
+
+def directory_user_ids(search_term):
+    """Ids of the users whose email starts with `search_term`, from DirectoryUser; empty unless it looks like an email."""
+    term = search_term.strip()
+    if "@" not in term:
+        return []
+    return list(
+        DirectoryUser.objects.filter(email__istartswith=term, is_deleted=False)
+        .values_list("id", flat=True)[:DIRECTORY_SEARCH_LIMIT]
+    )
+
+
+class DirectorySearchMixin(EstimatedCountAdminMixin):
+    """
+    Also matches rows whose `directory_search_fields` hold the searched user
+    id, or the id of a user whose email starts with the searched text.
+    """
+    directory_search_fields = ()
+
+    def get_search_fields(self, request):
+        # Non-empty so the changelist shows its search box even without search_fields of its own.
+        return super().get_search_fields(request) or self.directory_search_fields
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        base = queryset
+        if self.search_fields:
+            queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        else:
+            queryset, may_have_duplicates = base.none(), False
+        user_ids = [int(term)] if term.isdigit() else directory_user_ids(term)
+        for field in self.directory_search_fields if user_ids else ():
+            queryset |= base.filter(**{f"{field}__in": user_ids})
+        return queryset, may_have_duplicates
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
-    list_display = ("id", "username", "email", "role")
-    search_fields = ("username", "email", "role")
-    readonly_fields = ("id", "username", "email", "role")
+class UserAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    list_display = ("id", "email", "role")
+    list_filter = ("role",)
+    search_fields = ("email",)
+    readonly_fields = ("id", "email", "role")
 
     def has_add_permission(self, request):
-        return False  
+        return False
 
     def has_delete_permission(self, request, obj=None):
-        return False  
+        return False
 
 
 @admin.register(Specialization)
@@ -24,10 +68,13 @@ class SpecializationAdmin(admin.ModelAdmin):
 
 
 @admin.register(AdvocateProfile)
-class AdvocateProfileAdmin(admin.ModelAdmin):
-    list_display = ("full_name", "user", "bar_council_id", "is_verified", "rating", "cases_count", "wins_count")
-    search_fields = ("full_name", "user__username", "bar_council_id")
+class AdvocateProfileAdmin(DirectorySearchMixin, admin.ModelAdmin):
+    list_display = ("full_name", "user_id", "bar_council_id", "is_verified", "rating", "cases_count", "wins_count")
+    search_fields = ("full_name", "=bar_council_id")
+    trigram_search_fields = ("full_name",)
+    directory_search_fields = ("user_id",)
     list_filter = ("is_verified",)
+    raw_id_fields = ("user",)
     filter_horizontal = ("specializations",)
     readonly_fields = ("cases_count", "wins_count", "created_at", "updated_at")
 
@@ -36,18 +83,20 @@ class AdvocateProfileAdmin(admin.ModelAdmin):
 class TeamMemberInline(admin.TabularInline):
     model = TeamMember
     extra = 1  # number of extra forms
-    autocomplete_fields = ("user",)
+    raw_id_fields = ("user",)
 
 
 @admin.register(AdvocateTeam)
-class AdvocateTeamAdmin(admin.ModelAdmin):
-    list_display = ("id", "lead", "created_at")
-    search_fields = ("lead__username",)
+class AdvocateTeamAdmin(DirectorySearchMixin, admin.ModelAdmin):
+    list_display = ("id", "lead_id", "created_at")
+    directory_search_fields = ("lead_id",)
+    raw_id_fields = ("lead",)
     inlines = [TeamMemberInline]
 
 
 
 @admin.register(TeamMember)
-class TeamMemberAdmin(admin.ModelAdmin):
-    list_display = ("team", "user", "joined_at")
-    search_fields = ("team__lead__username", "user__username")
+class TeamMemberAdmin(DirectorySearchMixin, admin.ModelAdmin):
+    list_display = ("id", "team_id", "user_id", "joined_at")
+    directory_search_fields = ("user_id", "team__lead_id")
+    raw_id_fields = ("team", "user")
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class AdvocatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'advocates'
+
+    def ready(self):
+        post_migrate.connect(_create_search_indexes, sender=self)
+
+
+def _create_search_indexes(sender, using, **kwargs):
+    from casebridge_common.changelist import ensure_admin_search_indexes
+
+    ensure_admin_search_indexes(using=using)
+
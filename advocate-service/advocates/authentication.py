@@ -1,37 +0,0 @@
-import jwt
-from django.conf import settings
-from rest_framework import authentication, exceptions
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
-
-class JWTAuthentication(authentication.BaseAuthentication):
-    def authenticate(self, request):
-        auth_header = request.headers.get('Authorization')
-
-        if not auth_header:
-            return None  
-
-        parts = auth_header.split()
-
-        if len(parts) != 2 or parts[0].lower() != 'bearer':
-            return None
-
-        token = parts[1]
-
-        try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        except jwt.ExpiredSignatureError:
-            raise exceptions.AuthenticationFailed('Token has expired')
-        except jwt.InvalidTokenError:
-            raise exceptions.AuthenticationFailed('Invalid token')
-
-        try:
-            user = User.objects.get(id=payload['user_id'])
-        except User.DoesNotExist:
-            raise exceptions.AuthenticationFailed('User not found')
-
-        if 'role' in payload:
-            user.role = payload['role']
-
-        return (user, None)
@@ -0,0 +1,113 @@
+# advocates/counters.py
+import datetime
+from collections import defaultdict
+
+from casebridge_common.rpc import rpc_client
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AdvocateProfile, AppliedCaseEvent, CaseCounterState
+
+CASE_COUNTS_TASK = "case_service.tasks.get_advocate_case_counts"
+WON = "Won"
+
+
+def case_event_deltas(events):
+    """
+    Folds case-service events into one (cases, wins) delta per advocate
+    user id. Events that cancel out (assigned and reassigned away within the
+    batch, a result flipped back) leave a zero delta.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for event in events:
+        if event["topic"] == "case.assigned":
+            if event["advocate_id"] is not None:
+                delta = deltas[int(event["advocate_id"])]
+                delta[0] += 1
+                delta[1] += bool(event["won"])
+            if event["previous_advocate_id"] is not None:
+                delta = deltas[int(event["previous_advocate_id"])]
+                delta[0] -= 1
+                delta[1] -= bool(event["previous_won"])
+        elif event["topic"] == "case.result_changed":
+            delta = deltas[int(event["advocate_id"])]
+            delta[1] += (event["result"] == WON) - (event["previous_result"] == WON)
+    return {user_id: tuple(delta) for user_id, delta in deltas.items() if any(delta)}
+
+
+def _locked_state():
+    # Every writer of the counters takes this lock first, so batches and reconciliations never interleave
+    CaseCounterState.objects.get_or_create(pk=1)
+    return CaseCounterState.objects.select_for_update().get(pk=1)
+
+
+def apply_case_events(events):
+    """
+    Applies a batch of case events to `cases_count` and `wins_count` as one
+    F() increment per advocate, in user id order so concurrent batches lock
+    rows in the same order. Returns the number of profiles updated.
+
+    Each event is applied once: events recorded in AppliedCaseEvent (an
+    earlier delivery, or counted by the last reconciliation's snapshot) and
+    events below the state's `event_floor` are skipped.
+    """
+    updated = 0
+    with transaction.atomic():
+        state = _locked_state()
+        batch = {int(event["id"]): event for event in events if int(event["id"]) >= state.event_floor}
+        for event_id in AppliedCaseEvent.objects.filter(id__in=batch).values_list("id", flat=True):
+            del batch[event_id]
+        for user_id, (cases, wins) in sorted(case_event_deltas(batch.values()).items()):
+            updated += AdvocateProfile.objects.filter(user_id=user_id).update(
+                cases_count=F("cases_count") + cases, wins_count=F("wins_count") + wins,
+            )
+        AppliedCaseEvent.objects.bulk_create(
+            [AppliedCaseEvent(id=event_id, payload=event) for event_id, event in batch.items()], ignore_conflicts=True,
+        )
+    return updated
+
+
+def reconcile_counters():
+    """
+    Recomputes every advocate's counters from case-service's case table and
+    writes back only the profiles that drifted. Returns the number of
+    profiles corrected.
+
+    The snapshot says which events it contains (see cases.events in
+    case-service). Applied events it does not contain yet are added on top
+    of it; events it contains that have not arrived yet are recorded, so
+    they are skipped when they do. The snapshot is taken before the lock,
+    so batches are only held up while the profiles are compared.
+    """
+    snapshot = rpc_client.call(CASE_COUNTS_TASK, timeout=settings.PERFORMANCE_COUNTERS_RPC_TIMEOUT)
+    since_id, listed = snapshot["since_id"], set(snapshot["event_ids"])
+    expected = {int(row["advocate_id"]): (row["cases"], row["wins"]) for row in snapshot["counts"]}
+    with transaction.atomic():
+        state = _locked_state()
+        if since_id is not None:
+            applied = AppliedCaseEvent.objects.filter(id__gte=since_id, payload__isnull=False).exclude(id__in=listed)
+            for user_id, (cases, wins) in case_event_deltas(applied.values_list("payload", flat=True)).items():
+                current = expected.get(user_id, (0, 0))
+                expected[user_id] = (current[0] + cases, current[1] + wins)
+            known = set(AppliedCaseEvent.objects.filter(id__in=listed).values_list("id", flat=True))
+            AppliedCaseEvent.objects.bulk_create(
+                [AppliedCaseEvent(id=event_id) for event_id in listed - known], ignore_conflicts=True,
+            )
+            state.event_floor = max(state.event_floor, since_id)
+
+        drifted = []
+        profiles = AdvocateProfile.objects.only("id", "user_id", "cases_count", "wins_count").order_by("id")
+        for profile in profiles.iterator(chunk_size=2000):
+            cases, wins = expected.get(profile.user_id, (0, 0))
+            if (profile.cases_count, profile.wins_count) != (cases, wins):
+                profile.cases_count, profile.wins_count = cases, wins
+                drifted.append(profile)
+        AdvocateProfile.objects.bulk_update(drifted, ["cases_count", "wins_count"], batch_size=500)
+
+        state.reconciled_at = timezone.now()
+        state.save(update_fields=["event_floor", "reconciled_at"])
+        retention = datetime.timedelta(seconds=settings.CASE_EVENTS_LEDGER_RETENTION)
+        AppliedCaseEvent.objects.filter(id__lt=state.event_floor, applied_at__lt=state.reconciled_at - retention).delete()
+    return len(drifted)
@@ -0,0 +1,73 @@
+# advocates/dashboard.py
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from casebridge_common.rpc import rpc_client
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class CaseDashboardClient:
+    """
+    Advocate dashboards precomputed by case-service, served from the Django
+    cache with stale-while-revalidate semantics.
+
+    A cached dashboard younger than `fresh_for` seconds is returned as is.
+    Until it is `fresh_for + stale_for` seconds old it is still returned
+    immediately, while one background thread per advocate fetches a new copy
+    from case-service's `get_advocate_dashboard` task. Only a missing or
+    fully expired entry makes the request wait on the RPC.
+    """
+
+    task_name = "case_service.tasks.get_advocate_dashboard"
+
+    def __init__(self, fresh_for, stale_for, timeout, workers=2):
+        self.fresh_for = fresh_for
+        self.stale_for = stale_for
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dashboard-revalidate")
+
+    @staticmethod
+    def key(advocate_id):
+        return f"advocate_dashboard:{int(advocate_id)}"
+
+    def get(self, advocate_id):
+        entry = cache.get(self.key(advocate_id))
+        if entry is None:
+            return self.fetch(advocate_id)
+        if time.time() - entry["fetched_at"] >= self.fresh_for:
+            self.revalidate(advocate_id)
+        return entry["data"]
+
+    def fetch(self, advocate_id):
+        data = rpc_client.call(self.task_name, args=[int(advocate_id)], timeout=self.timeout)
+        cache.set(self.key(advocate_id), {"data": data, "fetched_at": time.time()}, timeout=self.fresh_for + self.stale_for)
+        return data
+
+    def revalidate(self, advocate_id):
+        """Refreshes the entry in the background, unless a refresh for this advocate is already running."""
+        lock = f"{self.key(advocate_id)}:revalidating"
+        if cache.add(lock, 1, timeout=self.timeout + 1):
+            self._executor.submit(self._revalidate, advocate_id, lock)
+
+    def _revalidate(self, advocate_id, lock):
+        try:
+            self.fetch(advocate_id)
+        except Exception:
+            # Keep serving the stale copy; the next request past fresh_for tries again.
+            logger.warning("Could not refresh the dashboard of advocate %s", advocate_id, exc_info=True)
+        finally:
+            cache.delete(lock)
+
+    def invalidate(self, advocate_id):
+        cache.delete(self.key(advocate_id))
+
+
+case_dashboards = CaseDashboardClient(
+    fresh_for=settings.CASE_DASHBOARD_FRESH_SECONDS,
+    stale_for=settings.CASE_DASHBOARD_STALE_SECONDS,
+    timeout=settings.CASE_DASHBOARD_RPC_TIMEOUT,
+)
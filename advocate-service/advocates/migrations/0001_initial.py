@@ -0,0 +1,96 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=150)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('role', models.CharField(max_length=20)),
+            ],
+            options={
+                'db_table': 'users',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Specialization',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120, unique=True)),
+            ],
+            options={
+                'db_table': 'advocate_specialization',
+            },
+        ),
+        migrations.CreateModel(
+            name='AdvocateTeam',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('lead', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lead_teams', to=settings.AUTH_USER_MODEL)),
+                ('members', models.ManyToManyField(blank=True, related_name='teams', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'advocate_team',
+            },
+        ),
+        migrations.CreateModel(
+            name='AdvocateProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('full_name', models.CharField(max_length=255)),
+                ('phone', models.CharField(blank=True, max_length=20, null=True)),
+                ('gender', models.CharField(blank=True, max_length=10, null=True)),
+                ('dob', models.DateField(blank=True, null=True)),
+                ('bar_council_id', models.CharField(max_length=100, unique=True)),
+                ('enrollment_year', models.IntegerField(blank=True, null=True)),
+                ('experience_years', models.IntegerField(default=0)),
+                ('languages', models.CharField(blank=True, max_length=255, null=True)),
+                ('address_line1', models.CharField(blank=True, max_length=255, null=True)),
+                ('address_line2', models.CharField(blank=True, max_length=255, null=True)),
+                ('city', models.CharField(blank=True, max_length=120, null=True)),
+                ('state', models.CharField(blank=True, max_length=120, null=True)),
+                ('pincode', models.CharField(blank=True, max_length=20, null=True)),
+                ('profile_image', models.ImageField(blank=True, null=True, upload_to='advocates/')),
+                ('is_verified', models.BooleanField(default=False)),
+                ('rating', models.FloatField(default=0.0)),
+                ('cases_count', models.IntegerField(default=0)),
+                ('wins_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='advocate_profile', to=settings.AUTH_USER_MODEL)),
+                ('specializations', models.ManyToManyField(blank=True, related_name='advocates', to='advocates.specialization')),
+            ],
+            options={
+                'db_table': 'advocate_profile',
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('joined_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_memberships', to='advocates.advocateteam')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'team_member',
+                'unique_together': {('team', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advocates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advocateprofile',
+            name='profile_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='advocates/thumbs/'),
+        ),
+    ]
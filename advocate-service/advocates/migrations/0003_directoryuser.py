@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advocates', '0002_advocateprofile_profile_thumbnail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirectoryUser',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('email', models.EmailField(db_index=True, max_length=254)),
+                ('role', models.CharField(db_index=True, max_length=20)),
+                ('display_name', models.CharField(blank=True, max_length=255)),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'advocate_directory_user',
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+def drop_legacy_members(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model("advocates", "AdvocateTeam").members.through)
+
+
+def create_legacy_members(apps, schema_editor):
+    schema_editor.create_model(apps.get_model("advocates", "AdvocateTeam").members.through)
+
+
+class Migration(migrations.Migration):
+    """
+    AdvocateTeam.members moves from its auto-created join table onto
+    TeamMember, so team_member is the only membership source. Only the state
+    changes the field; the database side copies the memberships left in
+    advocate_team_members into team_member and drops the old table.
+    """
+
+    dependencies = [
+        ("advocates", "0003_directoryuser"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="advocateteam",
+                    name="members",
+                    field=models.ManyToManyField(
+                        blank=True, related_name="teams", through="advocates.TeamMember", to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=(
+                        "INSERT INTO team_member (team_id, user_id, joined_at) "
+                        "SELECT m.advocateteam_id, m.user_id, CURRENT_TIMESTAMP FROM advocate_team_members m "
+                        "WHERE NOT EXISTS (SELECT 1 FROM team_member t "
+                        "WHERE t.team_id = m.advocateteam_id AND t.user_id = m.user_id)"
+                    ),
+                    reverse_sql="INSERT INTO advocate_team_members (advocateteam_id, user_id) SELECT team_id, user_id FROM team_member",
+                ),
+                migrations.RunPython(drop_legacy_members, create_legacy_members),
+            ],
+        ),
+    ]
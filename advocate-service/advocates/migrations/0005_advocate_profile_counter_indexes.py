@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advocates', '0004_team_members_through'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='advocateprofile',
+            index=models.Index(fields=['-rating'], name='advocate_profile_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='advocateprofile',
+            index=models.Index(fields=['-cases_count'], name='advocate_profile_cases_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='advocateprofile',
+            index=models.Index(fields=['-wins_count'], name='advocate_profile_wins_idx'),
+        ),
+    ]
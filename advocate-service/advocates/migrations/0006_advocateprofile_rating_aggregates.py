@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advocates', '0005_advocate_profile_counter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advocateprofile',
+            name='rating_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='advocateprofile',
+            name='rating_sum',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('advocates', '0006_advocateprofile_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppliedCaseEvent',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('payload', models.JSONField(blank=True, null=True)),
+                ('applied_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'advocate_applied_case_event',
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseCounterState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_floor', models.BigIntegerField(default=0)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'advocate_case_counter_state',
+            },
+        ),
+    ]
@@ -1,10 +1,11 @@
 # advocates/models.py
 from django.db import models
 from django.utils import timezone
+from casebridge_common.directory import AbstractDirectoryUser
 
 class User(models.Model):
+    """user-service's users table, declared only as a foreign-key target; look users up in DirectoryUser."""
     id = models.BigAutoField(primary_key=True)
-    username = models.CharField(max_length=150)
     email = models.EmailField(unique=True)
     role = models.CharField(max_length=20)
 
@@ -13,7 +14,14 @@ class User(models.Model):
         managed = False
 
     def __str__(self):
-        return f"{self.username} ({self.role})"
+        return f"{self.email} ({self.role})"
+
+
+class DirectoryUser(AbstractDirectoryUser):
+    """Local replica of the user directory, fed by `manage.py consume_user_directory`."""
+
+    class Meta:
+        db_table = "advocate_directory_user"
 
 
 
@@ -44,8 +52,11 @@ class AdvocateProfile(models.Model):
     state = models.CharField(max_length=120, blank=True, null=True)
     pincode = models.CharField(max_length=20, blank=True, null=True)
     profile_image = models.ImageField(upload_to="advocates/", blank=True, null=True)
+    profile_thumbnail = models.ImageField(upload_to="advocates/thumbs/", blank=True, null=True, editable=False)
     is_verified = models.BooleanField(default=False)
-    rating = models.FloatField(default=0.0)
+    rating = models.FloatField(default=0.0)  # Bayesian average of the reviews, kept by client-service's clients.reviews
+    rating_sum = models.BigIntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
     cases_count = models.IntegerField(default=0)
     wins_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(default=timezone.now)
@@ -53,24 +64,31 @@ class AdvocateProfile(models.Model):
 
     class Meta:
         db_table = "advocate_profile"
+        # client-service's advocate search sorts by these
+        indexes = [
+            models.Index(fields=["-rating"], name="advocate_profile_rating_idx"),
+            models.Index(fields=["-cases_count"], name="advocate_profile_cases_idx"),
+            models.Index(fields=["-wins_count"], name="advocate_profile_wins_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.full_name or self.user.username}"
+        return f"{self.full_name or self.user.email}"
 
 
 class AdvocateTeam(models.Model):
     lead = models.ForeignKey(User, on_delete=models.CASCADE, related_name="lead_teams")
-    members = models.ManyToManyField(User, related_name="teams", blank=True)
+    members = models.ManyToManyField(User, through="TeamMember", related_name="teams", blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "advocate_team"
 
     def __str__(self):
-        return f"Team led by {self.lead.username}"
+        return f"Team led by {self.lead.email}"
 
 
 class TeamMember(models.Model):
+    """A team membership; the through table of AdvocateTeam.members, so both read the same rows."""
     team = models.ForeignKey(AdvocateTeam, on_delete=models.CASCADE, related_name="team_memberships")
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     joined_at = models.DateTimeField(default=timezone.now)
@@ -80,5 +98,29 @@ class TeamMember(models.Model):
         unique_together = ("team", "user")
 
 
+class CaseCounterState(models.Model):
+    """
+    Where the case counters (advocates.counters) stand: events with ids
+    below `event_floor` were all counted by the last reconciliation's
+    snapshot, so they are never applied again. A single row.
+    """
+    event_floor = models.BigIntegerField(default=0)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "advocate_case_counter_state"
 
 
+class AppliedCaseEvent(models.Model):
+    """
+    A case-service event the counters already contain: applied from a
+    relayed batch (`payload` is the event), or counted by a reconciliation
+    snapshot before it arrived (`payload` is null). Either way a delivery
+    of it is skipped.
+    """
+    id = models.BigIntegerField(primary_key=True)  # case-service's event id
+    payload = models.JSONField(null=True, blank=True)
+    applied_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = "advocate_applied_case_event"
@@ -1,29 +1,43 @@
 # advocate_service/serializers.py
 
+from django.db import transaction
 from rest_framework import serializers
 from .models import AdvocateProfile, AdvocateTeam, Specialization
-from advocate_service.celery import app 
+from .specializations import sync_specializations
+from .teams import sync_team_members
+from .user_directory import user_directory
 
 
-# ------------------------ Helper: RPC call to user-service ------------------------
+# ------------------------ Helper: user directory lookups ------------------------
 
 def get_user_rpc(user_id):
-    """Fetch user info from user-service via Celery RPC"""
+    """Fetch user info from the local directory, falling back to user-service"""
     try:
-        result = app.send_task("user_service.tasks.get_user_info", args=[user_id]).get(timeout=10)
-        if not result or result.get("id") is None:
-            raise serializers.ValidationError(f"User with id {user_id} not found")
-        return result
+        result = user_directory.get(user_id)
     except Exception as e:
         raise serializers.ValidationError(f"Error fetching user {user_id}: {str(e)}")
+    if not result or result.get("id") is None:
+        raise serializers.ValidationError(f"User with id {user_id} not found")
+    return result
+
+
+def get_users_rpc(user_ids):
+    """Fetch many users in one directory lookup; every id must exist"""
+    try:
+        result = user_directory.get_many(user_ids)
+    except Exception as e:
+        raise serializers.ValidationError(f"Error fetching users: {str(e)}")
+    missing = [uid for uid in user_ids if uid not in result]
+    if missing:
+        raise serializers.ValidationError(f"Users not found: {missing}")
+    return result
 
 
 # ------------------------ User Serializer ------------------------
 
 class UserSerializer(serializers.Serializer):
-    """Populate user from RPC response, not DB"""
+    """id/email/role of a user; matches the columns of user-service's users table"""
     id = serializers.IntegerField()
-    username = serializers.CharField()
     email = serializers.EmailField()
     role = serializers.CharField()
 
@@ -49,43 +63,66 @@ class AdvocateProfileSerializer(serializers.ModelSerializer):
             "id", "user", "full_name", "phone", "gender", "dob",
             "bar_council_id", "enrollment_year", "experience_years",
             "languages", "specializations", "address_line1", "address_line2",
-            "city", "state", "pincode", "profile_image", "is_verified",
-            "rating", "cases_count", "wins_count", "created_at", "updated_at"
+            "city", "state", "pincode", "profile_image", "profile_thumbnail", "is_verified",
+            "rating", "rating_count", "cases_count", "wins_count", "created_at", "updated_at"
         ]
-        read_only_fields = ("rating", "cases_count", "wins_count", "created_at", "updated_at")
+        # full_name is user-service's: it changes the user directory, so it is edited there
+        read_only_fields = ("full_name", "profile_thumbnail", "rating", "rating_count", "cases_count", "wins_count", "created_at", "updated_at")
 
     def create(self, validated_data):
         specs = validated_data.pop("specializations", [])
         profile = AdvocateProfile.objects.create(**validated_data)
-        for s in specs:
-            obj, _ = Specialization.objects.get_or_create(name=s.get("name"))
-            profile.specializations.add(obj)
+        if specs:
+            sync_specializations(profile, [s.get("name") for s in specs])
         return profile
 
     def update(self, instance, validated_data):
         specs = validated_data.pop("specializations", None)
+        if "profile_image" in validated_data:
+            # The thumbnail was rendered from the old image; readers fall back to the new original instead
+            instance.profile_thumbnail = None
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
 
         if specs is not None:
-            instance.specializations.clear()
-            for s in specs:
-                obj, _ = Specialization.objects.get_or_create(name=s.get("name"))
-                instance.specializations.add(obj)
+            sync_specializations(instance, [s.get("name") for s in specs])
         return instance
 
 
 # ------------------------ Advocate Team Serializer ------------------------
 
 class AdvocateTeamSerializer(serializers.ModelSerializer):
-    lead = UserSerializer(read_only=True)
-    members = UserSerializer(many=True, read_only=True)
+    """
+    Reads teams prepared by `hydrate_teams`: members come from
+    `team.member_ids` and user info from the `users` map in the context,
+    so serializing never queries per team or per member. A `fields`
+    collection in the context limits the output to those fields.
+    """
+    lead = serializers.SerializerMethodField()
+    members = serializers.SerializerMethodField()
 
     class Meta:
         model = AdvocateTeam
         fields = ("id", "lead", "members", "created_at")
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        projection = self.context.get("fields")
+        if projection:
+            for name in set(self.fields) - set(projection):
+                self.fields.pop(name)
+
+    def _user(self, user_id):
+        info = self.context.get("users", {}).get(user_id) or {"id": user_id, "email": None, "role": None}
+        return UserSerializer(info).data
+
+    def get_lead(self, team):
+        return self._user(team.lead_id)
+
+    def get_members(self, team):
+        return [self._user(uid) for uid in team.member_ids]
+
 
 # ------------------------ Advocate Team Create/Update Serializer ------------------------
 
@@ -103,16 +140,14 @@ class AdvocateTeamCreateSerializer(serializers.ModelSerializer):
         member_ids = validated_data.pop("member_ids", [])
         lead_id = validated_data.pop("lead_id")
 
-        # Fetch lead via RPC
-        lead_data = get_user_rpc(lead_id)
-        if lead_data["role"] != "advocate":
+        # Fetch lead and members in one RPC
+        users = get_users_rpc([lead_id, *member_ids])
+        if users[lead_id]["role"] != "advocate":
             raise serializers.ValidationError("Lead must be an advocate")
 
-        team = AdvocateTeam.objects.create(lead_id=lead_id)
-
-        for uid in member_ids:
-            user_data = get_user_rpc(uid)
-            team.members.add(uid)
+        with transaction.atomic():
+            team = AdvocateTeam.objects.create(lead_id=lead_id)
+            sync_team_members(team, member_ids)
 
         return team
 
@@ -126,12 +161,10 @@ class AdvocateTeamCreateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Lead must be an advocate")
             instance.lead_id = lead_id
 
-        instance.save()
-
-        if member_ids is not None:
-            instance.members.clear()
-            for uid in member_ids:
-                user_data = get_user_rpc(uid)
-                instance.members.add(uid)
+        if member_ids is None:
+            instance.save()
+        else:
+            # Only ids joining the team are looked up, all in one batch and outside any transaction
+            sync_team_members(instance, member_ids, validate=get_users_rpc, save=True)
 
         return instance
@@ -0,0 +1,91 @@
+# advocates/specializations.py
+import hashlib
+import json
+import uuid
+
+from casebridge_common.specializations import (
+    SpecializationResolver as BaseSpecializationResolver,
+    sync_specializations as _sync_specializations,
+)
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import Specialization
+
+
+class SpecializationResolver(BaseSpecializationResolver):
+
+    def create(self, names):
+        super().create(names)
+        # bulk_create sends no post_save, so the catalogue is told here
+        transaction.on_commit(specialization_catalogue.bump)
+
+
+class SpecializationCatalogue:
+    """
+    The full specialization list as served to search forms, built once per
+    catalogue version.
+
+    The version is a random token kept in the shared Django cache and
+    replaced on every create, update or delete, so all workers notice a
+    change on their next request. It also expires after
+    SPECIALIZATION_CATALOGUE_VERSION_TTL seconds, which bounds how long a
+    worker can serve a list whose bump it missed (a cache that lost the key,
+    or a per-process backend). Each worker keeps the serialized
+    list of the version it last saw, together with a strong ETag that hashes
+    its content. A request for an unchanged catalogue therefore costs one
+    cache read and no query or serialization.
+    """
+
+    version_key = "specialization_catalogue:version"
+
+    def __init__(self):
+        self._snapshot = None  # (version, etag, data)
+
+    def version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(self.version_key, version, timeout=settings.SPECIALIZATION_CATALOGUE_VERSION_TTL):
+                version = cache.get(self.version_key, version)
+        return version
+
+    def get(self):
+        """Returns the (etag, data) of the current catalogue."""
+        from .serializers import SpecializationSerializer
+
+        # Read the version before the rows: a write committed in between leaves
+        # newer rows under the older version, which the next request replaces.
+        version = self.version()
+        snapshot = self._snapshot
+        if snapshot is None or snapshot[0] != version:
+            data = [dict(row) for row in SpecializationSerializer(Specialization.objects.order_by("id"), many=True).data]
+            digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:32]
+            snapshot = self._snapshot = (version, f'"{digest}"', data)
+        return snapshot[1], snapshot[2]
+
+    def bump(self):
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=settings.SPECIALIZATION_CATALOGUE_VERSION_TTL)
+        self._snapshot = None
+
+
+specialization_resolver = SpecializationResolver(Specialization)
+specialization_catalogue = SpecializationCatalogue()
+
+
+def _forget_specialization(sender, instance, created=False, **kwargs):
+    # A rename or delete must not leave a stale name -> id mapping behind, in any worker.
+    if not created:
+        specialization_resolver.forget()
+    transaction.on_commit(specialization_catalogue.bump)
+
+
+post_save.connect(_forget_specialization, sender=Specialization, dispatch_uid="specialization_resolver_save")
+post_delete.connect(_forget_specialization, sender=Specialization, dispatch_uid="specialization_resolver_delete")
+
+
+def sync_specializations(profile, names):
+    """Makes `profile.specializations` exactly `names` (see casebridge_common.specializations)."""
+    _sync_specializations(profile, names, specialization_resolver)
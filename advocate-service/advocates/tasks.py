@@ -1,6 +1,7 @@
 # advocates/tasks.py
 from celery import shared_task
 from django.conf import settings
+from .counters import apply_case_events, reconcile_counters
 from .models import AdvocateProfile, Specialization, User
 
 @shared_task(name="advocate_service.tasks.create_advocate_profile")
@@ -11,9 +12,11 @@ def create_advocate_profile(user_id, profile_payload=None):
     except User.DoesNotExist:
         return {"error": "user_not_found", "user_id": user_id}
 
+    # full_name feeds user-service's directory, so only user-service writes it (through its outbox);
+    # the email placeholder is what the directory already shows for a user without a profile.
     profile, created = AdvocateProfile.objects.get_or_create(user=user,
         defaults={
-            "full_name": profile_payload.get("full_name", user.username),
+            "full_name": user.email,
             "phone": profile_payload.get("phone_number"),
             "bar_council_id": profile_payload.get("bar_council_number", ""),
             "experience_years": profile_payload.get("experience_years", 0),
@@ -21,7 +24,7 @@ def create_advocate_profile(user_id, profile_payload=None):
     )
     if not created:
         updated = False
-        for key, src_key in (("phone", "phone_number"), ("bar_council_id", "bar_council_number"), ("full_name", "full_name")):
+        for key, src_key in (("phone", "phone_number"), ("bar_council_id", "bar_council_number")):
             val = profile_payload.get(src_key)
             if val:
                 setattr(profile, key, val)
@@ -29,3 +32,15 @@ def create_advocate_profile(user_id, profile_payload=None):
         if updated:
             profile.save()
     return {"created": created, "profile_id": profile.id}
+
+
+# ------------------------ Performance counters ------------------------
+@shared_task(name="advocate_service.tasks.apply_case_events", acks_late=True)
+def apply_case_events_task(events):
+    """A batch of case-service's assignment and result events, relayed from its outbox to CASE_EVENTS_QUEUE"""
+    return apply_case_events(events)
+
+
+@shared_task(name="advocate_service.tasks.reconcile_performance_counters")
+def reconcile_performance_counters_task():
+    return reconcile_counters()
@@ -0,0 +1,79 @@
+# advocates/teams.py
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import AdvocateTeam, TeamMember
+from .user_directory import user_directory
+
+TEAM_FIELDS = ("id", "lead", "members", "created_at")
+
+
+def sync_team_members(team, member_ids, validate=None, save=False):
+    """
+    Makes `team`'s members exactly `member_ids`. The current TeamMember rows
+    are diffed against the target, so at most one DELETE and one INSERT hit
+    the table, and members who stay keep their row and `joined_at`.
+
+    `validate` is called with the list of ids being added before the team is
+    locked, since it may be a remote call; it should raise to reject the
+    change. Callers passing it must not be inside a transaction, or its
+    rounds would run while earlier locks are still held. The diff is taken
+    again under the team row lock, and ids a concurrent edit removed in
+    between are validated in another round before writing. With `save`,
+    `team` itself is saved under the same lock.
+    """
+    target = set(int(uid) for uid in member_ids)
+    memberships = TeamMember.objects.filter(team_id=team.pk)
+    current = set(memberships.values_list("user_id", flat=True))
+    validated = set()
+    while True:
+        unvalidated = target - current - validated
+        if unvalidated and validate is not None:
+            validate(sorted(unvalidated))
+        validated |= unvalidated
+        with transaction.atomic():
+            # The team row, not its memberships: a team with no members would leave nothing to lock
+            AdvocateTeam.objects.select_for_update().only("id").get(pk=team.pk)
+            current = set(memberships.values_list("user_id", flat=True))
+            added = target - current
+            if added - validated:
+                continue
+            removed = current - target
+            if removed:
+                memberships.filter(user_id__in=removed).delete()
+            if added:
+                TeamMember.objects.bulk_create(
+                    [TeamMember(team_id=team.pk, user_id=uid) for uid in added],
+                    ignore_conflicts=True,
+                )
+            if save:
+                team.save()
+        break
+    getattr(team, "_prefetched_objects_cache", {}).pop("members", None)
+    return added, removed
+
+
+def hydrate_teams(teams, fields=TEAM_FIELDS):
+    """
+    Prepares `teams` for AdvocateTeamSerializer: sets `member_ids` on each
+    team from one query over all their memberships, and returns the user
+    info of every lead and member as one `{id: info}` map from a single
+    directory lookup. Users are only looked up for the fields requested.
+    """
+    teams = list(teams)
+    member_ids = defaultdict(list)
+    if "members" in fields and teams:
+        memberships = (
+            TeamMember.objects.filter(team_id__in=[team.pk for team in teams])
+            .order_by("joined_at", "id").values_list("team_id", "user_id")
+        )
+        for team_id, user_id in memberships:
+            member_ids[team_id].append(user_id)
+    user_ids = set()
+    for team in teams:
+        team.member_ids = member_ids[team.pk]
+        user_ids.update(team.member_ids)
+        if "lead" in fields:
+            user_ids.add(team.lead_id)
+    return teams, user_directory.get_many(user_ids) if user_ids else {}
@@ -0,0 +1,27 @@
+from django.db import connection
+from django.test import TestCase
+
+from advocates.models import User
+
+# The suite must not need the shared Redis cache; tests that touch the cache run against this one
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class UsersTableTestCase(TestCase):
+    """TestCase with user-service's `users` table, which this service only declares."""
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            editor.create_model(User)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(User)
+
+    @staticmethod
+    def create_users(*ids, role="advocate"):
+        return [User.objects.create(id=uid, email=f"user{uid}@example.com", role=role) for uid in ids]
@@ -0,0 +1,113 @@
+import datetime
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from advocates.counters import apply_case_events, case_event_deltas, reconcile_counters
+from advocates.models import AdvocateProfile, AppliedCaseEvent, CaseCounterState
+
+from .base import UsersTableTestCase
+
+
+def assigned(event_id, advocate_id, previous_advocate_id=None, won=False, previous_won=False):
+    return {"id": event_id, "topic": "case.assigned", "case_id": event_id, "advocate_id": advocate_id,
+            "previous_advocate_id": previous_advocate_id, "won": won, "previous_won": previous_won}
+
+
+def result_changed(event_id, advocate_id, result, previous_result="Pending"):
+    return {"id": event_id, "topic": "case.result_changed", "case_id": event_id, "advocate_id": advocate_id,
+            "result": result, "previous_result": previous_result}
+
+
+def snapshot(counts, since_id=None, event_ids=()):
+    return {
+        "counts": [{"advocate_id": a, "cases": c, "wins": w} for a, (c, w) in counts.items()],
+        "since_id": since_id, "event_ids": list(event_ids),
+    }
+
+
+class CaseEventDeltasTests(UsersTableTestCase):
+
+    def test_events_fold_into_one_delta_per_advocate(self):
+        deltas = case_event_deltas([
+            assigned(1, 7), assigned(2, 7, won=True), result_changed(3, 7, "Won"),
+            assigned(4, 8, previous_advocate_id=7, won=True, previous_won=True),
+        ])
+        self.assertEqual(deltas, {7: (1, 1), 8: (1, 1)})
+
+    def test_cancelling_events_leave_no_delta(self):
+        self.assertEqual(case_event_deltas([
+            assigned(1, 7), assigned(2, None, previous_advocate_id=7),
+            result_changed(3, 8, "Won"), result_changed(4, 8, "Lost", previous_result="Won"),
+        ]), {})
+
+
+class CounterTestCase(UsersTableTestCase):
+
+    def setUp(self):
+        self.create_users(7, 8)
+        for uid in (7, 8):
+            AdvocateProfile.objects.create(user_id=uid, full_name=f"Advocate {uid}", bar_council_id=f"BC-{uid}")
+
+    def counters(self):
+        return dict(
+            (user_id, (cases, wins))
+            for user_id, cases, wins in AdvocateProfile.objects.values_list("user_id", "cases_count", "wins_count")
+        )
+
+    def reconcile(self, result):
+        with mock.patch("advocates.counters.rpc_client.call", return_value=result):
+            return reconcile_counters()
+
+
+class ApplyCaseEventsTests(CounterTestCase):
+
+    def test_batch_is_one_increment_per_advocate(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(apply_case_events([assigned(1, 7), assigned(2, 7, won=True), assigned(3, 8)]), 2)
+        updates = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(self.counters(), {7: (2, 1), 8: (1, 0)})
+
+    def test_redelivered_events_are_skipped(self):
+        apply_case_events([assigned(1, 7), assigned(2, 8)])
+        self.assertEqual(apply_case_events([assigned(2, 8), assigned(3, 8)]), 1)
+        self.assertEqual(self.counters(), {7: (1, 0), 8: (2, 0)})
+
+    def test_events_below_the_floor_are_skipped(self):
+        CaseCounterState.objects.create(pk=1, event_floor=10)
+        apply_case_events([assigned(9, 7), assigned(10, 8)])
+        self.assertEqual(self.counters(), {7: (0, 0), 8: (1, 0)})
+
+
+class ReconcileCountersTests(CounterTestCase):
+
+    def test_drifted_profiles_are_corrected(self):
+        AdvocateProfile.objects.filter(user_id=7).update(cases_count=5, wins_count=5)
+        self.assertEqual(self.reconcile(snapshot({7: (2, 1)})), 1)
+        self.assertEqual(self.counters(), {7: (2, 1), 8: (0, 0)})
+        self.assertEqual(self.reconcile(snapshot({7: (2, 1)})), 0)
+
+    def test_applied_events_missing_from_the_snapshot_are_kept(self):
+        apply_case_events([assigned(1, 7), assigned(2, 7, won=True), assigned(3, 8)])
+        # the snapshot was read before event 3 committed
+        self.reconcile(snapshot({7: (2, 1)}, since_id=1, event_ids=[1, 2]))
+        self.assertEqual(self.counters(), {7: (2, 1), 8: (1, 0)})
+
+    def test_events_in_the_snapshot_are_not_applied_again(self):
+        apply_case_events([assigned(1, 7)])
+        # event 2 is counted by the snapshot but still queued, event 0 was settled before it
+        self.reconcile(snapshot({7: (3, 1)}, since_id=1, event_ids=[1, 2]))
+        self.assertEqual(apply_case_events([assigned(0, 7), assigned(2, 7, won=True), assigned(3, 8)]), 1)
+        self.assertEqual(self.counters(), {7: (3, 1), 8: (1, 0)})
+        self.assertEqual(CaseCounterState.objects.get().event_floor, 1)
+
+    @override_settings(CASE_EVENTS_LEDGER_RETENTION=3600)
+    def test_settled_ledger_entries_are_pruned(self):
+        apply_case_events([assigned(1, 7), assigned(5, 7)])
+        AppliedCaseEvent.objects.update(applied_at=timezone.now() - datetime.timedelta(days=1))
+        self.reconcile(snapshot({7: (2, 0)}, since_id=3, event_ids=[5]))
+        self.assertEqual(list(AppliedCaseEvent.objects.values_list("id", flat=True)), [5])
@@ -0,0 +1,51 @@
+import io
+import tempfile
+
+from casebridge_auth.principal import TokenPrincipal
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from advocates.models import AdvocateProfile
+
+from .base import UsersTableTestCase
+
+
+def png(name="photo.png"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "navy").save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class AdvocateProfileAPITests(UsersTableTestCase):
+
+    def setUp(self):
+        [user] = self.create_users(1)
+        self.profile = AdvocateProfile.objects.create(
+            user=user, full_name="Advocate", bar_council_id="BC-1", profile_thumbnail="advocates/thumbs/old.webp",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=TokenPrincipal(id=user.id, role="advocate"))
+        self.url = reverse("advocate-profile")
+
+    def test_new_image_drops_the_old_thumbnail(self):
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            response = self.client.put(self.url, {"profile_image": png()}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.profile.refresh_from_db()
+        self.assertTrue(self.profile.profile_image.name.startswith("advocates/photo"))
+        self.assertFalse(self.profile.profile_thumbnail)
+
+    def test_other_changes_keep_the_thumbnail(self):
+        response = self.client.put(self.url, {"city": "Pune"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.profile_thumbnail.name, "advocates/thumbs/old.webp")
+
+    def test_full_name_is_left_to_user_service(self):
+        self.client.put(self.url, {"full_name": "Renamed", "city": "Pune"}, format="json")
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.full_name, self.profile.city), ("Advocate", "Pune"))
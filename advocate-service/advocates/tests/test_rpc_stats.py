@@ -0,0 +1,26 @@
+import os
+from unittest import mock
+
+from casebridge_auth.principal import TokenPrincipal
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class RpcStatsAPITests(SimpleTestCase):
+
+    def get(self, role):
+        client = APIClient()
+        client.force_authenticate(user=TokenPrincipal(id=1, role=role))
+        return client.get(reverse("rpc-stats"))
+
+    def test_admins_get_this_process_stats(self):
+        stats = {"case_service.tasks.get_advocate_case_counts": {"calls": 2, "circuit": "open"}}
+        with mock.patch("advocates.views.rpc_client.stats", return_value=stats):
+            response = self.get("admin")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"pid": os.getpid(), "tasks": stats})
+
+    def test_other_roles_are_refused(self):
+        self.assertEqual(self.get("advocate").status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,65 @@
+from casebridge_auth.principal import TokenPrincipal
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from advocates.models import Specialization
+from advocates.specializations import specialization_catalogue, specialization_resolver
+
+from .base import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SpecializationCatalogueTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        specialization_resolver.clear()
+        Specialization.objects.create(name="Criminal")
+        self.client.force_authenticate(user=TokenPrincipal(id=1, role="advocate"))
+        self.url = reverse("specializations")
+
+    def names(self, response):
+        return [row["name"] for row in response.data]
+
+    def test_unchanged_catalogue_is_not_modified(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_writes_invalidate_the_catalogue(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Specialization.objects.create(name="Family")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.names(response), ["Criminal", "Family"])
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_names_created_by_the_resolver_invalidate_the_catalogue(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            specialization_resolver.resolve(["Tax"])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(self.names(response), ["Criminal", "Tax"])
+
+    def test_missed_bump_is_served_until_the_version_expires(self):
+        etag = self.client.get(self.url)["ETag"]
+        # A write this worker's cache never heard about
+        Specialization.objects.filter(name="Criminal").update(name="Criminal Law")
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        cache.delete(specialization_catalogue.version_key)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(self.names(response), ["Criminal Law"])
+
+    def test_version_is_kept_for_the_configured_ttl(self):
+        with self.settings(SPECIALIZATION_CATALOGUE_VERSION_TTL=0):
+            specialization_catalogue.bump()
+            first = specialization_catalogue.version()
+            self.assertNotEqual(specialization_catalogue.version(), first)
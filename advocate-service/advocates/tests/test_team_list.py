@@ -0,0 +1,86 @@
+from casebridge_auth.principal import TokenPrincipal
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from advocates.models import AdvocateTeam, DirectoryUser, TeamMember
+
+from .base import UsersTableTestCase
+
+LEAD = 1
+
+
+class TeamListTests(UsersTableTestCase):
+
+    def setUp(self):
+        self.create_users(LEAD, 2, *range(10, 40))
+        DirectoryUser.objects.bulk_create([
+            DirectoryUser(id=uid, email=f"user{uid}@example.com", role="advocate", display_name=f"User {uid}", version=1)
+            for uid in (LEAD, 2, *range(10, 40))
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(user=TokenPrincipal(id=LEAD, role="advocate"))
+        self.url = reverse("advocate-teams")
+
+    def add_teams(self, count, members_per_team=3, lead_id=LEAD):
+        teams = []
+        for _ in range(count):
+            team = AdvocateTeam.objects.create(lead_id=lead_id)
+            offset = 10 + len(teams) % 10
+            TeamMember.objects.bulk_create([TeamMember(team=team, user_id=offset + i) for i in range(members_per_team)])
+            teams.append(team)
+        return teams
+
+    def test_query_count_does_not_grow_with_teams(self):
+        self.add_teams(2)
+        # teams page, their memberships, one directory lookup for every lead and member
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data["results"]), 2)
+
+        self.add_teams(15, members_per_team=5)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data["results"]), 17)
+        self.assertEqual(len(response.data["results"][0]["members"]), 5)
+        self.assertEqual(response.data["results"][0]["lead"]["email"], f"user{LEAD}@example.com")
+
+    def test_cursor_pages_cover_every_team_once_newest_first(self):
+        teams = self.add_teams(25)
+        self.add_teams(2, lead_id=2)
+        # ties on created_at are broken by id
+        AdvocateTeam.objects.filter(id__in=[t.id for t in teams[5:15]]).update(created_at=timezone.now())
+        expected = list(
+            AdvocateTeam.objects.filter(lead_id=LEAD).order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+        seen, url = [], f"{self.url}?page_size=10&fields=id"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(team["id"] for team in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, expected)
+
+    def test_page_size_is_capped(self):
+        self.add_teams(3)
+        response = self.client.get(f"{self.url}?page_size=1000&fields=id")
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIsNone(response.data["next"])
+
+    def test_fields_limit_the_output_and_the_lookups(self):
+        self.add_teams(3)
+        # no memberships or directory lookup when neither is asked for
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{self.url}?fields=id,created_at")
+        self.assertEqual(set(response.data["results"][0]), {"id", "created_at"})
+
+        response = self.client.get(f"{self.url}?fields=members, id,members")
+        self.assertEqual(set(response.data["results"][0]), {"id", "members"})
+
+    def test_unknown_fields_are_rejected(self):
+        for fields in ("id,budget", ",", "password"):
+            response = self.client.get(f"{self.url}?fields={fields}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, fields)
+            self.assertIn("fields", response.data)
@@ -0,0 +1,98 @@
+import datetime
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from advocates.models import AdvocateTeam, TeamMember
+from advocates.serializers import AdvocateTeamCreateSerializer
+from advocates.teams import sync_team_members
+
+from .base import UsersTableTestCase
+
+
+class SyncTeamMembersTests(UsersTableTestCase):
+
+    def setUp(self):
+        self.create_users(1, 2, 3, 4, 5)
+        self.team = AdvocateTeam.objects.create(lead_id=1)
+        self.joined_at = timezone.now() - datetime.timedelta(days=30)
+        for uid in (2, 3):
+            TeamMember.objects.create(team=self.team, user_id=uid, joined_at=self.joined_at)
+
+    def members(self):
+        return dict(TeamMember.objects.filter(team=self.team).values_list("user_id", "joined_at"))
+
+    def test_members_who_stay_keep_their_row(self):
+        kept = TeamMember.objects.get(team=self.team, user_id=2)
+        self.assertEqual(sync_team_members(self.team, ["2", 4]), ({4}, {3}))
+        self.assertEqual(set(self.members()), {2, 4})
+        self.assertEqual(TeamMember.objects.get(team=self.team, user_id=2).pk, kept.pk)
+        self.assertEqual(self.members()[2], self.joined_at)
+        self.assertEqual(set(self.team.members.values_list("id", flat=True)), {2, 4})
+
+    def test_one_delete_and_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            sync_team_members(self.team, [2, 4, 5])
+        statements = [q["sql"].split(None, 1)[0].upper() for q in queries.captured_queries]
+        self.assertEqual(statements.count("DELETE"), 1)
+        self.assertEqual(statements.count("INSERT"), 1)
+        self.assertEqual(set(self.members()), {2, 4, 5})
+
+    def test_unchanged_members_write_nothing(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(sync_team_members(self.team, [3, 2]), (set(), set()))
+        self.assertFalse([q for q in queries.captured_queries if q["sql"].startswith(("DELETE", "INSERT"))])
+
+    def test_only_added_ids_are_validated(self):
+        validate = mock.Mock()
+        sync_team_members(self.team, [2, 5, 4], validate=validate)
+        validate.assert_called_once_with([4, 5])
+
+        validate.reset_mock()
+        sync_team_members(self.team, [2], validate=validate)
+        validate.assert_not_called()
+
+    def test_rejected_ids_leave_the_team_unchanged(self):
+        validate = mock.Mock(side_effect=ValueError("Users not found: [5]"))
+        with self.assertRaises(ValueError):
+            sync_team_members(self.team, [4, 5], validate=validate)
+        self.assertEqual(set(self.members()), {2, 3})
+
+    def test_members_removed_while_validating_are_validated_before_rejoining(self):
+        def remove_member(ids):
+            if ids == [4]:
+                TeamMember.objects.filter(team=self.team, user_id=2).delete()
+
+        validate = mock.Mock(side_effect=remove_member)
+        self.assertEqual(sync_team_members(self.team, [2, 4], validate=validate), ({2, 4}, {3}))
+        self.assertEqual(validate.call_args_list, [mock.call([4]), mock.call([2])])
+        self.assertEqual(set(self.members()), {2, 4})
+
+    def test_team_row_is_locked_even_without_members(self):
+        empty = AdvocateTeam.objects.create(lead_id=1)
+        with mock.patch.object(AdvocateTeam.objects, "select_for_update", wraps=AdvocateTeam.objects.select_for_update) as lock:
+            sync_team_members(empty, [4])
+        lock.assert_called_once_with()
+        self.assertEqual(set(TeamMember.objects.filter(team=empty).values_list("user_id", flat=True)), {4})
+
+    def test_update_looks_members_up_outside_any_transaction(self):
+        depth, seen = len(connection.atomic_blocks), []
+
+        def lookup(ids):
+            seen.append(len(connection.atomic_blocks))
+            if ids == [4]:
+                TeamMember.objects.filter(team=self.team, user_id=2).delete()
+            return {uid: {"id": uid, "role": "advocate"} for uid in ids}
+
+        serializer = AdvocateTeamCreateSerializer(self.team, data={"member_ids": [2, 4], "lead_id": 5}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with mock.patch("advocates.serializers.get_users_rpc", side_effect=lookup), \
+                mock.patch("advocates.serializers.get_user_rpc", return_value={"id": 5, "role": "advocate"}):
+            serializer.save()
+        # both rounds, including the retry for the member removed meanwhile
+        self.assertEqual(seen, [depth, depth])
+        self.assertEqual(set(self.members()), {2, 4})
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.lead_id, 5)
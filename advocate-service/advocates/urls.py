@@ -6,6 +6,7 @@ from .views import (
     AdvocateTeamListCreateAPIView,
     AdvocateTeamDetailAPIView,
     AdvocateDashboardAPIView,
+    RpcStatsAPIView,
 )
 
 urlpatterns = [
@@ -14,4 +15,5 @@ urlpatterns = [
     path('teams/', AdvocateTeamListCreateAPIView.as_view(), name='advocate-teams'),
     path('teams/<int:pk>/', AdvocateTeamDetailAPIView.as_view(), name='advocate-team-detail'),
     path('dashboard/', AdvocateDashboardAPIView.as_view(), name='advocate-dashboard'),
+    path('rpc-stats/', RpcStatsAPIView.as_view(), name='rpc-stats'),
 ]
@@ -0,0 +1,107 @@
+# advocates/user_directory.py
+import threading
+from concurrent.futures import Future
+
+from cachetools import TTLCache
+from casebridge_common.rpc import rpc_client
+from django.conf import settings
+
+from .models import DirectoryUser
+
+
+class UserDirectoryClient:
+    """
+    User lookups against the local DirectoryUser replica, with user-service's
+    bulk `get_users_info` task as the fallback for ids not replicated yet
+    (e.g. a user registered a moment ago).
+
+    The replica answers in one primary-key query. Missing ids are requested
+    in batches of `batch_size`, sent concurrently under one deadline. RPC
+    results are kept in a TTL cache, and ids that another thread is already
+    fetching are awaited instead of requested again, so concurrent lookups
+    for the same users cost a single RPC.
+    """
+
+    task_name = "user_service.tasks.get_users_info"
+
+    def __init__(self, ttl, maxsize, timeout, batch_size=200):
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        return self.get_many([user_id]).get(int(user_id))
+
+    def get_many(self, user_ids):
+        """Returns a dict of user id -> user info; unknown and deleted ids are omitted."""
+        user_ids = list(dict.fromkeys(int(u) for u in user_ids))
+        local = DirectoryUser.objects.records(user_ids)
+        found = {uid: row for uid, row in local.items() if row is not None}
+        missing = [uid for uid in user_ids if uid not in local]
+        if missing:
+            found.update(self._get_remote(missing))
+        return found
+
+    def _get_remote(self, user_ids):
+        found, waiting, to_fetch = {}, {}, []
+
+        with self._lock:
+            for uid in user_ids:
+                if uid in self._cache:
+                    found[uid] = self._cache[uid]
+                elif uid in self._inflight:
+                    waiting[uid] = self._inflight[uid]
+                else:
+                    self._inflight[uid] = Future()
+                    to_fetch.append(uid)
+
+        if to_fetch:
+            found.update(self._fetch(to_fetch))
+
+        for uid, future in waiting.items():
+            info = future.result(timeout=self.timeout)
+            if info is not None:
+                found[uid] = info
+        return found
+
+    def _fetch(self, user_ids):
+        with self._lock:
+            futures = {uid: self._inflight[uid] for uid in user_ids}
+        try:
+            batches = [user_ids[i:i + self.batch_size] for i in range(0, len(user_ids), self.batch_size)]
+            pages = rpc_client.gather([(self.task_name, [batch]) for batch in batches], timeout=self.timeout)
+            rows = [row for page in pages for row in page or []]
+        except Exception as exc:
+            with self._lock:
+                for uid in user_ids:
+                    self._inflight.pop(uid, None)
+            for future in futures.values():
+                future.set_exception(exc)
+            raise
+
+        users = {row["id"]: row for row in rows}
+        with self._lock:
+            for uid in user_ids:
+                if uid in users:
+                    self._cache[uid] = users[uid]
+                self._inflight.pop(uid, None)
+        for uid, future in futures.items():
+            future.set_result(users.get(uid))
+        return users
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(int(user_id), None)
+
+
+user_directory = UserDirectoryClient(
+    ttl=settings.USER_DIRECTORY_CACHE_TTL,
+    maxsize=settings.USER_DIRECTORY_CACHE_SIZE,
+    timeout=settings.USER_DIRECTORY_RPC_TIMEOUT,
+    batch_size=settings.USER_DIRECTORY_RPC_BATCH,
+)
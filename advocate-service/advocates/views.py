@@ -1,37 +1,43 @@
 # advocate_service/views.py
 
+import os
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
 from django.shortcuts import get_object_or_404
+from casebridge_auth.permissions import IsAdminRole, IsAdvocate
+from casebridge_common.rpc import rpc_client
 
-from .models import AdvocateProfile, AdvocateTeam, Specialization
+from .models import AdvocateProfile, AdvocateTeam
 from .serializers import (
     AdvocateProfileSerializer,
     AdvocateTeamSerializer,
     AdvocateTeamCreateSerializer,
     SpecializationSerializer
 )
-from .permissions import IsAdvocate
-from advocate_service.celery import app  # your Celery app
+from .specializations import specialization_catalogue
+from .teams import TEAM_FIELDS, hydrate_teams
+from .user_directory import user_directory
+from .dashboard import case_dashboards
 
 
 # ------------------------ Helper functions ------------------------
 def fetch_user(user_id):
-    """Fetch user info from user-service via Celery RPC"""
+    """Fetch user info from user-service via the cached directory client"""
     try:
-        result = app.send_task("user_service.tasks.get_user_info", args=[user_id]).get(timeout=10)
-        return result
+        return user_directory.get(user_id)
     except Exception:
         return None
 
 
 def fetch_case_dashboard(advocate_id):
-    """Fetch case dashboard via Celery RPC from case-service"""
+    """Fetch the dashboard case-service precomputes, through the stale-while-revalidate cache"""
     try:
-        result = app.send_task("case_service.tasks.get_advocate_dashboard", args=[advocate_id]).get(timeout=15)
-        return result
+        return case_dashboards.get(advocate_id)
     except Exception:
         return None
 
@@ -59,9 +65,15 @@ class SpecializationAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        specs = Specialization.objects.all()
-        serializer = SpecializationSerializer(specs, many=True)
-        return Response(serializer.data)
+        # Unchanged catalogues get a 304 without a query or serialization.
+        etag, data = specialization_catalogue.get()
+        if etag in request.headers.get("If-None-Match", ""):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
     def post(self, request):
         serializer = SpecializationSerializer(data=request.data)
@@ -72,13 +84,35 @@ class SpecializationAPIView(APIView):
 
 
 # ------------------------ Advocate Team APIs ------------------------
+class TeamCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+
+def team_fields(request):
+    """The team fields named by `?fields=a,b`; all of them when absent."""
+    requested = request.query_params.get("fields")
+    if not requested:
+        return TEAM_FIELDS
+    fields = tuple(dict.fromkeys(f.strip() for f in requested.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in TEAM_FIELDS]
+    if unknown or not fields:
+        raise ValidationError({"fields": f"Choose from {', '.join(TEAM_FIELDS)}"})
+    return fields
+
+
 class AdvocateTeamListCreateAPIView(APIView):
     permission_classes = [IsAuthenticated, IsAdvocate]
 
     def get(self, request):
-        teams = AdvocateTeam.objects.filter(lead_id=request.user.id)
-        serializer = AdvocateTeamSerializer(teams, many=True)
-        return Response(serializer.data)
+        fields = team_fields(request)
+        paginator = TeamCursorPagination()
+        page = paginator.paginate_queryset(AdvocateTeam.objects.filter(lead_id=request.user.id), request, view=self)
+        teams, users = hydrate_teams(page, fields)
+        serializer = AdvocateTeamSerializer(teams, many=True, context={"users": users, "fields": fields})
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         data = request.data.copy()
@@ -97,8 +131,9 @@ class AdvocateTeamDetailAPIView(APIView):
         return get_object_or_404(AdvocateTeam, id=pk, lead_id=self.request.user.id)
 
     def get(self, request, pk):
-        team = self.get_team(pk)
-        serializer = AdvocateTeamSerializer(team)
+        fields = team_fields(request)
+        teams, users = hydrate_teams([self.get_team(pk)], fields)
+        serializer = AdvocateTeamSerializer(teams[0], context={"users": users, "fields": fields})
         return Response(serializer.data)
 
     def put(self, request, pk):
@@ -127,3 +162,15 @@ class AdvocateDashboardAPIView(APIView):
             return Response({"error": "Unable to fetch case dashboard"}, status=502)
 
         return Response(dashboard_data)
+
+
+class RpcStatsAPIView(APIView):
+    """
+    Outcomes, latency percentiles and circuit state of this process's calls
+    to other services. They live in the web process that makes the calls,
+    so each answer covers the process identified by `pid`.
+    """
+    permission_classes = [IsAuthenticated, IsAdminRole]
+
+    def get(self, request):
+        return Response({"pid": os.getpid(), "tasks": rpc_client.stats()}, status=status.HTTP_200_OK)
@@ -6,3 +6,14 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "case_service.settings")
 app = Celery("case_service")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+app.conf.beat_schedule = {
+    "relay-case-events": {
+        "task": "cases.tasks.relay_case_events_task",
+        "schedule": 2.0,
+    },
+    "purge-case-events": {
+        "task": "cases.tasks.purge_case_events_task",
+        "schedule": 3600.0,
+    },
+}
@@ -1,3 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import AdvocateDashboard, CaseEvent
+
+
+@admin.register(AdvocateDashboard)
+class AdvocateDashboardAdmin(admin.ModelAdmin):
+    list_display = ("advocate_id", "total_cases", "next_hearing_at", "refreshed_at")
+    readonly_fields = ("advocate_id", "total_cases", "counts", "upcoming_hearings", "next_hearing_at", "recent_notes", "refreshed_at")
+
+
+@admin.register(CaseEvent)
+class CaseEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "topic", "case_id", "created_at", "published_at")
+    list_filter = ("topic",)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CasesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cases'
+
+    def ready(self):
+        from . import dashboard  # noqa: F401  (connects the dashboard refresh signals)
+        from . import events  # noqa: F401  (connects the case event outbox signals)
@@ -0,0 +1,133 @@
+# cases/dashboard.py
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import AdvocateDashboard, Case, CaseNote, CaseTeamMember
+
+COUNTED_FIELDS = {
+    "status": [choice for choice, _ in Case.STATUS_CHOICES],
+    "priority": [choice for choice, _ in Case.PRIORITY_CHOICES],
+    "result": [choice for choice, _ in Case.RESULT_CHOICES],
+}
+# Case saves touching only other columns (description, updated_at, ...) leave every dashboard as it is.
+DASHBOARD_CASE_FIELDS = {"title", "case_number", "advocate_id", "status", "priority", "result", "hearing_date"}
+NOTE_PREVIEW_LENGTH = 200
+
+
+def advocate_cases(advocate_id):
+    """Cases an advocate leads or is on the team of."""
+    on_team = CaseTeamMember.objects.filter(user_id=advocate_id).values("case_id")
+    return Case.objects.filter(Q(advocate_id=advocate_id) | Q(id__in=on_team)).order_by()
+
+
+def build_dashboard(advocate_id):
+    """Field values for an advocate's AdvocateDashboard row; three indexed queries however many cases they have."""
+    cases = advocate_cases(advocate_id)
+    counts = {field: dict.fromkeys(choices, 0) for field, choices in COUNTED_FIELDS.items()}
+    total = 0
+    for row in cases.values(*COUNTED_FIELDS).annotate(n=Count("id")):
+        total += row["n"]
+        for field in COUNTED_FIELDS:
+            counts[field][row[field]] = counts[field].get(row[field], 0) + row["n"]
+
+    hearings = list(
+        cases.filter(hearing_date__gte=timezone.now()).order_by("hearing_date")
+        .values("id", "title", "case_number", "hearing_date")[:settings.DASHBOARD_UPCOMING_HEARINGS]
+    )
+    notes = (
+        CaseNote.objects.filter(case_id__in=cases.values("id")).order_by("-created_at")
+        .values("id", "case_id", "note", "created_by_id", "created_at")[:settings.DASHBOARD_RECENT_NOTES]
+    )
+    return {
+        "total_cases": total,
+        "counts": counts,
+        "upcoming_hearings": [
+            {"case_id": h["id"], "title": h["title"], "case_number": h["case_number"], "hearing_date": h["hearing_date"].isoformat()}
+            for h in hearings
+        ],
+        "next_hearing_at": hearings[0]["hearing_date"] if hearings else None,
+        "recent_notes": [
+            dict(n, note=n["note"][:NOTE_PREVIEW_LENGTH], created_at=n["created_at"].isoformat()) for n in notes
+        ],
+        "refreshed_at": timezone.now(),
+    }
+
+
+def refresh_dashboards(advocate_ids):
+    """Rebuilds the dashboard rows of `advocate_ids`; returns how many were rebuilt."""
+    advocate_ids = sorted({int(a) for a in advocate_ids if a is not None})
+    for advocate_id in advocate_ids:
+        AdvocateDashboard.objects.update_or_create(advocate_id=advocate_id, defaults=build_dashboard(advocate_id))
+    return len(advocate_ids)
+
+
+def get_dashboard(advocate_id):
+    """
+    The advocate's dashboard as a dict. Built on first request, and rebuilt
+    when its next hearing has passed, since time moves hearings out of
+    "upcoming" without any write to refresh on.
+    """
+    dashboard = AdvocateDashboard.objects.filter(advocate_id=advocate_id).first()
+    if dashboard is None or (dashboard.next_hearing_at and dashboard.next_hearing_at < timezone.now()):
+        refresh_dashboards([advocate_id])
+        dashboard = AdvocateDashboard.objects.get(advocate_id=advocate_id)
+    return {
+        "advocate_id": dashboard.advocate_id,
+        "total_cases": dashboard.total_cases,
+        "counts": dashboard.counts,
+        "upcoming_hearings": dashboard.upcoming_hearings,
+        "recent_notes": dashboard.recent_notes,
+        "refreshed_at": dashboard.refreshed_at.isoformat(),
+    }
+
+
+# ---------------- Incremental updates ----------------
+def schedule_dashboard_refresh(advocate_ids):
+    """Rebuilds the affected dashboards in a worker once the current transaction commits."""
+    advocate_ids = sorted({a for a in advocate_ids if a is not None})
+    if advocate_ids:
+        from .tasks import refresh_advocate_dashboards_task
+
+        transaction.on_commit(lambda: refresh_advocate_dashboards_task.delay(advocate_ids))
+
+
+def case_advocate_ids(case_id):
+    """The advocate and team members of a case: everyone whose dashboard shows it."""
+    ids = set(CaseTeamMember.objects.filter(case_id=case_id).values_list("user_id", flat=True))
+    ids.update(Case.objects.filter(id=case_id).values_list("advocate_id", flat=True))
+    return ids
+
+
+def _case_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields and not DASHBOARD_CASE_FIELDS & set(update_fields)):
+        return
+    ids = {instance.advocate_id, getattr(instance, "_loaded_advocate_id", None)}
+    if not created:
+        ids.update(CaseTeamMember.objects.filter(case_id=instance.pk).values_list("user_id", flat=True))
+    schedule_dashboard_refresh(ids)
+
+
+def _case_deleted(sender, instance, **kwargs):
+    # Team members are deleted first and refresh their own dashboards.
+    schedule_dashboard_refresh([instance.advocate_id])
+
+
+def _team_member_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_dashboard_refresh([instance.user_id])
+
+
+def _note_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_dashboard_refresh(case_advocate_ids(instance.case_id))
+
+
+post_save.connect(_case_saved, sender=Case, dispatch_uid="dashboard_case_save")
+post_delete.connect(_case_deleted, sender=Case, dispatch_uid="dashboard_case_delete")
+post_save.connect(_team_member_changed, sender=CaseTeamMember, dispatch_uid="dashboard_team_save")
+post_delete.connect(_team_member_changed, sender=CaseTeamMember, dispatch_uid="dashboard_team_delete")
+post_save.connect(_note_changed, sender=CaseNote, dispatch_uid="dashboard_note_save")
+post_delete.connect(_note_changed, sender=CaseNote, dispatch_uid="dashboard_note_delete")
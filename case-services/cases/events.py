@@ -0,0 +1,123 @@
+# cases/events.py
+import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from case_service.celery import app
+from .models import Case, CaseEvent
+
+APPLY_TASK = "advocate_service.tasks.apply_case_events"
+WON = "Won"
+# Case saves touching only other columns leave every advocate's counters as they are.
+COUNTER_FIELDS = {"advocate_id", "result"}
+
+
+def record_case_assigned(case_id, advocate_id, previous_advocate_id, won, previous_won):
+    """The case moved from `previous_advocate_id` to `advocate_id`; either may be None."""
+    CaseEvent.objects.create(topic="case.assigned", case_id=case_id, payload={
+        "advocate_id": advocate_id, "previous_advocate_id": previous_advocate_id,
+        "won": won, "previous_won": previous_won,
+    })
+
+
+def record_result_changed(case_id, advocate_id, result, previous_result):
+    CaseEvent.objects.create(topic="case.result_changed", case_id=case_id, payload={
+        "advocate_id": advocate_id, "result": result, "previous_result": previous_result,
+    })
+
+
+def _case_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields and not COUNTER_FIELDS & set(update_fields)):
+        return
+    previous_advocate_id = None if created else getattr(instance, "_loaded_advocate_id", None)
+    previous_result = None if created else getattr(instance, "_loaded_result", None)
+    if instance.advocate_id != previous_advocate_id:
+        record_case_assigned(
+            instance.pk, instance.advocate_id, previous_advocate_id,
+            won=instance.result == WON, previous_won=previous_result == WON,
+        )
+    elif instance.advocate_id is not None and instance.result != previous_result:
+        record_result_changed(instance.pk, instance.advocate_id, instance.result, previous_result)
+
+
+def _case_deleted(sender, instance, **kwargs):
+    if instance.advocate_id is not None:
+        record_case_assigned(instance.pk, None, instance.advocate_id, won=False, previous_won=instance.result == WON)
+
+
+post_save.connect(_case_saved, sender=Case, dispatch_uid="case_events_case_save")
+post_delete.connect(_case_deleted, sender=Case, dispatch_uid="case_events_case_delete")
+
+
+def event_message(event):
+    return dict(event.payload, id=event.id, topic=event.topic, case_id=event.case_id)
+
+
+def relay_case_events(batch_size=None, max_batches=None):
+    """
+    Sends pending case events oldest first, `batch_size` per apply_case_events
+    task, and marks them published. Rows are claimed with SKIP LOCKED, so
+    relays running side by side never send the same batch; an event is only
+    marked once the broker has the task, so a failed send is retried by the
+    next run. Returns the number of events relayed.
+    """
+    batch_size = batch_size or settings.CASE_EVENTS_BATCH_SIZE
+    max_batches = max_batches or settings.CASE_EVENTS_MAX_BATCHES
+    relayed = 0
+    for _ in range(max_batches):
+        with transaction.atomic():
+            events = list(
+                CaseEvent.objects.select_for_update(skip_locked=True)
+                .filter(published_at__isnull=True).order_by("id")[:batch_size]
+            )
+            if not events:
+                break
+            app.send_task(APPLY_TASK, args=[[event_message(e) for e in events]], queue=settings.CASE_EVENTS_QUEUE)
+            CaseEvent.objects.filter(id__in=[e.id for e in events]).update(published_at=timezone.now())
+        relayed += len(events)
+        if len(events) < batch_size:
+            break
+    return relayed
+
+
+def purge_published_events():
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.CASE_EVENTS_RETENTION)
+    return CaseEvent.objects.filter(published_at__lt=cutoff).delete()[0]
+
+
+def advocate_case_counts():
+    """
+    Cases led and won per advocate, in one grouped query; the source of
+    truth for the counters. Returns `{"counts": [...], "since_id": S,
+    "event_ids": [...]}`, read in one snapshot so advocate-service can tell
+    which of the events it applied the counts already contain: every event
+    with an id below S and exactly the listed ids from S on.
+
+    S follows the newest event older than CASE_EVENTS_SETTLE_SECONDS, whose
+    transaction (and every earlier one) is long committed; only events after
+    it are listed. S is None when the outbox is empty.
+    """
+    horizon = timezone.now() - datetime.timedelta(seconds=settings.CASE_EVENTS_SETTLE_SECONDS)
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        rows = (
+            Case.objects.filter(advocate_id__isnull=False).order_by().values("advocate_id")
+            .annotate(cases=Count("id"), wins=Count("id", filter=Q(result=WON)))
+        )
+        counts = [{"advocate_id": row["advocate_id"], "cases": row["cases"], "wins": row["wins"]} for row in rows]
+        settled_id = CaseEvent.objects.filter(created_at__lt=horizon).aggregate(last_id=Max("id"))["last_id"]
+        recent = CaseEvent.objects.order_by("id")
+        if settled_id is not None:
+            recent = recent.filter(id__gt=settled_id)
+        event_ids = list(recent.values_list("id", flat=True))
+    if settled_id is not None:
+        since_id = settled_id + 1
+    else:
+        since_id = event_ids[0] if event_ids else None
+    return {"counts": counts, "since_id": since_id, "event_ids": event_ids}
@@ -42,6 +42,20 @@ class Case(models.Model):
         db_table = "case"
         ordering = ["-created_at"]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets cases.dashboard and cases.events see what a save changed (e.g. the previous advocate).
+        instance._loaded_advocate_id = instance.__dict__.get("advocate_id")
+        instance._loaded_result = instance.__dict__.get("result")
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save handlers have seen the previous values by now
+        self._loaded_advocate_id = self.advocate_id
+        self._loaded_result = self.result
+
     def __str__(self):
         return f"{self.title} ({self.case_number})"
 
@@ -95,3 +109,54 @@ class CaseNote(models.Model):
     def __str__(self):
         return f"Note({self.created_by_id}) for Case {self.case.case_number}"
 
+
+
+class AdvocateDashboard(models.Model):
+    """
+    Precomputed dashboard for one advocate (a case's advocate or team
+    member), rebuilt by cases.dashboard after any write to their cases,
+    teams, notes or hearings. Served as-is by `get_advocate_dashboard`.
+    """
+    advocate_id = models.IntegerField(primary_key=True)
+    total_cases = models.IntegerField(default=0)
+    counts = models.JSONField(default=dict)  # {"status": {...}, "priority": {...}, "result": {...}}
+    upcoming_hearings = models.JSONField(default=list)
+    next_hearing_at = models.DateTimeField(null=True, blank=True)
+    recent_notes = models.JSONField(default=list)
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "advocate_dashboard"
+
+    def __str__(self):
+        return f"Dashboard for advocate {self.advocate_id}"
+
+
+class CaseEvent(models.Model):
+    """
+    A change to who leads a case or how it ended, written in the same
+    transaction as the change itself and relayed to advocate-service by
+    cases.events, which keeps advocates' performance counters from it.
+    """
+    TOPIC_CHOICES = (
+        ("case.assigned", "Case assigned"),
+        ("case.result_changed", "Case result changed"),
+    )
+
+    topic = models.CharField(max_length=40, choices=TOPIC_CHOICES)
+    case_id = models.IntegerField()
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "case_outbox"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["id"], condition=models.Q(published_at__isnull=True), name="case_outbox_pending_idx"),
+            models.Index(fields=["published_at"], name="case_outbox_published_idx"),
+            models.Index(fields=["created_at"], name="case_outbox_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.case_id}"
@@ -1,6 +1,8 @@
 # case_service/tasks.py
 from celery import shared_task
 from .models import Case, CaseTeamMember
+from .dashboard import get_dashboard, refresh_dashboards
+from .events import advocate_case_counts, purge_published_events, relay_case_events
 from django.utils import timezone
 import logging
 
@@ -87,3 +89,33 @@ def get_case_details(case_id):
     except Case.DoesNotExist:
         logger.error(f"Case {case_id} not found")
         return {}
+
+
+# ----------------- Advocate Dashboard Tasks -----------------
+@shared_task(name="case_service.tasks.get_advocate_dashboard")
+def get_advocate_dashboard(advocate_id):
+    """Precomputed dashboard for an advocate (pollable by advocate-service)"""
+    return get_dashboard(advocate_id)
+
+
+@shared_task
+def refresh_advocate_dashboards_task(advocate_ids):
+    """Rebuild the dashboards touched by a case, team, note or hearing write"""
+    return refresh_dashboards(advocate_ids)
+
+
+# ----------------- Advocate Performance Counters -----------------
+@shared_task
+def relay_case_events_task():
+    return relay_case_events()
+
+
+@shared_task
+def purge_case_events_task():
+    return purge_published_events()
+
+
+@shared_task(name="case_service.tasks.get_advocate_case_counts")
+def get_advocate_case_counts():
+    """Cases led and won per advocate and the events they include (pulled by advocate-service's nightly reconciliation)"""
+    return advocate_case_counts()
@@ -1,3 +1,104 @@
+import datetime
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from .dashboard import get_dashboard, refresh_dashboards
+from .events import advocate_case_counts, relay_case_events
+from .models import AdvocateDashboard, Case, CaseEvent, CaseNote, CaseTeamMember
+
+
+# Rebuild in-process instead of queueing the task on a broker
+@mock.patch("cases.tasks.refresh_advocate_dashboards_task.delay", side_effect=refresh_dashboards)
+class AdvocateDashboardTests(TestCase):
+
+    def create_case(self, number, advocate_id=7, **fields):
+        return Case.objects.create(title=f"Case {number}", case_number=f"C-{number}", advocate_id=advocate_id, **fields)
+
+    def test_writes_rebuild_the_affected_dashboards(self, refresh):
+        tomorrow = timezone.now() + datetime.timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.create_case(1, status="Active", priority="High")
+            self.create_case(2, result="Won", hearing_date=tomorrow)
+            CaseTeamMember.objects.create(case=first, user_id=9)
+            CaseNote.objects.create(case=first, note="Filed the petition", created_by_id=7)
+
+        dashboard = AdvocateDashboard.objects.get(advocate_id=7)
+        self.assertEqual(dashboard.total_cases, 2)
+        self.assertEqual(dashboard.counts["status"], {"Active": 1, "Pending": 1, "Closed": 0})
+        self.assertEqual(dashboard.counts["result"]["Won"], 1)
+        self.assertEqual([h["case_number"] for h in dashboard.upcoming_hearings], ["C-2"])
+        self.assertEqual(AdvocateDashboard.objects.get(advocate_id=9).recent_notes[0]["note"], "Filed the petition")
+
+    def test_reassigned_case_leaves_the_previous_dashboard(self, refresh):
+        with self.captureOnCommitCallbacks(execute=True):
+            case = self.create_case(1)
+        case = Case.objects.get(id=case.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            case.advocate_id = 8
+            case.save()
+        self.assertEqual(AdvocateDashboard.objects.get(advocate_id=7).total_cases, 0)
+        self.assertEqual(AdvocateDashboard.objects.get(advocate_id=8).total_cases, 1)
+
+    def test_reads_are_one_lookup_until_the_next_hearing_passes(self, refresh):
+        with self.captureOnCommitCallbacks(execute=True):
+            case = self.create_case(1, hearing_date=timezone.now() + datetime.timedelta(days=1))
+        with self.assertNumQueries(1):
+            self.assertEqual(len(get_dashboard(7)["upcoming_hearings"]), 1)
+
+        Case.objects.filter(id=case.id).update(hearing_date=timezone.now() - datetime.timedelta(hours=1))
+        AdvocateDashboard.objects.filter(advocate_id=7).update(next_hearing_at=timezone.now() - datetime.timedelta(hours=1))
+        self.assertEqual(get_dashboard(7)["upcoming_hearings"], [])
+
+
+class CaseEventTests(TestCase):
+
+    def test_assignment_and_result_changes_are_recorded(self):
+        case = Case.objects.create(title="Case 1", case_number="C-1", advocate_id=7)
+        case.result = "Won"
+        case.save()
+        case.description = "Only a description"
+        case.save()
+        case.advocate_id = 8
+        case.save()
+        case.delete()
+
+        events = [(e.topic, e.payload) for e in CaseEvent.objects.all()]
+        self.assertEqual(events, [
+            ("case.assigned", {"advocate_id": 7, "previous_advocate_id": None, "won": False, "previous_won": False}),
+            ("case.result_changed", {"advocate_id": 7, "result": "Won", "previous_result": "Pending"}),
+            ("case.assigned", {"advocate_id": 8, "previous_advocate_id": 7, "won": True, "previous_won": True}),
+            ("case.assigned", {"advocate_id": None, "previous_advocate_id": 8, "won": False, "previous_won": True}),
+        ])
+
+    def test_relay_sends_pending_events_in_batches(self):
+        for number in range(5):
+            Case.objects.create(title=f"Case {number}", case_number=f"C-{number}", advocate_id=7)
+        with mock.patch("cases.events.app.send_task") as send_task:
+            self.assertEqual(relay_case_events(batch_size=2), 5)
+            self.assertEqual(relay_case_events(batch_size=2), 0)
+        self.assertEqual([len(c.kwargs["args"][0]) for c in send_task.call_args_list], [2, 2, 1])
+        self.assertEqual({c.kwargs["queue"] for c in send_task.call_args_list}, {"advocate_service.case_events"})
+        self.assertFalse(CaseEvent.objects.filter(published_at__isnull=True).exists())
+
+    def test_case_counts_list_the_events_they_include(self):
+        Case.objects.create(title="Case 1", case_number="C-1", advocate_id=7, result="Won")
+        Case.objects.create(title="Case 2", case_number="C-2", advocate_id=7)
+        Case.objects.create(title="Case 3", case_number="C-3", advocate_id=8, result="Lost")
+        ids = list(CaseEvent.objects.values_list("id", flat=True))
+        # the grouped counts, the newest settled event and the events after it, inside one savepoint
+        with self.assertNumQueries(5):
+            snapshot = advocate_case_counts()
+        self.assertCountEqual(snapshot["counts"], [
+            {"advocate_id": 7, "cases": 2, "wins": 1},
+            {"advocate_id": 8, "cases": 1, "wins": 0},
+        ])
+        self.assertEqual((snapshot["since_id"], snapshot["event_ids"]), (ids[0], ids))
+
+        CaseEvent.objects.filter(id__lte=ids[1]).update(created_at=timezone.now() - datetime.timedelta(days=1))
+        snapshot = advocate_case_counts()
+        self.assertEqual((snapshot["since_id"], snapshot["event_ids"]), (ids[1] + 1, ids[2:]))
 
-# Create your tests here.
+    def test_empty_outbox_has_no_event_bound(self):
+        self.assertEqual(advocate_case_counts(), {"counts": [], "since_id": None, "event_ids": []})
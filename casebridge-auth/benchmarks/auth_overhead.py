@@ -0,0 +1,113 @@
+"""
+Per-request authentication overhead, before and after casebridge_auth.
+
+    python benchmarks/auth_overhead.py [iterations]
+
+"Before" re-creates the authenticators the services used to run:
+client-service's SimpleJWT subclass that defined a user class inside
+get_user on every call, and advocate-service's PyJWT decode followed by a
+primary-key lookup (SQLite in memory here, so a lower bound on the Postgres
+round trip it made in production). "After" is TokenPrincipalAuthentication
+on a token seen for the first time and on a repeat token.
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+settings.configure(
+    SECRET_KEY="bench",
+    INSTALLED_APPS=["django.contrib.contenttypes", "django.contrib.auth", "rest_framework"],
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+    USE_TZ=True,
+    SIMPLE_JWT={"SIGNING_KEY": "bench-signing-key", "ALGORITHM": "HS256", "AUTH_HEADER_TYPES": ("Bearer",)},
+    TOKEN_REVOCATION_SUBSCRIBE=False,
+)
+django.setup()
+
+import jwt  # noqa: E402
+from django.db import connection  # noqa: E402
+from rest_framework import exceptions  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework_simplejwt.authentication import JWTAuthentication  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from casebridge_auth.authentication import TokenPrincipalAuthentication  # noqa: E402
+from casebridge_auth.claims import clear_claims_cache  # noqa: E402
+
+
+class ClientServiceBefore(JWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = validated_token.get("user_id")
+        email = validated_token.get("email", "remote_user@example.com")
+
+        class RemoteUser:
+            def __init__(self, user_id, email):
+                self.id = user_id
+                self.email = email
+                self.is_authenticated = True
+
+        return RemoteUser(user_id, email)
+
+
+class AdvocateServiceBefore:
+    def authenticate(self, request):
+        token = request.headers.get("Authorization").split()[1]
+        try:
+            payload = jwt.decode(token, "bench-signing-key", algorithms=["HS256"])
+        except jwt.InvalidTokenError:
+            raise exceptions.AuthenticationFailed("Invalid token")
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT id, email, role FROM users WHERE id = %s", [payload["user_id"]])
+            row = cursor.fetchone()
+        return row, None
+
+
+def make_token(user_id):
+    token = AccessToken()
+    token["user_id"] = user_id
+    token["email"] = f"user{user_id}@example.com"
+    token["role"] = "advocate"
+    token["claims_version"] = 1
+    return str(token)
+
+
+def measure(label, authenticator, requests, before_each=None, repeats=5):
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for request in requests:
+            if before_each:
+                before_each()
+            authenticator.authenticate(request)
+        runs.append((time.perf_counter() - start) / len(requests) * 1e6)
+    print(f"{label:<48} {statistics.median(runs):8.1f} us/request")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE TABLE users (id integer PRIMARY KEY, email text, role text)")
+        cursor.executemany("INSERT INTO users VALUES (%s, %s, %s)", [(i, f"user{i}@example.com", "advocate") for i in range(1, 101)])
+
+    factory = APIRequestFactory()
+    tokens = [make_token(i % 100 + 1) for i in range(iterations)]
+    fresh = [Request(factory.get("/", HTTP_AUTHORIZATION=f"Bearer {t}")) for t in tokens]
+    repeat = [Request(factory.get("/", HTTP_AUTHORIZATION=f"Bearer {tokens[0]}"))] * iterations
+
+    print(f"{iterations} requests, median of 5 runs")
+    measure("before: client-service RemoteJWTAuthentication", ClientServiceBefore(), fresh)
+    measure("before: advocate-service JWTAuthentication + query", AdvocateServiceBefore(), fresh)
+    measure("after: TokenPrincipalAuthentication, new token", TokenPrincipalAuthentication(), fresh, clear_claims_cache)
+    clear_claims_cache()
+    measure("after: TokenPrincipalAuthentication, repeat token", TokenPrincipalAuthentication(), repeat)
+
+
+if __name__ == "__main__":
+    main()
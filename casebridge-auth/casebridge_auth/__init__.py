@@ -0,0 +1,14 @@
+# casebridge_auth/__init__.py
+"""
+Claims-only authentication for the CaseBridge services.
+
+Every service trusts the access tokens issued by user-service. This package
+turns a verified token into a `TokenPrincipal` without a database query or a
+call to user-service, and exposes it to DRF (`authentication`,
+`permissions`) and Channels (`middleware`); `revocation` rejects tokens
+user-service has revoked. The other shared plumbing lives in
+casebridge_common.
+"""
+from .principal import TokenPrincipal
+
+__all__ = ["TokenPrincipal"]
@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class CasebridgeAuthConfig(AppConfig):
+    name = "casebridge_auth"
+    verbose_name = "CaseBridge auth"
@@ -0,0 +1,29 @@
+# casebridge_auth/authentication.py
+from rest_framework import authentication, exceptions
+from rest_framework_simplejwt.settings import api_settings
+
+from .claims import authenticate_token
+
+
+class TokenPrincipalAuthentication(authentication.BaseAuthentication):
+    """
+    DRF authentication for user-service access tokens. `request.user` is a
+    TokenPrincipal built from the verified claims; no user is loaded.
+    """
+
+    def authenticate(self, request):
+        header = request.META.get(api_settings.AUTH_HEADER_NAME)
+        if not header:
+            return None
+
+        parts = header.split()
+        if len(parts) != 2 or parts[0] not in api_settings.AUTH_HEADER_TYPES:
+            return None
+
+        principal = authenticate_token(parts[1])
+        if principal is None:
+            raise exceptions.AuthenticationFailed("Token is invalid, expired or revoked", code="token_not_valid")
+        return principal, parts[1]
+
+    def authenticate_header(self, request):
+        return f'{api_settings.AUTH_HEADER_TYPES[0]} realm="api"'
@@ -0,0 +1,70 @@
+# casebridge_auth/claims.py
+import hashlib
+import threading
+import time
+
+from cachetools import TLRUCache
+from django.conf import settings
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.state import token_backend
+
+from .principal import TokenPrincipal
+from .revocation import revocations
+
+CACHE_SIZE = getattr(settings, "TOKEN_CLAIMS_CACHE_SIZE", 10000)
+CACHE_TTL = getattr(settings, "TOKEN_CLAIMS_CACHE_TTL", 300)
+
+
+def _claims_ttu(key, claims, now):
+    # Never keep a token's claims around longer than the token itself is valid.
+    return min(now + CACHE_TTL, now + (claims["exp"] - time.time()))
+
+
+_claims_cache = TLRUCache(maxsize=CACHE_SIZE, ttu=_claims_ttu)
+_claims_lock = threading.Lock()
+
+
+def decode_claims(raw_token):
+    """
+    Verified claims of a user-service access token, or None. Signature,
+    expiry and token type are checked with the service's SIMPLE_JWT
+    settings; results are cached per token digest so a token seen again
+    skips the signature check.
+    """
+    if not raw_token:
+        return None
+    if isinstance(raw_token, bytes):
+        raw_token = raw_token.decode("latin-1")
+
+    key = hashlib.sha256(raw_token.encode()).digest()
+    with _claims_lock:
+        claims = _claims_cache.get(key)
+    if claims is not None:
+        return claims
+
+    try:
+        claims = token_backend.decode(raw_token, verify=True)
+    except TokenBackendError:
+        return None
+    if claims.get(api_settings.TOKEN_TYPE_CLAIM) != "access" or claims.get(api_settings.USER_ID_CLAIM) is None:
+        return None
+    if "exp" not in claims:
+        return None
+
+    with _claims_lock:
+        _claims_cache[key] = claims
+    return claims
+
+
+def authenticate_token(raw_token):
+    """TokenPrincipal for a valid, unrevoked access token; None otherwise."""
+    claims = decode_claims(raw_token)
+    if claims is None or revocations.is_revoked(claims.get(api_settings.JTI_CLAIM)):
+        return None
+    return TokenPrincipal.from_claims(claims, api_settings.USER_ID_CLAIM)
+
+
+def clear_claims_cache():
+    with _claims_lock:
+        _claims_cache.clear()
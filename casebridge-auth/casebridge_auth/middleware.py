@@ -0,0 +1,34 @@
+# casebridge_auth/middleware.py
+from urllib.parse import parse_qs
+
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+
+from .claims import authenticate_token
+
+
+def scope_token(scope):
+    """Token from the `?token=` query param, falling back to an Authorization header."""
+    query = parse_qs(scope.get("query_string", b"").decode())
+    if query.get("token"):
+        return query["token"][0]
+
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            parts = value.decode().split()
+            if len(parts) == 2 and parts[0].lower() == "bearer":
+                return parts[1]
+    return None
+
+
+class TokenPrincipalMiddleware(BaseMiddleware):
+    """Sets scope["user"] to a TokenPrincipal for a valid token, or AnonymousUser."""
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        scope["user"] = authenticate_token(scope_token(scope)) or AnonymousUser()
+        return await super().__call__(scope, receive, send)
+
+
+def TokenPrincipalMiddlewareStack(inner):
+    return TokenPrincipalMiddleware(inner)
@@ -0,0 +1,32 @@
+# casebridge_auth/permissions.py
+from rest_framework.permissions import BasePermission
+
+
+class HasRole(BasePermission):
+    """Allows authenticated callers whose token role is in `roles`."""
+
+    roles = ()
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and getattr(user, "role", None) in self.roles)
+
+
+class IsAdvocate(HasRole):
+    roles = ("advocate",)
+
+
+class IsClient(HasRole):
+    roles = ("client",)
+
+
+class IsAdminRole(HasRole):
+    roles = ("admin",)
+
+
+class IsMFAVerified(BasePermission):
+    """Allows only tokens issued after a completed MFA challenge."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and getattr(user, "mfa_verified", False))
@@ -0,0 +1,69 @@
+# casebridge_auth/principal.py
+
+
+class TokenPrincipal:
+    """
+    The authenticated caller, built only from verified token claims.
+
+    Implements the parts of the Django user interface that DRF and Channels
+    rely on (`is_authenticated`, `pk`, ...). `__slots__` keeps the per-request
+    object small and cheap to build.
+    """
+
+    __slots__ = ("id", "email", "role", "profile_id", "mfa_verified", "claims_version", "jti", "exp")
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, id, email=None, role=None, profile_id=None, mfa_verified=False,
+                 claims_version=None, jti=None, exp=None):
+        self.id = id
+        self.email = email
+        self.role = role
+        self.profile_id = profile_id
+        self.mfa_verified = mfa_verified
+        self.claims_version = claims_version
+        self.jti = jti
+        self.exp = exp
+
+    @classmethod
+    def from_claims(cls, claims, user_id_claim="user_id"):
+        return cls(
+            id=claims[user_id_claim],
+            email=claims.get("email"),
+            role=claims.get("role"),
+            profile_id=claims.get("profile_id"),
+            mfa_verified=bool(claims.get("mfa_verified")),
+            claims_version=claims.get("claims_version"),
+            jti=claims.get("jti"),
+            exp=claims.get("exp"),
+        )
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def is_advocate(self):
+        return self.role == "advocate"
+
+    @property
+    def is_client(self):
+        return self.role == "client"
+
+    @property
+    def is_admin(self):
+        return self.role == "admin"
+
+    def __eq__(self, other):
+        return isinstance(other, TokenPrincipal) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __str__(self):
+        return self.email or f"user {self.id}"
+
+    def __repr__(self):
+        return f"<TokenPrincipal id={self.id} role={self.role}>"
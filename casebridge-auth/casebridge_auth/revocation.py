@@ -0,0 +1,160 @@
+# casebridge_auth/revocation.py
+import base64
+import hashlib
+import logging
+import math
+import threading
+import time
+import uuid
+import zlib
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from kombu import Exchange, Queue
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_EXCHANGE = Exchange("token_revocations", type="fanout", durable=False)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over token ids. Bit positions come from double
+    hashing one blake2b digest; user-service builds snapshots with this same
+    class, so the layout (`hash`, `m`, `k`, bit order) is the wire format.
+    """
+
+    hash_name = "blake2b-dh"
+
+    def __init__(self, m, k, bits=None):
+        self.m = m
+        self.k = k
+        self.bits = bytearray(bits) if bits is not None else bytearray((m + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, fp_rate):
+        capacity = max(1, capacity)
+        m = max(8, math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        k = max(1, round(m / capacity * math.log(2)))
+        return cls(m, k)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.m for i in range(self.k))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def to_dict(self):
+        return {
+            "hash": self.hash_name, "m": self.m, "k": self.k,
+            "bits": base64.b64encode(zlib.compress(bytes(self.bits))).decode(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("hash") != cls.hash_name:
+            raise ValueError(f"Unsupported bloom hash {data.get('hash')!r}")
+        return cls(data["m"], data["k"], zlib.decompress(base64.b64decode(data["bits"])))
+
+
+class RevocationSubscriber:
+    """
+    In-memory view of user-service's revoked token ids.
+
+    Holds the latest Bloom-filter snapshot plus the exact jtis revoked since,
+    so `is_revoked` is two O(1) lookups and never touches the database. A
+    background thread binds a queue to the fanout exchange, pulls a full
+    snapshot over RPC, then applies deltas and periodic snapshots as they
+    arrive; after a dropped connection it starts over.
+
+    Until the first snapshot arrives nothing is reported as revoked. A Bloom
+    hit counts as revoked, so a false positive (TOKEN_REVOCATION_BLOOM_FP_RATE
+    on the user-service side) only forces that user to log in again.
+
+    `celery_app` is the dotted path of the service's Celery app; without it
+    the feed is off.
+    """
+
+    snapshot_task = "user_service.tasks.get_revocation_snapshot"
+
+    def __init__(self, celery_app=None, enabled=True, rpc_timeout=10, retry_delay=5):
+        self.celery_app = celery_app
+        self.enabled = enabled and bool(celery_app)
+        self.rpc_timeout = rpc_timeout
+        self.retry_delay = retry_delay
+        self._bloom = None
+        self._delta = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="token-revocations", daemon=True)
+                self._thread.start()
+
+    def apply(self, message):
+        now = time.time()
+        if message.get("type") == "snapshot":
+            bloom = BloomFilter.from_dict(message["bloom"])
+            with self._lock:
+                self._bloom = bloom
+                self._delta = {jti: exp for jti, exp in self._delta.items() if exp > now and jti not in bloom}
+        elif message.get("type") == "delta":
+            with self._lock:
+                for jti, exp in message["revoked"]:
+                    if exp > now:
+                        self._delta[jti] = exp
+
+    def is_revoked(self, jti):
+        if not jti:
+            return False
+        self.start()
+        with self._lock:
+            bloom, exp = self._bloom, self._delta.get(jti)
+        if exp is not None and exp > time.time():
+            return True
+        return bloom is not None and jti in bloom
+
+    def _on_message(self, body, message):
+        try:
+            self.apply(body)
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed token revocation message", exc_info=True)
+        message.ack()
+
+    def _run(self):
+        app = import_string(self.celery_app)
+        queue = Queue(f"token_revocations.{uuid.uuid4().hex}", exchange=REVOCATION_EXCHANGE, routing_key="", exclusive=True)
+        while True:
+            try:
+                with app.connection_for_read() as conn:
+                    with conn.Consumer(queue, callbacks=[self._on_message], accept=["json"]):
+                        # Bound before the pull, so nothing revoked in between is missed.
+                        self.apply(app.send_task(self.snapshot_task).get(timeout=self.rpc_timeout))
+                        while True:
+                            conn.drain_events()
+            except Exception:
+                logger.warning("Token revocation feed lost, retrying in %ss", self.retry_delay, exc_info=True)
+                time.sleep(self.retry_delay)
+
+    def clear(self):
+        with self._lock:
+            self._bloom = None
+            self._delta = {}
+
+
+revocations = RevocationSubscriber(
+    celery_app=getattr(settings, "TOKEN_REVOCATION_CELERY_APP", None),
+    enabled=getattr(settings, "TOKEN_REVOCATION_SUBSCRIBE", True),
+    rpc_timeout=getattr(settings, "TOKEN_REVOCATION_RPC_TIMEOUT", 10),
+)
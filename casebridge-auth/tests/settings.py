@@ -0,0 +1,6 @@
+SECRET_KEY = "casebridge-auth-tests"
+INSTALLED_APPS = ["django.contrib.contenttypes", "django.contrib.auth", "rest_framework", "casebridge_auth", "tests"]
+DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+USE_TZ = True
+SIMPLE_JWT = {"SIGNING_KEY": "test-signing-key", "ALGORITHM": "HS256", "AUTH_HEADER_TYPES": ("Bearer",)}
+TOKEN_REVOCATION_SUBSCRIBE = False
@@ -0,0 +1,128 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.state import token_backend
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from casebridge_auth import TokenPrincipal
+from casebridge_auth.authentication import TokenPrincipalAuthentication
+from casebridge_auth.claims import authenticate_token, clear_claims_cache, decode_claims
+from casebridge_auth.middleware import TokenPrincipalMiddleware
+from casebridge_auth.permissions import IsAdvocate, IsClient, IsMFAVerified
+from casebridge_auth.revocation import BloomFilter, revocations
+
+
+def make_token(user_id=7, role="client", lifetime=None, **claims):
+    token = AccessToken()
+    token["user_id"] = user_id
+    token["role"] = role
+    token["email"] = f"user{user_id}@example.com"
+    for name, value in claims.items():
+        token[name] = value
+    if lifetime is not None:
+        token.set_exp(lifetime=lifetime)
+    return token
+
+
+class AuthTestCase(SimpleTestCase):
+
+    def setUp(self):
+        clear_claims_cache()
+        revocations.clear()
+
+
+class DecodeClaimsTests(AuthTestCase):
+
+    def test_valid_token_becomes_principal(self):
+        principal = authenticate_token(str(make_token(user_id=42, role="advocate", profile_id=3, mfa_verified=True)))
+        self.assertEqual((principal.id, principal.role, principal.profile_id), (42, "advocate", 3))
+        self.assertTrue(principal.is_authenticated and principal.is_advocate and principal.mfa_verified)
+        self.assertEqual(principal.email, "user42@example.com")
+        with self.assertRaises(AttributeError):
+            principal.extra = 1
+
+    def test_invalid_expired_and_refresh_tokens_are_rejected(self):
+        self.assertIsNone(decode_claims("not-a-jwt"))
+        self.assertIsNone(decode_claims(None))
+        self.assertIsNone(decode_claims(str(make_token(lifetime=timedelta(seconds=-1)))))
+        self.assertIsNone(decode_claims(str(RefreshToken())))
+
+    def test_claims_are_cached_per_token(self):
+        token = str(make_token())
+        with patch.object(token_backend, "decode", wraps=token_backend.decode) as decoder:
+            decode_claims(token)
+            decode_claims(token)
+        self.assertEqual(decoder.call_count, 1)
+
+    def test_revoked_tokens_are_rejected_even_when_cached(self):
+        token = make_token()
+        self.assertIsNotNone(authenticate_token(str(token)))
+
+        revocations.apply({"type": "delta", "revoked": [[token["jti"], token["exp"]]]})
+        self.assertIsNone(authenticate_token(str(token)))
+
+        # Once a snapshot covers the jti it moves from the exact delta into the filter.
+        bloom = BloomFilter.for_capacity(1024, 1e-6)
+        bloom.add(token["jti"])
+        revocations.apply({"type": "snapshot", "bloom": bloom.to_dict()})
+        self.assertEqual(revocations._delta, {})
+        self.assertIsNone(authenticate_token(str(token)))
+        self.assertIsNotNone(authenticate_token(str(make_token())))
+
+
+class RestAuthenticationTests(AuthTestCase):
+
+    def authenticate(self, header=None):
+        extra = {"HTTP_AUTHORIZATION": header} if header else {}
+        return TokenPrincipalAuthentication().authenticate(Request(APIRequestFactory().get("/", **extra)))
+
+    def test_bearer_token_authenticates(self):
+        user, auth = self.authenticate(f"Bearer {make_token(user_id=5)}")
+        self.assertIsInstance(user, TokenPrincipal)
+        self.assertEqual(user.pk, 5)
+
+    def test_missing_or_foreign_scheme_is_skipped(self):
+        self.assertIsNone(self.authenticate())
+        self.assertIsNone(self.authenticate("Basic abc"))
+
+    def test_bad_token_fails(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate("Bearer garbage")
+
+    def test_role_permissions(self):
+        request = Request(APIRequestFactory().get("/"))
+        request.user = TokenPrincipal(id=1, role="advocate", mfa_verified=False)
+        self.assertTrue(IsAdvocate().has_permission(request, None))
+        self.assertFalse(IsClient().has_permission(request, None))
+        self.assertFalse(IsMFAVerified().has_permission(request, None))
+
+
+class ChannelsMiddlewareTests(AuthTestCase):
+
+    def run_middleware(self, scope):
+        captured = {}
+
+        async def inner(scope, receive, send):
+            captured.update(scope)
+
+        async_to_sync(TokenPrincipalMiddleware(inner))(scope, None, None)
+        return captured
+
+    def test_query_string_token_authenticates_user(self):
+        scope = self.run_middleware({"type": "websocket", "query_string": f"token={make_token(user_id=5)}".encode(), "headers": []})
+        self.assertTrue(scope["user"].is_authenticated)
+        self.assertEqual(scope["user"].id, 5)
+
+    def test_authorization_header_token_authenticates_user(self):
+        headers = [(b"authorization", f"Bearer {make_token(user_id=6)}".encode())]
+        scope = self.run_middleware({"type": "websocket", "query_string": b"", "headers": headers})
+        self.assertEqual(scope["user"].id, 6)
+
+    def test_missing_token_is_anonymous(self):
+        scope = self.run_middleware({"type": "websocket", "query_string": b"", "headers": []})
+        self.assertFalse(scope["user"].is_authenticated)
@@ -0,0 +1,11 @@
+# casebridge_common/__init__.py
+"""
+Service plumbing shared by the CaseBridge services, apart from
+authentication (see casebridge_auth).
+
+`directory` keeps a local replica of user-service's user directory for
+services that look users up (`manage.py consume_user_directory`), `rpc` is
+the client for calling other services' Celery tasks, `changelist` holds the
+estimated-count admin paginator and `specializations` the shared
+specialization name resolver.
+"""
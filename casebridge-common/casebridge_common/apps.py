@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class CasebridgeCommonConfig(AppConfig):
+    name = "casebridge_common"
+    verbose_name = "CaseBridge common"
@@ -0,0 +1,121 @@
+# casebridge_common/changelist.py
+import json
+import logging
+
+from django.conf import settings
+from django.contrib.admin.views.main import SEARCH_VAR
+from django.core.paginator import Paginator
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for big admin changelists. Rows are counted exactly only up to
+    `threshold`; beyond that `count` is PostgreSQL's estimate:
+    pg_class.reltuples for an unfiltered table, the planner's row estimate
+    for a filtered or searched one. Page numbers past the end of an
+    underestimate simply come back empty. Other databases count exactly.
+    """
+
+    @cached_property
+    def threshold(self):
+        return getattr(settings, "ADMIN_COUNT_ESTIMATE_THRESHOLD", 10000)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet) or connections[queryset.db].vendor != "postgresql":
+            return Paginator.count.func(self)
+        # Reads at most threshold + 1 rows, however large the table is.
+        capped = queryset.order_by()[:self.threshold + 1].count()
+        if capped <= self.threshold:
+            return capped
+        return max(self._estimate(queryset), capped)
+
+    def _estimate(self, queryset):
+        with connections[queryset.db].cursor() as cursor:
+            if not queryset.query.where:
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+                # -1 / 0 until the table has been vacuumed or analyzed once.
+                if row and row[0] > 0:
+                    return row[0]
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountAdminMixin:
+    """
+    ModelAdmin mixin for large tables: estimated page counts, no second
+    COUNT(*) for the "N total" link, and index-friendly search.
+
+    Fields named in `trigram_search_fields` get a GIN trigram index on
+    UPPER(field), the expression Django's icontains/istartswith compare,
+    after migrate (PostgreSQL with pg_trgm; see ensure_trigram_indexes).
+    Trigrams cannot help with terms under three characters, so those are
+    searched as prefixes instead.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    trigram_search_fields = ()
+
+    def get_search_fields(self, request):
+        fields = super().get_search_fields(request)
+        if len(request.GET.get(SEARCH_VAR, "").strip()) < 3:
+            return [field if field[:1] in ("^", "=", "@") else f"^{field}" for field in fields]
+        return fields
+
+
+def ensure_trigram_indexes(model, fields, using=DEFAULT_DB_ALIAS):
+    """
+    Creates `<table>_<field>_trgm` GIN indexes on UPPER(field) without
+    blocking writes. Returns the names of the indexes ensured; does nothing
+    on other databases, and only logs if pg_trgm cannot be installed.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql" or not fields:
+        return []
+
+    table = model._meta.db_table
+    quote = connection.ops.quote_name
+    names = []
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for field in fields:
+                column = model._meta.get_field(field).column
+                name = f"{table}_{column}_trgm"[:63]
+                cursor.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(name)} "
+                    f"ON {quote(table)} USING gin (UPPER({quote(column)}) gin_trgm_ops)"
+                )
+                names.append(name)
+    except DatabaseError:
+        logger.warning("Could not create trigram search indexes on %s", table, exc_info=True)
+    return names
+
+
+def ensure_admin_search_indexes(using=DEFAULT_DB_ALIAS, site=None):
+    """
+    Ensures the `trigram_search_fields` indexes of every admin registered on
+    `site` (the default admin site). Unmanaged models are skipped: their
+    tables belong to another service.
+    """
+    if site is None:
+        from django.contrib.admin import site
+
+    ensured = []
+    for model, model_admin in site._registry.items():
+        fields = getattr(model_admin, "trigram_search_fields", ())
+        if fields and model._meta.managed:
+            ensured += ensure_trigram_indexes(model, fields, using=using)
+    return ensured
@@ -0,0 +1,173 @@
+# casebridge_common/directory.py
+import logging
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, models, transaction
+from django.utils.module_loading import import_string
+from kombu import Exchange, Queue
+
+logger = logging.getLogger(__name__)
+
+USER_DIRECTORY_EXCHANGE = Exchange("user_directory", type="fanout", durable=True)
+DIRECTORY_FIELDS = ("email", "role", "display_name", "is_active")
+
+
+class DirectoryUserQuerySet(models.QuerySet):
+    def live(self):
+        return self.filter(is_deleted=False)
+
+    def records(self, user_ids):
+        """
+        id -> {"id", "email", "role", "display_name"} (the row shape of
+        user-service's get_users_info) in one primary-key lookup. Deleted
+        users map to None; ids never replicated are absent.
+        """
+        rows = self.filter(id__in=user_ids).values("id", "email", "role", "display_name", "is_deleted")
+        return {row["id"]: None if row.pop("is_deleted") else row for row in rows}
+
+
+class AbstractDirectoryUser(models.Model):
+    """
+    Local, read-only copy of one user-service user, kept current by
+    `apply_events`. Each service declares a concrete subclass and names it
+    in USER_DIRECTORY_MODEL.
+
+    `version` is the id of the user-service outbox event the row came from
+    (0 for rows loaded by `bootstrap`); older events never overwrite newer
+    ones. Deleted users are kept as tombstones so a late event cannot bring
+    them back.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    email = models.EmailField(db_index=True)
+    role = models.CharField(max_length=20, db_index=True)
+    display_name = models.CharField(max_length=255, blank=True)
+    is_active = models.BooleanField(default=True)
+    is_deleted = models.BooleanField(default=False)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = DirectoryUserQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.email} ({self.role})"
+
+
+def get_directory_model():
+    return apps.get_model(settings.USER_DIRECTORY_MODEL)
+
+
+def _row(model, event):
+    fields = {field: event[field] for field in DIRECTORY_FIELDS}
+    fields["display_name"] = fields["display_name"] or ""
+    return model(id=int(event["id"]), version=event["version"], is_deleted=bool(event.get("deleted")), **fields)
+
+
+def apply_events(events, model=None):
+    """
+    Upserts directory events (`{"id", "version", "deleted", "email", "role",
+    "display_name", "is_active"}`) in one transaction and returns the number
+    of rows written. Only the newest event per user is applied, and only if
+    it is not older than the stored row, so redelivered or reordered batches
+    are harmless.
+    """
+    model = model or get_directory_model()
+    latest = {}
+    for event in events:
+        uid = int(event["id"])
+        if uid not in latest or event["version"] >= latest[uid]["version"]:
+            latest[uid] = event
+    if not latest:
+        return 0
+
+    with transaction.atomic():
+        stored = dict(model.objects.select_for_update().filter(id__in=latest).values_list("id", "version"))
+        rows = [_row(model, event) for uid, event in latest.items() if uid not in stored or event["version"] >= stored[uid]]
+        model.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=["id"],
+            update_fields=[*DIRECTORY_FIELDS, "is_deleted", "version", "updated_at"],
+        )
+    return len(rows)
+
+
+class DirectoryConsumer:
+    """
+    Feeds a service's directory table from user-service. Binds the durable
+    queue `queue_name` to the fanout exchange, so events published while the
+    consumer is down wait in the broker, then applies each batch before
+    acking it. A batch that fails to apply is requeued.
+
+    `celery_app` is the dotted path of the service's Celery app; its broker
+    connection is reused.
+    """
+
+    export_task = "user_service.tasks.export_user_directory"
+
+    def __init__(self, celery_app, queue_name, rpc_timeout=30, retry_delay=5):
+        self.celery_app = celery_app
+        self.queue_name = queue_name
+        self.rpc_timeout = rpc_timeout
+        self.retry_delay = retry_delay
+
+    @property
+    def app(self):
+        return import_string(self.celery_app)
+
+    def queue(self):
+        return Queue(self.queue_name, exchange=USER_DIRECTORY_EXCHANGE, routing_key="", durable=True)
+
+    def declare(self):
+        """Binds the queue; events published from here on are kept for this service."""
+        with self.app.connection_for_write() as conn:
+            self.queue()(conn.default_channel).declare()
+
+    def bootstrap(self, batch_size=1000):
+        """
+        Copies every user across, a page of `batch_size` per RPC, and returns
+        the number of rows written. Bootstrapped rows have version 0, so any
+        event already applied or still queued wins over them; call `declare`
+        first so no change made during the copy is lost.
+        """
+        written, after_id = 0, 0
+        while True:
+            page = self.app.send_task(self.export_task, args=[after_id, batch_size]).get(timeout=self.rpc_timeout)
+            if not page:
+                return written
+            written += apply_events(page)
+            after_id = page[-1]["id"]
+
+    def _on_message(self, body, message):
+        close_old_connections()
+        try:
+            apply_events(body["events"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Dropping malformed user directory batch", exc_info=True)
+        except Exception:
+            logger.exception("Could not apply user directory batch, requeueing")
+            message.requeue()
+            time.sleep(self.retry_delay)
+            return
+        message.ack()
+
+    def run(self, prefetch=10):
+        while True:
+            try:
+                with self.app.connection_for_read() as conn:
+                    with conn.Consumer(self.queue(), callbacks=[self._on_message], accept=["json"], prefetch_count=prefetch):
+                        while True:
+                            conn.drain_events()
+            except Exception:
+                logger.warning("User directory feed lost, retrying in %ss", self.retry_delay, exc_info=True)
+                time.sleep(self.retry_delay)
+
+
+def directory_consumer():
+    return DirectoryConsumer(
+        celery_app=settings.USER_DIRECTORY_CELERY_APP,
+        queue_name=settings.USER_DIRECTORY_QUEUE,
+        rpc_timeout=getattr(settings, "USER_DIRECTORY_RPC_TIMEOUT", 30),
+    )
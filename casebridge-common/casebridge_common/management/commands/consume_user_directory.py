@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from casebridge_common.directory import directory_consumer
+
+
+class Command(BaseCommand):
+    help = "Keeps USER_DIRECTORY_MODEL in sync with user-service's directory events (runs until stopped)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bootstrap", action="store_true", help="Copy every user across before consuming.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--prefetch", type=int, default=10)
+
+    def handle(self, *args, **options):
+        consumer = directory_consumer()
+        consumer.declare()
+        if options["bootstrap"]:
+            written = consumer.bootstrap(batch_size=options["batch_size"])
+            self.stdout.write(f"Bootstrapped {written} user(s)")
+        self.stdout.write(f"Consuming user directory events from {consumer.queue_name}")
+        consumer.run(prefetch=options["prefetch"])
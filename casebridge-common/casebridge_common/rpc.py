@@ -0,0 +1,287 @@
+# casebridge_common/rpc.py
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+
+from cachetools import TTLCache
+from celery.exceptions import TimeoutError as CeleryTimeoutError
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class RpcError(APIException):
+    """A call to another service failed; DRF views answer 503 unless a subclass says otherwise."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "A dependent service is unavailable, please retry shortly."
+    default_code = "rpc_unavailable"
+
+
+class CircuitOpenError(RpcError):
+    default_code = "rpc_circuit_open"
+
+
+class DeadlineExceeded(RpcError):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    default_detail = "A dependent service did not answer in time."
+    default_code = "rpc_deadline_exceeded"
+
+
+class RemoteTaskError(RpcError):
+    status_code = status.HTTP_502_BAD_GATEWAY
+    default_detail = "A dependent service failed to handle the request."
+    default_code = "rpc_remote_error"
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker for one remote task.
+
+    Looks at the outcomes of the last `window` calls. Once at least
+    `min_calls` are in and `failure_rate` of them failed, the circuit opens
+    and calls fail fast for `cooldown` seconds. After that a single probe is
+    let through (half-open): if it succeeds the circuit closes, otherwise it
+    opens for another cooldown.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, window=20, min_calls=10, failure_rate=0.5, cooldown=30.0, clock=time.monotonic):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = self.CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self.clock() - self._opened_at < self.cooldown:
+                    return False
+                self.state, self._probing = self.HALF_OPEN, False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record(self, ok):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                if ok:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+            self._outcomes.append(ok)
+            calls = len(self._outcomes)
+            if self.state == self.CLOSED and calls >= self.min_calls and self._outcomes.count(False) / calls >= self.failure_rate:
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self._opened_at = self.clock()
+        self._outcomes.clear()
+
+
+class _TaskMetrics:
+    def __init__(self, samples):
+        self.counts = {"calls": 0, "ok": 0, "errors": 0, "timeouts": 0, "rejected": 0, "cache_hits": 0}
+        self.latencies = deque(maxlen=samples)
+
+
+class _Settled:
+    """A call answered without waiting: a cache hit, or one refused before it was sent."""
+
+    def __init__(self, value=None, error=None):
+        self.value, self.error = value, error
+
+    def wait(self, deadline):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class _InFlight:
+    def __init__(self, client, task_name, cache_key, async_result):
+        self.client = client
+        self.task_name = task_name
+        self.cache_key = cache_key
+        self.async_result = async_result
+        self.started = time.monotonic()
+
+    def wait(self, deadline):
+        try:
+            value = self.async_result.get(timeout=max(deadline - time.monotonic(), 0.001))
+        except CeleryTimeoutError:
+            self.client._finish(self.task_name, self.started, "timeouts")
+            raise DeadlineExceeded(f"{self.task_name} did not answer before the deadline")
+        except Exception as exc:
+            # The remote exception's text stays in the log; API clients get the generic detail
+            logger.warning("%s failed", self.task_name, exc_info=True)
+            self.client._finish(self.task_name, self.started, "errors")
+            raise RemoteTaskError() from exc
+        self.client._finish(self.task_name, self.started, "ok")
+        self.client._store(self.task_name, self.cache_key, value)
+        return value
+
+
+class RpcClient:
+    """
+    Calls tasks of other services over Celery without holding the caller
+    for one timeout per call.
+
+    `gather` sends every call before waiting on any, so a fan-out costs the
+    slowest call rather than the sum, and all of them share one deadline.
+    Each task name has its own CircuitBreaker: while it is open, calls fail
+    at once with CircuitOpenError instead of waiting out the deadline.
+    Results of the tasks listed in `cache_ttls` are cached for that many
+    seconds per distinct arguments. `stats()` reports outcomes, latency
+    percentiles and circuit state per task.
+
+    Failures surface as RpcError subclasses, which DRF renders as 502, 503
+    or 504 responses.
+    """
+
+    def __init__(self, celery_app=None, timeout=10, cache_ttls=None, cache_size=10000,
+                 breaker_window=20, breaker_min_calls=10, breaker_failure_rate=0.5, breaker_cooldown=30.0,
+                 latency_samples=1024):
+        self.celery_app = celery_app
+        self.timeout = timeout
+        self.cache_ttls = dict(cache_ttls or {})
+        self.breaker_options = {
+            "window": breaker_window, "min_calls": breaker_min_calls,
+            "failure_rate": breaker_failure_rate, "cooldown": breaker_cooldown,
+        }
+        self.latency_samples = latency_samples
+        self._caches = {name: TTLCache(maxsize=cache_size, ttl=ttl) for name, ttl in self.cache_ttls.items()}
+        self._breakers = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    @property
+    def app(self):
+        return import_string(self.celery_app) if isinstance(self.celery_app, str) else self.celery_app
+
+    # ---------------- Calls ----------------
+    def call(self, task_name, args=(), kwargs=None, timeout=None):
+        """One remote call; returns its result or raises an RpcError."""
+        return self.gather([(task_name, args, kwargs)], timeout=timeout)[0]
+
+    def gather(self, calls, timeout=None, return_exceptions=False):
+        """
+        Runs `calls`, a list of (task_name, args[, kwargs]) tuples,
+        concurrently and returns their results in order once all have
+        answered or `timeout` seconds have passed. With `return_exceptions`
+        a failed call's RpcError takes its place in the list; otherwise the
+        first failure is raised after every call has settled.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        sent = [self._send(*call) for call in calls]
+        results, first_error = [], None
+        for pending in sent:
+            try:
+                results.append(pending.wait(deadline))
+            except RpcError as exc:
+                results.append(exc)
+                first_error = first_error or exc
+        if first_error is not None and not return_exceptions:
+            raise first_error
+        return results
+
+    def _send(self, task_name, args=(), kwargs=None):
+        kwargs = kwargs or {}
+        metrics = self._task_metrics(task_name)
+        cache_key = json.dumps([args, kwargs], sort_keys=True, default=str) if task_name in self._caches else None
+        with self._lock:
+            metrics.counts["calls"] += 1
+            hit = self._caches[task_name].get(cache_key, _MISSING) if cache_key is not None else _MISSING
+            if hit is not _MISSING:
+                metrics.counts["cache_hits"] += 1
+                return _Settled(value=hit)
+
+        if not self._breaker(task_name).allow():
+            with self._lock:
+                metrics.counts["rejected"] += 1
+            return _Settled(error=CircuitOpenError(f"{task_name} is failing; not calling it for now"))
+
+        started = time.monotonic()
+        try:
+            async_result = self.app.send_task(task_name, args=list(args), kwargs=kwargs)
+        except Exception as exc:
+            logger.warning("Could not send %s", task_name, exc_info=True)
+            self._finish(task_name, started, "errors")
+            error = RpcError()
+            error.__cause__ = exc
+            return _Settled(error=error)
+        return _InFlight(self, task_name, cache_key, async_result)
+
+    def _finish(self, task_name, started, outcome):
+        self._breaker(task_name).record(outcome == "ok")
+        metrics = self._task_metrics(task_name)
+        with self._lock:
+            metrics.counts[outcome] += 1
+            metrics.latencies.append(time.monotonic() - started)
+
+    def _store(self, task_name, cache_key, value):
+        if cache_key is not None:
+            with self._lock:
+                self._caches[task_name][cache_key] = value
+
+    def _breaker(self, task_name):
+        with self._lock:
+            if task_name not in self._breakers:
+                self._breakers[task_name] = CircuitBreaker(**self.breaker_options)
+            return self._breakers[task_name]
+
+    def _task_metrics(self, task_name):
+        with self._lock:
+            if task_name not in self._metrics:
+                self._metrics[task_name] = _TaskMetrics(self.latency_samples)
+            return self._metrics[task_name]
+
+    def invalidate(self, task_name=None):
+        """Drops cached results of one task, or of all of them."""
+        with self._lock:
+            for name, cache in self._caches.items():
+                if task_name in (None, name):
+                    cache.clear()
+
+    # ---------------- Metrics ----------------
+    def stats(self):
+        with self._lock:
+            snapshot = {name: (dict(m.counts), sorted(m.latencies)) for name, m in self._metrics.items()}
+            breakers = {name: b.state for name, b in self._breakers.items()}
+        stats = {}
+        for name, (counts, latencies) in snapshot.items():
+            stats[name] = dict(counts, circuit=breakers.get(name, CircuitBreaker.CLOSED), latency_ms={
+                f"p{pct}": round(latencies[max(0, math.ceil(pct / 100 * len(latencies)) - 1)] * 1000, 2) if latencies else None
+                for pct in (50, 95, 99)
+            })
+        return stats
+
+
+rpc_client = RpcClient(
+    celery_app=getattr(settings, "RPC_CELERY_APP", None),
+    timeout=getattr(settings, "RPC_TIMEOUT", 10),
+    cache_ttls=getattr(settings, "RPC_CACHE_TTLS", {}),
+    breaker_window=getattr(settings, "RPC_BREAKER_WINDOW", 20),
+    breaker_min_calls=getattr(settings, "RPC_BREAKER_MIN_CALLS", 10),
+    breaker_failure_rate=getattr(settings, "RPC_BREAKER_FAILURE_RATE", 0.5),
+    breaker_cooldown=getattr(settings, "RPC_BREAKER_COOLDOWN", 30),
+)
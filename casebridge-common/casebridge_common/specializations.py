@@ -0,0 +1,101 @@
+# casebridge_common/specializations.py
+import threading
+import uuid
+
+from cachetools import LRUCache
+from django.core.cache import cache
+from django.db import transaction
+
+
+class SpecializationResolver:
+    """
+    Maps specialization names to ids of `model` (any model with a unique
+    `name`), creating unknown names on the way.
+
+    Known names are answered from an in-process cache; misses cost one
+    SELECT, and names that do not exist yet one INSERT ... ON CONFLICT DO
+    NOTHING plus a re-read, so concurrent writers never race on get_or_create.
+
+    The in-process names are only trusted while a version token in the
+    shared Django cache is unchanged. `forget` replaces the token once the
+    rename or delete that called it commits, so every worker drops its names
+    on its next lookup instead of linking a deleted id (a foreign key error)
+    or the wrong row after a rename. A lookup costs one cache read.
+    """
+
+    def __init__(self, model, maxsize=10000):
+        self.model = model
+        self.version_key = f"specialization_resolver:{model._meta.label_lower}:version"
+        self._ids = LRUCache(maxsize=maxsize)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def resolve(self, names):
+        names = list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+        version = self.version()
+        with self._lock:
+            if version != self._version:
+                self._ids.clear()
+                self._version = version
+            ids = {n: self._ids[n] for n in names if n in self._ids}
+        missing = [n for n in names if n not in ids]
+        if missing:
+            ids.update(self._fetch(missing, version))
+            unknown = [n for n in missing if n not in ids]
+            if unknown:
+                self.create(unknown)
+                ids.update(self._fetch(unknown, version))
+        return [ids[n] for n in names]
+
+    def create(self, names):
+        self.model.objects.bulk_create([self.model(name=n) for n in names], ignore_conflicts=True)
+
+    def _fetch(self, names, version):
+        found = dict(self.model.objects.filter(name__in=names).values_list("name", "id"))
+        with self._lock:
+            # Rows read under an older version may predate the change that replaced it
+            if version == self._version:
+                self._ids.update(found)
+        return found
+
+    def version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(self.version_key, version, timeout=None):
+                version = cache.get(self.version_key, version)
+        return version
+
+    def forget(self):
+        """Drops every cached name, here now and in all workers once the current transaction commits."""
+        self.clear()
+        transaction.on_commit(lambda: cache.set(self.version_key, uuid.uuid4().hex, timeout=None))
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+
+
+def sync_specializations(profile, names, resolver):
+    """
+    Makes `profile.specializations` exactly `names`. The current links are
+    diffed against the target, so at most one DELETE and one INSERT hit the
+    through table and unchanged rows are left alone.
+    """
+    manager = profile.specializations
+    through = manager.through
+    source, target_field = f"{manager.source_field_name}_id", f"{manager.target_field_name}_id"
+    target = set(resolver.resolve(names))
+    links = through.objects.filter(**{source: profile.pk})
+    current = set(links.values_list(target_field, flat=True))
+
+    removed = current - target
+    if removed:
+        links.filter(**{f"{target_field}__in": removed}).delete()
+    added = target - current
+    if added:
+        through.objects.bulk_create(
+            [through(**{source: profile.pk, target_field: spec_id}) for spec_id in added],
+            ignore_conflicts=True,
+        )
+    getattr(profile, "_prefetched_objects_cache", {}).pop("specializations", None)
@@ -0,0 +1,22 @@
+from django.db import models
+
+from casebridge_common.directory import AbstractDirectoryUser
+
+
+class DirectoryUser(AbstractDirectoryUser):
+    class Meta:
+        app_label = "tests"
+
+
+class Specialization(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        app_label = "tests"
+
+
+class AdvocateProfile(models.Model):
+    specializations = models.ManyToManyField(Specialization, blank=True)
+
+    class Meta:
+        app_label = "tests"
@@ -0,0 +1,5 @@
+SECRET_KEY = "casebridge-common-tests"
+INSTALLED_APPS = ["django.contrib.contenttypes", "django.contrib.auth", "casebridge_common", "tests"]
+DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+USE_TZ = True
+USER_DIRECTORY_MODEL = "tests.DirectoryUser"
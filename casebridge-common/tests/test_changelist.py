@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from django.contrib import admin
+from django.test import RequestFactory, override_settings
+
+from casebridge_common.changelist import EstimatedCountAdminMixin, EstimatedCountPaginator, ensure_admin_search_indexes
+
+from .models import DirectoryUser
+from .test_directory import DirectoryTestCase
+
+
+class DirectoryUserAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    search_fields = ("email", "=role")
+    trigram_search_fields = ("email",)
+
+
+class EstimatedCountPaginatorTests(DirectoryTestCase):
+
+    def setUp(self):
+        DirectoryUser.objects.bulk_create(
+            DirectoryUser(id=n, email=f"user{n}@example.com", role="client") for n in range(1, 8)
+        )
+
+    def test_other_databases_count_exactly(self):
+        paginator = EstimatedCountPaginator(DirectoryUser.objects.order_by("id"), 3)
+        with self.assertNumQueries(1):
+            self.assertEqual((paginator.count, paginator.num_pages), (7, 3))
+
+    @override_settings(ADMIN_COUNT_ESTIMATE_THRESHOLD=5)
+    @patch.object(EstimatedCountPaginator, "_estimate", return_value=40)
+    def test_counts_past_the_threshold_are_estimated(self, estimate):
+        paginator = EstimatedCountPaginator(DirectoryUser.objects.order_by("id"), 3)
+        with patch("django.db.backends.sqlite3.base.DatabaseWrapper.vendor", "postgresql"):
+            self.assertEqual(paginator.count, 40)
+            self.assertEqual(EstimatedCountPaginator(DirectoryUser.objects.filter(id__lt=4), 3).count, 3)
+        estimate.assert_called_once()
+
+
+class EstimatedCountAdminMixinTests(DirectoryTestCase):
+
+    def setUp(self):
+        self.site = admin.AdminSite()
+        self.site.register(DirectoryUser, DirectoryUserAdmin)
+        self.model_admin = self.site._registry[DirectoryUser]
+
+    def search_fields(self, term):
+        return self.model_admin.get_search_fields(RequestFactory().get("/", {"q": term}))
+
+    def test_short_terms_are_searched_as_prefixes(self):
+        self.assertEqual(self.search_fields("ab"), ["^email", "=role"])
+        self.assertEqual(self.search_fields("abc"), ("email", "=role"))
+
+    def test_trigram_indexes_are_skipped_off_postgresql(self):
+        self.assertEqual(ensure_admin_search_indexes(site=self.site), [])
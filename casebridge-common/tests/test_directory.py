@@ -0,0 +1,89 @@
+from unittest.mock import Mock, patch
+
+from django.db import connection
+from django.test import TestCase
+
+from casebridge_common.directory import DirectoryConsumer, apply_events
+
+from .models import DirectoryUser
+
+
+def event(user_id, version, deleted=False, **fields):
+    record = {"id": user_id, "version": version, "deleted": deleted, "email": f"user{user_id}@example.com",
+              "role": "client", "display_name": f"User {user_id}", "is_active": True}
+    record.update(fields)
+    return record
+
+
+class DirectoryTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            editor.create_model(DirectoryUser)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(DirectoryUser)
+
+
+class ApplyEventsTests(DirectoryTestCase):
+
+    def test_newest_event_per_user_wins_within_a_batch(self):
+        apply_events([event(1, 5, display_name="New"), event(1, 3, display_name="Old"), event(2, 4)])
+        self.assertEqual(DirectoryUser.objects.get(id=1).display_name, "New")
+        self.assertEqual(DirectoryUser.objects.count(), 2)
+
+    def test_older_events_do_not_overwrite_newer_rows(self):
+        apply_events([event(1, 5, role="advocate")])
+        self.assertEqual(apply_events([event(1, 4, role="client")]), 0)
+        self.assertEqual(DirectoryUser.objects.get(id=1).role, "advocate")
+
+    def test_redelivery_is_idempotent(self):
+        batch = [event(1, 5), event(2, 6)]
+        apply_events(batch)
+        apply_events(batch)
+        self.assertEqual(DirectoryUser.objects.count(), 2)
+
+    def test_bootstrap_rows_never_beat_events(self):
+        apply_events([event(1, 5, display_name="From event")])
+        apply_events([event(1, 0, display_name="From bootstrap"), event(2, 0)])
+        self.assertEqual(DirectoryUser.objects.get(id=1).display_name, "From event")
+        self.assertTrue(DirectoryUser.objects.filter(id=2).exists())
+
+    def test_deleted_users_are_tombstoned(self):
+        apply_events([event(1, 5), event(2, 6)])
+        apply_events([event(1, 7, deleted=True, is_active=False)])
+        apply_events([event(1, 6, display_name="Late update")])
+
+        records = DirectoryUser.objects.records([1, 2, 3])
+        self.assertIsNone(records[1])
+        self.assertEqual(records[2], {"id": 2, "email": "user2@example.com", "role": "client", "display_name": "User 2"})
+        self.assertNotIn(3, records)
+
+
+class DirectoryConsumerTests(DirectoryTestCase):
+
+    def setUp(self):
+        self.consumer = DirectoryConsumer(celery_app="unused.app", queue_name="user_directory.tests", retry_delay=0)
+
+    def test_applied_batches_are_acked(self):
+        message = Mock()
+        self.consumer._on_message({"type": "user_directory", "events": [event(1, 1)]}, message)
+        message.ack.assert_called_once_with()
+        self.assertTrue(DirectoryUser.objects.filter(id=1).exists())
+
+    def test_failed_batches_are_requeued(self):
+        message = Mock()
+        with patch("casebridge_common.directory.apply_events", side_effect=RuntimeError("db down")):
+            self.consumer._on_message({"events": [event(1, 1)]}, message)
+        message.requeue.assert_called_once_with()
+        message.ack.assert_not_called()
+
+    def test_malformed_batches_are_dropped(self):
+        message = Mock()
+        self.consumer._on_message({"type": "user_directory"}, message)
+        message.ack.assert_called_once_with()
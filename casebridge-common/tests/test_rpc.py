@@ -0,0 +1,103 @@
+import time
+from unittest import TestCase
+
+from celery.exceptions import TimeoutError as CeleryTimeoutError
+
+from casebridge_common.rpc import CircuitBreaker, CircuitOpenError, DeadlineExceeded, RemoteTaskError, RpcClient
+
+
+class FakeResult:
+
+    def __init__(self, value=None, delay=0.0, error=None):
+        self.value, self.delay, self.error = value, delay, error
+        self.sent_at = time.monotonic()
+
+    def get(self, timeout=None):
+        remaining = self.sent_at + self.delay - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            raise CeleryTimeoutError()
+        time.sleep(max(remaining, 0))
+        if self.error:
+            raise self.error
+        return self.value
+
+
+class FakeApp:
+    """Answers each task with `handlers[task_name](*args, **kwargs)`, a FakeResult."""
+
+    def __init__(self, **handlers):
+        self.handlers = handlers
+        self.sent = []
+
+    def send_task(self, name, args=None, kwargs=None):
+        self.sent.append((name, args, kwargs))
+        return self.handlers[name.rsplit(".", 1)[-1]](*args, **kwargs)
+
+
+class RpcClientTests(TestCase):
+
+    def test_gather_waits_for_the_slowest_call_not_the_sum(self):
+        app = FakeApp(slow=lambda n: FakeResult(n * 2, delay=0.1))
+        client = RpcClient(app, timeout=1)
+        started = time.monotonic()
+        self.assertEqual(client.gather([("svc.slow", [n]) for n in range(5)]), [0, 2, 4, 6, 8])
+        self.assertLess(time.monotonic() - started, 0.3)
+
+    def test_calls_past_the_deadline_fail_without_holding_the_rest(self):
+        app = FakeApp(fast=lambda: FakeResult("ok"), stuck=lambda: FakeResult(delay=5))
+        results = RpcClient(app).gather([("svc.fast", []), ("svc.stuck", [])], timeout=0.1, return_exceptions=True)
+        self.assertEqual(results[0], "ok")
+        self.assertIsInstance(results[1], DeadlineExceeded)
+
+    def test_remote_error_text_is_logged_not_returned(self):
+        client = RpcClient(FakeApp(boom=lambda: FakeResult(error=ValueError("password column missing"))))
+        with self.assertLogs("casebridge_common.rpc", "WARNING") as logs, self.assertRaises(RemoteTaskError) as raised:
+            client.call("svc.boom")
+        self.assertEqual(raised.exception.detail, RemoteTaskError.default_detail)
+        self.assertIn("password column missing", logs.output[0])
+
+    def test_cached_tasks_are_sent_once_per_arguments(self):
+        app = FakeApp(lookup=lambda user_id: FakeResult({"id": user_id}))
+        client = RpcClient(app, cache_ttls={"svc.lookup": 60})
+        for _ in range(3):
+            client.call("svc.lookup", [1])
+        client.call("svc.lookup", [2])
+        self.assertEqual(len(app.sent), 2)
+        self.assertEqual(client.stats()["svc.lookup"]["cache_hits"], 2)
+
+    def test_failing_task_trips_its_circuit(self):
+        app = FakeApp(boom=lambda: FakeResult(error=ValueError("down")), fine=lambda: FakeResult(1))
+        client = RpcClient(app, breaker_window=4, breaker_min_calls=4, breaker_cooldown=60)
+        for _ in range(4):
+            with self.assertRaises(RemoteTaskError):
+                client.call("svc.boom")
+        with self.assertRaises(CircuitOpenError):
+            client.call("svc.boom")
+        self.assertEqual(client.call("svc.fine"), 1)
+
+        stats = client.stats()["svc.boom"]
+        self.assertEqual((stats["errors"], stats["rejected"], stats["circuit"]), (4, 1, "open"))
+        self.assertEqual(len(app.sent), 5)
+
+
+class CircuitBreakerTests(TestCase):
+
+    def test_half_open_probe_decides(self):
+        now = [0.0]
+        breaker = CircuitBreaker(window=4, min_calls=2, failure_rate=0.5, cooldown=10, clock=lambda: now[0])
+        breaker.record(True)
+        breaker.record(False)
+        self.assertFalse(breaker.allow())
+
+        now[0] = 11
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # only one probe at a time
+        breaker.record(False)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        now[0] = 22
+        self.assertTrue(breaker.allow())
+        breaker.record(True)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
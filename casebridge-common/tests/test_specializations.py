@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+
+from casebridge_common.specializations import SpecializationResolver, sync_specializations
+
+from .models import AdvocateProfile, Specialization
+
+
+class SpecializationTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            editor.create_model(Specialization)
+            editor.create_model(AdvocateProfile)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(AdvocateProfile)
+            editor.delete_model(Specialization)
+
+    def setUp(self):
+        cache.clear()
+        # Two workers: separate in-process names, one shared cache
+        self.worker, self.other_worker = SpecializationResolver(Specialization), SpecializationResolver(Specialization)
+
+
+class SpecializationResolverTests(SpecializationTestCase):
+
+    def test_unknown_names_are_created_and_known_ones_cached(self):
+        criminal = Specialization.objects.create(name="Criminal")
+        ids = self.worker.resolve(["Criminal", " Family ", "Criminal", ""])
+        self.assertEqual(ids[0], criminal.id)
+        self.assertEqual(set(Specialization.objects.values_list("name", flat=True)), {"Criminal", "Family"})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.worker.resolve(["Family", "Criminal"]), ids[::-1])
+
+    def test_rename_in_another_worker_is_not_served_from_cache(self):
+        [old_id] = self.worker.resolve(["Criminal"])
+        with self.captureOnCommitCallbacks(execute=True):
+            Specialization.objects.filter(id=old_id).update(name="Criminal Law")
+            self.other_worker.forget()
+
+        [new_id] = self.worker.resolve(["Criminal"])
+        self.assertNotEqual(new_id, old_id)
+        self.assertEqual(Specialization.objects.get(id=new_id).name, "Criminal")
+
+    def test_delete_in_another_worker_is_not_served_from_cache(self):
+        [old_id] = self.worker.resolve(["Criminal"])
+        with self.captureOnCommitCallbacks(execute=True):
+            Specialization.objects.filter(id=old_id).delete()
+            self.other_worker.forget()
+
+        [new_id] = self.worker.resolve(["Criminal"])
+        self.assertTrue(Specialization.objects.filter(id=new_id, name="Criminal").exists())
+
+    def test_rolled_back_changes_keep_other_workers_cache(self):
+        [criminal] = self.worker.resolve(["Criminal"])
+        with self.captureOnCommitCallbacks(execute=False):
+            self.other_worker.forget()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.worker.resolve(["Criminal"]), [criminal])
+
+
+class SyncSpecializationsTests(SpecializationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.profile = AdvocateProfile.objects.create()
+        self.through = AdvocateProfile.specializations.through
+
+    def names(self):
+        return set(self.profile.specializations.values_list("name", flat=True))
+
+    def test_sync_applies_diff_and_keeps_unchanged_links(self):
+        sync_specializations(self.profile, ["Criminal", "Family"], self.worker)
+        self.worker.resolve(["Tax"])
+        kept = self.through.objects.get(advocateprofile=self.profile, specialization__name="Criminal").pk
+
+        # one read of the current links, one DELETE, one INSERT
+        with self.assertNumQueries(3):
+            sync_specializations(self.profile, ["Criminal", "Tax"], self.worker)
+        self.assertEqual(self.names(), {"Criminal", "Tax"})
+        self.assertEqual(self.through.objects.get(advocateprofile=self.profile, specialization__name="Criminal").pk, kept)
+
+        with self.assertNumQueries(1):
+            sync_specializations(self.profile, ["Tax", "Criminal"], self.worker)
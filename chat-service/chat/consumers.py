@@ -1,14 +1,16 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from django.contrib.auth import get_user_model
 from .models import ChatRoom, Message
 
-User = get_user_model()
-
 
 class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
+        self.user = self.scope.get('user')
+        if not self.user or not self.user.is_authenticated:
+            await self.close()
+            return
+
         self.room_name = self.scope['url_route']['kwargs']['room_name']
         self.room_group_name = f"chat_{self.room_name}"
 
@@ -24,6 +26,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
         }))
 
     async def disconnect(self, close_code):
+        if not hasattr(self, 'room_group_name'):
+            return
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
@@ -32,7 +36,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data):
         text_data_json = json.loads(text_data)
         message = text_data_json.get('message')
-        sender_id = text_data_json.get('sender_id')
+        sender_id = self.user.id
 
         saved_message = await self.save_message(sender_id, message)
 
@@ -52,13 +56,12 @@ class ChatConsumer(AsyncWebsocketConsumer):
     @database_sync_to_async
     def save_message(self, sender_id, content):
         try:
-            sender = User.objects.get(id=sender_id)
             room = ChatRoom.objects.get(name=self.room_name)
-            msg = Message.objects.create(room=room, sender=sender, content=content)
+            msg = Message.objects.create(room=room, sender_id=sender_id, content=content)
             return {
                 'id': str(msg.id),
                 'room': str(room.id),
-                'sender': sender.username,
+                'sender': sender_id,
                 'content': msg.content,
                 'timestamp': msg.timestamp.isoformat()
             }
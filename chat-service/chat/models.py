@@ -1,19 +1,33 @@
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.core.exceptions import ValidationError
+from casebridge_common.directory import AbstractDirectoryUser
 import uuid
 import mimetypes
 
 
-class User(AbstractUser):
-    role = models.CharField(max_length=20)  
+class User(AbstractBaseUser, PermissionsMixin):
+    """user-service's users table, as declared there; look users up in DirectoryUser."""
+    email = models.EmailField(unique=True)
+    role = models.CharField(max_length=20)
+    is_active = models.BooleanField(default=True)
+    is_staff = models.BooleanField(default=False)
     mfa_enabled = models.BooleanField(default=False)
 
+    USERNAME_FIELD = 'email'
+
     class Meta:
         db_table = 'users'
-        managed = False  
+        managed = False
+
+
+class DirectoryUser(AbstractDirectoryUser):
+    """Local replica of the user directory, fed by `manage.py consume_user_directory`."""
+
+    class Meta:
+        db_table = 'chat_directory_user'
 
 
 
@@ -56,7 +70,7 @@ class Participant(models.Model):
         ordering = ['joined_at']
 
     def __str__(self):
-        return f"{self.user.username} in {self.room.name}"
+        return f"{self.user.email} in {self.room.name}"
 
 
 
@@ -108,6 +122,6 @@ class Message(models.Model):
             raise ValidationError("Message cannot be empty unless a file is attached.")
 
     def __str__(self):
-        sender_name = self.sender.username if self.sender else "Deleted User"
+        sender_name = self.sender.email if self.sender else "Deleted User"
         preview = self.content[:20] + ("..." if len(self.content) > 20 else "")
         return f"{sender_name} @ {self.timestamp}: {preview}"
@@ -1,16 +1,32 @@
 from rest_framework import serializers
-from .models import ChatRoom, Participant, Message, User
+from .models import ChatRoom, Participant, Message, DirectoryUser
 
 
-class UserSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = User
-        fields = ['id', 'username', 'email', 'role']
+def directory_context(user_ids, **context):
+    """Serializer context holding the directory records of every user on the page, fetched in one query."""
+    return dict(context, directory=DirectoryUser.objects.records(set(user_ids)))
+
+
+class DirectoryUserField(serializers.Field):
+    """
+    Renders a user id as its {id, email, role, display_name} directory record,
+    or None for unknown and deleted users. Reads context["directory"] (see
+    directory_context) and only queries when it is missing.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
 
+    def to_representation(self, user_id):
+        directory = self.context.get("directory")
+        if directory is None:
+            directory = DirectoryUser.objects.records([user_id])
+        return directory.get(user_id)
 
 
 class ParticipantSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = DirectoryUserField(source="user_id")
 
     class Meta:
         model = Participant
@@ -31,7 +47,7 @@ class ChatRoomSerializer(serializers.ModelSerializer):
 
 
 class MessageSerializer(serializers.ModelSerializer):
-    sender = UserSerializer(read_only=True)
+    sender = DirectoryUserField(source="sender_id")
     reply_to = serializers.PrimaryKeyRelatedField(queryset=Message.objects.all(), required=False, allow_null=True)
 
     class Meta:
@@ -53,5 +69,5 @@ class MessageSerializer(serializers.ModelSerializer):
         """
         request = self.context.get('request')
         if request and hasattr(request, 'user'):
-            validated_data['sender'] = request.user
+            validated_data['sender_id'] = request.user.id
         return super().create(validated_data)
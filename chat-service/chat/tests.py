@@ -1,3 +1,72 @@
+from unittest.mock import patch
+
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from casebridge_auth.claims import clear_claims_cache
+from casebridge_auth.revocation import revocations
+from casebridge_common.directory import apply_events
+
+from chat.models import ChatRoom, Message
+from chat.serializers import MessageSerializer, directory_context
+
+
+def make_token(user_id=7, role="client"):
+    token = AccessToken()
+    token["user_id"] = user_id
+    token["role"] = role
+    return token
+
+
+class ChatAuthenticationTests(TestCase):
+    """Chat endpoints authenticate through casebridge_auth, from token claims only."""
+
+    def setUp(self):
+        clear_claims_cache()
+        revocations.clear()
+        # No broker in tests; revocation messages are applied by hand.
+        feed = patch.object(revocations, "enabled", False)
+        feed.start()
+        self.addCleanup(feed.stop)
+        self.client = APIClient()
+
+    def test_bearer_token_authenticates_without_user_lookup(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {make_token(user_id=5)}")
+        # Only the participant filter runs; the unmanaged users table is never read.
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("chatroom-list-create"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_missing_and_revoked_tokens_are_refused(self):
+        self.assertEqual(self.client.get(reverse("chatroom-list-create")).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        token = make_token()
+        revocations.apply({"type": "delta", "revoked": [[token["jti"], token["exp"]]]})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(self.client.get(reverse("chatroom-list-create")).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class DirectoryRenderingTests(TestCase):
+    """Users in chat payloads come from the local directory replica, one query per page."""
+
+    def setUp(self):
+        apply_events([
+            {"id": 5, "version": 3, "email": "ada@example.com", "role": "advocate", "display_name": "Ada", "is_active": True},
+            {"id": 6, "version": 4, "email": "gone@example.com", "role": "client", "display_name": "", "is_active": False, "deleted": True},
+        ])
+
+    def test_messages_render_senders_from_one_directory_query(self):
+        room = ChatRoom(name="case-1")
+        messages = [Message(room=room, sender_id=sender, content="hi") for sender in (5, 5, 6, 99, None)]
+
+        with self.assertNumQueries(1):
+            context = directory_context(m.sender_id for m in messages)
+        with self.assertNumQueries(0):
+            data = MessageSerializer(messages, many=True, context=context).data
 
-# Create your tests here.
+        self.assertEqual(data[0]["sender"], {"id": 5, "email": "ada@example.com", "role": "advocate", "display_name": "Ada"})
+        self.assertEqual([m["sender"] for m in data[2:]], [None, None, None])
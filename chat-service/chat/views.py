@@ -1,52 +1,54 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from chat.models import ChatRoom, Message, Participant
-from chat.serializers import ChatRoomSerializer, MessageSerializer
-from chat.permissions import IsAuthenticatedViaUserService
+from chat.serializers import ChatRoomSerializer, MessageSerializer, directory_context
 
 
 class ChatRoomListCreateView(APIView):
-    permission_classes = [IsAuthenticatedViaUserService]
+    permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user_id = request.user_data["id"]
-        chatrooms = ChatRoom.objects.filter(participants__user_id=user_id)
-        serializer = ChatRoomSerializer(chatrooms, many=True)
+        user_id = request.user.id
+        chatrooms = ChatRoom.objects.filter(participants__user_id=user_id).prefetch_related("participants")
+        context = directory_context(p.user_id for room in chatrooms for p in room.participants.all())
+        serializer = ChatRoomSerializer(chatrooms, many=True, context=context)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def post(self, request):
         serializer = ChatRoomSerializer(data=request.data)
         if serializer.is_valid():
             chatroom = serializer.save()
-            Participant.objects.create(chatroom=chatroom, user_id=request.user_data["id"], role="creator")
+            Participant.objects.create(chatroom=chatroom, user_id=request.user.id, role="creator")
             return Response(ChatRoomSerializer(chatroom).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class ChatRoomDetailView(APIView):
-    permission_classes = [IsAuthenticatedViaUserService]
+    permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
-        user_id = request.user_data["id"]
-        chatroom = get_object_or_404(ChatRoom, pk=pk, participants__user_id=user_id)
-        serializer = ChatRoomSerializer(chatroom)
+        user_id = request.user.id
+        chatroom = get_object_or_404(ChatRoom.objects.prefetch_related("participants"), pk=pk, participants__user_id=user_id)
+        context = directory_context(p.user_id for p in chatroom.participants.all())
+        serializer = ChatRoomSerializer(chatroom, context=context)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class MessageListCreateView(APIView):
-    permission_classes = [IsAuthenticatedViaUserService]
+    permission_classes = [IsAuthenticated]
 
     def get(self, request, room_id):
-        user_id = request.user_data["id"]
+        user_id = request.user.id
         chatroom = get_object_or_404(ChatRoom, id=room_id, participants__user_id=user_id)
         messages = Message.objects.filter(room=chatroom).order_by("timestamp")
-        serializer = MessageSerializer(messages, many=True)
+        serializer = MessageSerializer(messages, many=True, context=directory_context(m.sender_id for m in messages))
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def post(self, request, room_id):
-        user_id = request.user_data["id"]
+        user_id = request.user.id
         chatroom = get_object_or_404(ChatRoom, id=room_id, participants__user_id=user_id)
         serializer = MessageSerializer(data=request.data, context={"request": request})
         if serializer.is_valid():
@@ -56,10 +58,10 @@ class MessageListCreateView(APIView):
 
 
 class MessageDetailView(APIView):
-    permission_classes = [IsAuthenticatedViaUserService]
+    permission_classes = [IsAuthenticated]
 
     def patch(self, request, pk):
-        user_id = request.user_data["id"]
+        user_id = request.user.id
         message = get_object_or_404(Message, pk=pk, sender_id=user_id)
         serializer = MessageSerializer(message, data=request.data, partial=True, context={"request": request})
         if serializer.is_valid():
@@ -68,7 +70,7 @@ class MessageDetailView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
-        user_id = request.user_data["id"]
+        user_id = request.user.id
         message = get_object_or_404(Message, pk=pk, sender_id=user_id)
         message.deleted = True
         message.save(update_fields=["deleted"])
@@ -76,10 +78,10 @@ class MessageDetailView(APIView):
 
 
 class MarkMessageReadView(APIView):
-    permission_classes = [IsAuthenticatedViaUserService]
+    permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
-        user_id = request.user_data["id"]
+        user_id = request.user.id
         message = get_object_or_404(Message, pk=pk)
         message.read_by.add(user_id)
         return Response({"detail": "Message marked as read."}, status=status.HTTP_200_OK)
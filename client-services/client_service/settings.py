@@ -147,7 +147,7 @@ CELERY_TASK_TIME_LIMIT = 30 * 60
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'client_service.authentication.RemoteJWTAuthentication',
+        'casebridge_auth.authentication.TokenPrincipalAuthentication',
     )
 }
 
@@ -160,3 +160,27 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
 }
 
+# Decoded JWT claims cache (casebridge_auth.claims)
+TOKEN_CLAIMS_CACHE_SIZE = config('TOKEN_CLAIMS_CACHE_SIZE', default=10000, cast=int)
+TOKEN_CLAIMS_CACHE_TTL = config('TOKEN_CLAIMS_CACHE_TTL', default=300, cast=int)
+
+# Token revocations fanned out by user-service (casebridge_auth.revocation)
+TOKEN_REVOCATION_CELERY_APP = 'client_service.celery.app'
+TOKEN_REVOCATION_SUBSCRIBE = config('TOKEN_REVOCATION_SUBSCRIBE', default=True, cast=bool)
+TOKEN_REVOCATION_RPC_TIMEOUT = config('TOKEN_REVOCATION_RPC_TIMEOUT', default=10, cast=int)
+
+# Calls to Celery tasks (casebridge_common.rpc): one deadline per request, a circuit breaker per task,
+# and short-lived caching for the advocate lookups every search page repeats
+RPC_CELERY_APP = 'client_service.celery.app'
+RPC_TIMEOUT = config('RPC_TIMEOUT', default=20, cast=float)
+RPC_CACHE_TTLS = {
+    'client_service.tasks.get_advocates': config('RPC_ADVOCATE_SEARCH_CACHE_TTL', default=30, cast=int),
+    'client_service.tasks.get_advocate_detail': config('RPC_ADVOCATE_DETAIL_CACHE_TTL', default=60, cast=int),
+}
+RPC_BREAKER_FAILURE_RATE = config('RPC_BREAKER_FAILURE_RATE', default=0.5, cast=float)
+RPC_BREAKER_COOLDOWN = config('RPC_BREAKER_COOLDOWN', default=30, cast=int)
+
+# Advocate ratings (clients.reviews): the review mean is weighted as if every advocate also had
+# REVIEW_PRIOR_WEIGHT reviews of REVIEW_PRIOR_MEAN stars
+REVIEW_PRIOR_MEAN = config('REVIEW_PRIOR_MEAN', default=3.5, cast=float)
+REVIEW_PRIOR_WEIGHT = config('REVIEW_PRIOR_WEIGHT', default=5, cast=int)
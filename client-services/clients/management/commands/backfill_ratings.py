@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from clients.reviews import backfill_ratings
+
+
+class Command(BaseCommand):
+    help = "Recomputes advocates' review sums, counts and Bayesian ratings from the review table, in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500, help="Advocate profiles per transaction.")
+
+    def handle(self, *args, **options):
+        chunks = changed = 0
+        for chunk_changed in backfill_ratings(chunk_size=options["chunk_size"]):
+            chunks += 1
+            changed += chunk_changed
+        self.stdout.write(f"Updated {changed} advocate rating(s) in {chunks} chunk(s)")
@@ -51,8 +51,11 @@ class AdvocateProfile(models.Model):
 
     # Profile info
     profile_image = models.CharField(max_length=500, blank=True, null=True)
+    profile_thumbnail = models.CharField(max_length=500, blank=True, null=True)
     is_verified = models.BooleanField(default=False)
     rating = models.FloatField(default=0.0)
+    rating_sum = models.BigIntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
     cases_count = models.IntegerField(default=0)
     wins_count = models.IntegerField(default=0)
 
@@ -96,3 +99,36 @@ class Case(models.Model):
 
     def __str__(self):
         return f"{self.title} ({self.status})"
+
+
+class Review(models.Model):
+    """
+    A client's 1-5 star review of the advocate of one completed booking or
+    one closed case; exactly one of `booking_id` and `case_id` is set, and
+    each booking or case is reviewed at most once. clients.reviews keeps the
+    advocate's rating in step with these rows.
+    """
+    id = models.BigAutoField(primary_key=True)
+    client_id = models.IntegerField(db_index=True)
+    advocate_id = models.IntegerField(db_index=True)
+    booking_id = models.IntegerField(null=True, blank=True, unique=True)
+    case_id = models.IntegerField(null=True, blank=True, unique=True)
+    rating = models.PositiveSmallIntegerField()
+    comment = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "advocate_review"
+        ordering = ["-created_at"]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(rating__gte=1, rating__lte=5), name="advocate_review_rating_range"),
+            models.CheckConstraint(
+                condition=models.Q(booking_id__isnull=False, case_id__isnull=True)
+                | models.Q(booking_id__isnull=True, case_id__isnull=False),
+                name="advocate_review_one_subject",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.rating}* for advocate {self.advocate_id} by client {self.client_id}"
@@ -0,0 +1,125 @@
+# clients/reviews.py
+import math
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case as SqlCase, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+
+from bookings.models import Booking
+from .models import AdvocateProfile, Case, Review
+
+
+class ReviewError(Exception):
+    """A review that cannot be accepted; `code` is returned to the caller."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+
+def bayesian_rating(rating_sum, rating_count):
+    """
+    An advocate's rating: the mean of their reviews pulled toward
+    REVIEW_PRIOR_MEAN as if they also had REVIEW_PRIOR_WEIGHT reviews of
+    that score, so one 5-star review does not outrank a long record.
+    Advocates without reviews are rated 0.
+    """
+    if rating_count <= 0:
+        return 0.0
+    prior_mean, prior_weight = settings.REVIEW_PRIOR_MEAN, settings.REVIEW_PRIOR_WEIGHT
+    return (prior_mean * prior_weight + rating_sum) / (prior_weight + rating_count)
+
+
+def adjust_rating(advocate_id, sum_delta, count_delta):
+    """
+    Adds to an advocate's running review sum and count and recomputes
+    `rating` from them, all in one UPDATE of their profile row: O(1)
+    however many reviews they have. Returns the number of rows updated.
+    """
+    prior_mean, prior_weight = settings.REVIEW_PRIOR_MEAN, settings.REVIEW_PRIOR_WEIGHT
+    new_sum = F("rating_sum") + sum_delta
+    new_count = F("rating_count") + count_delta
+    return AdvocateProfile.objects.filter(user_id=advocate_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        # SET expressions read the row as it was, so compare the old count
+        rating=SqlCase(
+            When(rating_count__lte=-count_delta, then=Value(0.0)),
+            default=(Value(prior_mean * prior_weight) + Cast(new_sum, FloatField())) / (Value(float(prior_weight)) + new_count),
+            output_field=FloatField(),
+        ),
+    )
+
+
+def reviewed_advocate(client_id, booking_id=None, case_id=None):
+    """The advocate a client may review for a completed booking or a closed case of theirs, else None."""
+    if booking_id is not None:
+        subjects = Booking.objects.filter(id=booking_id, client_id=client_id, status="Completed")
+    else:
+        subjects = Case.objects.filter(id=case_id, client_id=client_id, status="Closed")
+    return subjects.values_list("advocate_id", flat=True).first()
+
+
+def submit_review(client_id, rating, comment="", booking_id=None, case_id=None):
+    """Stores a review and folds it into the advocate's rating in the same transaction."""
+    if (booking_id is None) == (case_id is None):
+        raise ReviewError("booking_or_case_required")
+    try:
+        rating = int(rating)
+    except (TypeError, ValueError):
+        raise ReviewError("invalid_rating")
+    if not 1 <= rating <= 5:
+        raise ReviewError("invalid_rating")
+    advocate_id = reviewed_advocate(client_id, booking_id=booking_id, case_id=case_id)
+    if advocate_id is None:
+        raise ReviewError("not_reviewable")
+    try:
+        with transaction.atomic():
+            review = Review.objects.create(
+                client_id=client_id, advocate_id=advocate_id, booking_id=booking_id, case_id=case_id,
+                rating=rating, comment=comment or "",
+            )
+            if not adjust_rating(advocate_id, review.rating, 1):
+                # No profile to fold it into: roll the review back rather than store one the rating misses
+                raise ReviewError("advocate_not_found")
+    except IntegrityError:
+        raise ReviewError("already_reviewed")
+    return review
+
+
+def backfill_ratings(chunk_size=500):
+    """
+    Recomputes every advocate's review sum, count and rating from the
+    review table, `chunk_size` profiles per transaction, and yields the
+    number of profiles changed per chunk.
+
+    Each chunk locks its profile rows before reading their reviews, so a
+    review submitted meanwhile either is counted here or applies its own
+    increment after this chunk commits, never both and never neither.
+    """
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            profiles = list(
+                AdvocateProfile.objects.select_for_update().filter(id__gt=last_id).order_by("id")
+                .only("id", "user_id", "rating", "rating_sum", "rating_count")[:chunk_size]
+            )
+            if not profiles:
+                return
+            totals = {
+                row["advocate_id"]: (row["total"], row["reviews"])
+                for row in Review.objects.filter(advocate_id__in=[p.user_id for p in profiles])
+                .order_by().values("advocate_id").annotate(total=Sum("rating"), reviews=Count("id"))
+            }
+            changed = []
+            for profile in profiles:
+                rating_sum, rating_count = totals.get(profile.user_id, (0, 0))
+                rating = bayesian_rating(rating_sum, rating_count)
+                stale = (profile.rating_sum, profile.rating_count) != (rating_sum, rating_count)
+                if stale or not math.isclose(profile.rating, rating):
+                    profile.rating_sum, profile.rating_count, profile.rating = rating_sum, rating_count, rating
+                    changed.append(profile)
+            AdvocateProfile.objects.bulk_update(changed, ["rating_sum", "rating_count", "rating"])
+        last_id = profiles[-1].id
+        yield len(changed)
@@ -8,6 +8,7 @@ class SpecializationSerializer(serializers.ModelSerializer):
 
 class AdvocateProfileSerializer(serializers.ModelSerializer):
     specializations = SpecializationSerializer(many=True, read_only=True)
+    profile_image = serializers.SerializerMethodField()
 
     class Meta:
         model = AdvocateProfile
@@ -19,6 +20,10 @@ class AdvocateProfileSerializer(serializers.ModelSerializer):
             "created_at", "updated_at"
         ]
 
+    def get_profile_image(self, obj):
+        # Thumbnails are generated asynchronously; fall back to the upload until one exists.
+        return obj.profile_thumbnail or obj.profile_image
+
 
 class CaseSerializer(serializers.ModelSerializer):
     class Meta:
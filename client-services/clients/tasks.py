@@ -1,10 +1,16 @@
 from celery import shared_task
 from clients.models import AdvocateProfile, Case
+from clients.reviews import ReviewError, submit_review
 from django.db.models import Prefetch
 
+# ?ordering= values accepted by the advocate search; "-" sorts descending
+ADVOCATE_ORDERINGS = {"rating", "cases_count", "wins_count", "experience_years"}
+
+
 @shared_task(name="client_service.tasks.get_advocates")
-def get_advocates(name=None, city=None, specialization_id=None):
+def get_advocates(name=None, city=None, specialization_id=None, ordering=None):
 
+    # profile_image points at the thumbnail; the full-size upload is only used until it exists.
     qs = AdvocateProfile.objects.prefetch_related("specializations").all()
 
     if name:
@@ -13,6 +19,8 @@ def get_advocates(name=None, city=None, specialization_id=None):
         qs = qs.filter(city__iexact=city)
     if specialization_id:
         qs = qs.filter(specializations__id=specialization_id)
+    if ordering and ordering.lstrip("-") in ADVOCATE_ORDERINGS:
+        qs = qs.order_by(ordering, "id")
 
     result = []
     for a in qs:
@@ -30,9 +38,10 @@ def get_advocates(name=None, city=None, specialization_id=None):
             "city": a.city,
             "state": a.state,
             "pincode": a.pincode,
-            "profile_image": a.profile_image,
+            "profile_image": a.profile_thumbnail or a.profile_image,
             "is_verified": a.is_verified,
             "rating": a.rating,
+            "reviews_count": a.rating_count,
             "cases_count": a.cases_count,
             "wins_count": a.wins_count,
             "created_at": a.created_at.isoformat(),
@@ -59,9 +68,10 @@ def get_advocate_detail(advocate_id):
             "city": a.city,
             "state": a.state,
             "pincode": a.pincode,
-            "profile_image": a.profile_image,
+            "profile_image": a.profile_thumbnail or a.profile_image,
             "is_verified": a.is_verified,
             "rating": a.rating,
+            "reviews_count": a.rating_count,
             "cases_count": a.cases_count,
             "wins_count": a.wins_count,
         }
@@ -110,3 +120,20 @@ def get_case_detail(case_id, client_id):
         }
     except Case.DoesNotExist:
         return None
+
+
+@shared_task(name="client_service.tasks.submit_review")
+def submit_review_task(client_id, rating, comment="", booking_id=None, case_id=None):
+    try:
+        review = submit_review(client_id, rating, comment, booking_id=booking_id, case_id=case_id)
+    except ReviewError as e:
+        return {"error": e.code}
+    return {
+        "id": review.id,
+        "advocate_id": review.advocate_id,
+        "booking_id": review.booking_id,
+        "case_id": review.case_id,
+        "rating": review.rating,
+        "comment": review.comment,
+        "created_at": review.created_at.isoformat(),
+    }
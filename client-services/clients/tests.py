@@ -1,3 +1,151 @@
-from django.test import TestCase
+import datetime
+import os
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from casebridge_auth.principal import TokenPrincipal
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from bookings.models import Booking
+from .models import AdvocateProfile, Case, Review, User
+from .reviews import ReviewError, adjust_rating, backfill_ratings, bayesian_rating, submit_review
+
+# Tables owned by user-service, advocate-service and case-service
+SHARED_MODELS = (User, AdvocateProfile, Case, Booking)
+
+
+@override_settings(REVIEW_PRIOR_MEAN=3.5, REVIEW_PRIOR_WEIGHT=5)
+class ReviewTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            for model in SHARED_MODELS:
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in reversed(SHARED_MODELS):
+                editor.delete_model(model)
+
+    def setUp(self):
+        self.client_user = User.objects.create(email="client@gmail.com", role="client")
+        self.advocate = User.objects.create(email="advocate@gmail.com", role="advocate")
+        self.profile = AdvocateProfile.objects.create(user=self.advocate, full_name="Advocate", bar_council_id="BC-1")
+        self.booking = self.add_booking("Completed")
+        self.case = Case.objects.create(
+            title="Case", description="", case_number="C-1", client_id=self.client_user.id,
+            advocate_id=self.advocate.id, status="Closed",
+        )
+
+    def add_booking(self, status, advocate_id=None):
+        return Booking.objects.create(
+            client_id=self.client_user.id, advocate_id=advocate_id or self.advocate.id,
+            appointment_datetime=timezone.now() - datetime.timedelta(days=1), status=status,
+        )
+
+    def assertReviewRejected(self, code, **kwargs):
+        kwargs.setdefault("rating", 5)
+        with self.assertRaises(ReviewError) as raised:
+            submit_review(self.client_user.id, **kwargs)
+        self.assertEqual(raised.exception.code, code)
+
+
+class SubmitReviewTests(ReviewTestCase):
+
+    def test_review_is_folded_into_the_rating(self):
+        submit_review(self.client_user.id, 5, booking_id=self.booking.id)
+        submit_review(self.client_user.id, "2", case_id=self.case.id)
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.rating_sum, self.profile.rating_count), (7, 2))
+        self.assertAlmostEqual(self.profile.rating, bayesian_rating(7, 2))
+
+    def test_rating_must_be_between_one_and_five(self):
+        for rating in (0, 6, "five", None):
+            self.assertReviewRejected("invalid_rating", rating=rating, booking_id=self.booking.id)
+        self.assertFalse(Review.objects.exists())
+
+    def test_exactly_one_subject_is_reviewed(self):
+        self.assertReviewRejected("booking_or_case_required")
+        self.assertReviewRejected("booking_or_case_required", booking_id=self.booking.id, case_id=self.case.id)
+
+    def test_only_the_clients_completed_bookings_and_closed_cases_are_reviewable(self):
+        pending = self.add_booking("Pending")
+        self.assertReviewRejected("not_reviewable", booking_id=pending.id)
+        self.assertReviewRejected("not_reviewable", booking_id=self.booking.id + 100)
+        Case.objects.filter(id=self.case.id).update(status="Active")
+        self.assertReviewRejected("not_reviewable", case_id=self.case.id)
+        with self.assertRaises(ReviewError):
+            submit_review(self.client_user.id + 1, 5, booking_id=self.booking.id)
+
+    def test_each_booking_is_reviewed_once(self):
+        submit_review(self.client_user.id, 4, booking_id=self.booking.id)
+        self.assertReviewRejected("already_reviewed", booking_id=self.booking.id)
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.rating_sum, self.profile.rating_count), (4, 1))
+
+    def test_review_without_an_advocate_profile_is_rolled_back(self):
+        orphan = self.add_booking("Completed", advocate_id=self.advocate.id + 100)
+        self.assertReviewRejected("advocate_not_found", booking_id=orphan.id)
+        self.assertFalse(Review.objects.exists())
+
+
+class RatingTests(ReviewTestCase):
+
+    def test_sql_rating_matches_bayesian_rating(self):
+        rating_sum = rating_count = 0
+        for stars in (5, 1, 4, 4, 2, 5, 3):
+            rating_sum, rating_count = rating_sum + stars, rating_count + 1
+            self.assertEqual(adjust_rating(self.advocate.id, stars, 1), 1)
+            self.profile.refresh_from_db()
+            self.assertAlmostEqual(self.profile.rating, bayesian_rating(rating_sum, rating_count))
+
+    def test_removing_the_last_review_resets_the_rating(self):
+        adjust_rating(self.advocate.id, 4, 1)
+        adjust_rating(self.advocate.id, -4, -1)
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.rating_sum, self.profile.rating_count, self.profile.rating), (0, 0, 0.0))
+
+    def test_unreviewed_advocates_are_rated_zero(self):
+        self.assertEqual(bayesian_rating(0, 0), 0.0)
+        self.assertAlmostEqual(bayesian_rating(5, 1), (3.5 * 5 + 5) / 6)
+
+    def test_backfill_corrects_drifted_aggregates(self):
+        other = User.objects.create(email="other@gmail.com", role="advocate")
+        other_profile = AdvocateProfile.objects.create(user=other, full_name="Other", bar_council_id="BC-2")
+        submit_review(self.client_user.id, 5, booking_id=self.booking.id)
+        submit_review(self.client_user.id, 3, case_id=self.case.id)
+        AdvocateProfile.objects.filter(id=self.profile.id).update(rating_sum=1, rating_count=9, rating=1.0)
+        AdvocateProfile.objects.filter(id=other_profile.id).update(rating_sum=4, rating_count=1, rating=4.0)
+
+        self.assertEqual(sum(backfill_ratings(chunk_size=1)), 2)
+        self.profile.refresh_from_db()
+        other_profile.refresh_from_db()
+        self.assertEqual((self.profile.rating_sum, self.profile.rating_count), (8, 2))
+        self.assertAlmostEqual(self.profile.rating, bayesian_rating(8, 2))
+        self.assertEqual((other_profile.rating_sum, other_profile.rating_count, other_profile.rating), (0, 0, 0.0))
+        self.assertEqual(sum(backfill_ratings()), 0)
+
+
+class RpcStatsViewTests(SimpleTestCase):
+
+    def get(self, role):
+        client = APIClient()
+        client.force_authenticate(user=TokenPrincipal(id=1, role=role))
+        return client.get(reverse("rpc-stats"))
+
+    def test_admins_get_this_process_stats(self):
+        stats = {"client_service.tasks.get_advocates": {"calls": 3, "circuit": "closed"}}
+        with mock.patch("clients.views.rpc_client.stats", return_value=stats):
+            response = self.get("admin")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"pid": os.getpid(), "tasks": stats})
+
+    def test_other_roles_are_refused(self):
+        self.assertEqual(self.get("client").status_code, 403)
@@ -1,10 +1,12 @@
 from django.urls import path
-from .views import AdvocateDetailView, AdvocateSearchView, CaseListView, CaseDetailView
+from .views import AdvocateDetailView, AdvocateSearchView, CaseListView, CaseDetailView, ReviewCreateView, RpcStatsView
 
 urlpatterns = [
     path('advocates/search/', AdvocateSearchView.as_view(), name='advocate-search'),
     path('advocates/<int:advocate_id>/', AdvocateDetailView.as_view(), name='advocate-detail'),
     path('cases/', CaseListView.as_view(), name='case-list'),
     path('cases/<int:case_id>/', CaseDetailView.as_view(), name='case-detail'),
+    path('reviews/', ReviewCreateView.as_view(), name='review-create'),
+    path('rpc-stats/', RpcStatsView.as_view(), name='rpc-stats'),
 ]
 
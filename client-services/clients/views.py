@@ -1,22 +1,24 @@
+import os
+
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from client_service.celery import app
+from casebridge_auth.permissions import IsAdminRole, IsClient
+from casebridge_common.rpc import rpc_client
 
 class AdvocateSearchView(APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request):
-        task = app.send_task(
+        result = rpc_client.call(
             "client_service.tasks.get_advocates",
             kwargs={
                 "name": request.GET.get("name"),
                 "city": request.GET.get("city"),
                 "specialization_id": request.GET.get("specialization_id"),
-            }
+                "ordering": request.GET.get("ordering"),
+            },
         )
-
-        result = task.get(timeout=20)
         return Response({"advocates": result}, status=status.HTTP_200_OK)
 
 
@@ -25,12 +27,10 @@ class AdvocateDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, advocate_id):
-        task = app.send_task(
+        result = rpc_client.call(
             "client_service.tasks.get_advocate_detail",
-            kwargs={"advocate_id": advocate_id}
+            kwargs={"advocate_id": advocate_id},
         )
-
-        result = task.get(timeout=20)
         if not result:
             return Response({"error": "Advocate not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -44,12 +44,10 @@ class CaseListView(APIView):
     def get(self, request):
         client_id = request.GET.get("client_id")
 
-        task = app.send_task(
+        cases = rpc_client.call(
             "client_service.tasks.get_cases_by_client",
-            kwargs={"client_id": int(client_id)}
+            kwargs={"client_id": int(client_id)},
         )
-
-        cases = task.get(timeout=20)
         return Response({"cases": cases}, status=status.HTTP_200_OK)
 
 
@@ -59,13 +57,47 @@ class CaseDetailView(APIView):
     def get(self, request, case_id):
         client_id = request.GET.get("client_id")
 
-        task = app.send_task(
+        case = rpc_client.call(
             "client_service.tasks.get_case_detail",
-            kwargs={"case_id": int(case_id), "client_id": int(client_id)}
+            kwargs={"case_id": int(case_id), "client_id": int(client_id)},
         )
-
-        case = task.get(timeout=20)
         if not case:
             return Response({"error": "Case not found"}, status=status.HTTP_404_NOT_FOUND)
 
         return Response({"case": case}, status=status.HTTP_200_OK)
+
+
+
+class ReviewCreateView(APIView):
+    permission_classes = [IsAuthenticated, IsClient]
+
+    def post(self, request):
+        data = request.data
+        result = rpc_client.call(
+            "client_service.tasks.submit_review",
+            kwargs={
+                "client_id": request.user.id,
+                "rating": data.get("rating"),
+                "comment": data.get("comment", ""),
+                "booking_id": data.get("booking_id"),
+                "case_id": data.get("case_id"),
+            },
+        )
+        if "error" in result:
+            return Response({"error": result["error"]}, status=status.HTTP_400_BAD_REQUEST)
+
+        # The advocate's new rating should show on this worker's next detail lookup
+        rpc_client.invalidate("client_service.tasks.get_advocate_detail")
+        return Response({"review": result}, status=status.HTTP_201_CREATED)
+
+
+class RpcStatsView(APIView):
+    """
+    Outcomes, latency percentiles and circuit state of this process's task
+    calls. They live in the web process that makes the calls, so each
+    answer covers the process identified by `pid`.
+    """
+    permission_classes = [IsAuthenticated, IsAdminRole]
+
+    def get(self, request):
+        return Response({"pid": os.getpid(), "tasks": rpc_client.stats()}, status=status.HTTP_200_OK)
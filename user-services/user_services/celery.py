@@ -10,3 +10,26 @@ app.conf.result_backend = "rpc://"
 
 app.autodiscover_tasks()
 
+app.conf.beat_schedule = {
+    "purge-expired-otps": {
+        "task": "users.tasks.purge_expired_otps_task",
+        "schedule": 600.0,
+    },
+    "publish-revocation-snapshot": {
+        "task": "users.tasks.publish_revocation_snapshot_task",
+        "schedule": 300.0,
+    },
+    "relay-user-outbox": {
+        "task": "users.tasks.relay_user_outbox_task",
+        "schedule": 2.0,
+    },
+    "purge-user-outbox": {
+        "task": "users.tasks.purge_user_outbox_task",
+        "schedule": 3600.0,
+    },
+    "maintain-audit-partitions": {
+        "task": "users.tasks.maintain_audit_partitions_task",
+        "schedule": 86400.0,
+    },
+}
+
@@ -1,13 +1,17 @@
 # users/admin.py
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, ClientProfile, AdvocateProfile, Specialization, OTP
+from casebridge_common.changelist import EstimatedCountAdminMixin
+
+from .models import User, ClientProfile, AdvocateProfile, Specialization, OTP, RevokedToken, OutboxEvent, AuthAuditEvent
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(EstimatedCountAdminMixin, BaseUserAdmin):
     ordering = ("email",)
     list_display = ("email", "role", "is_staff", "is_active")
+    list_filter = ("role", "is_staff", "is_active")
     search_fields = ("email",)
+    trigram_search_fields = ("email",)
     fieldsets = (
         (None, {"fields": ("email", "password")}),
         ("Permissions", {"fields": ("is_active", "is_staff", "is_superuser", "groups", "user_permissions")}),
@@ -18,7 +22,40 @@ class UserAdmin(BaseUserAdmin):
         (None, {"classes": ("wide",), "fields": ("email", "password1", "password2")}),
     )
 
-admin.site.register(ClientProfile)
-admin.site.register(AdvocateProfile)
+
+# Profiles are listed by user id: their __str__ falls back to user.email, one query per row.
+@admin.register(ClientProfile)
+class ClientProfileAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    list_display = ("id", "full_name", "user_id", "phone", "city")
+    search_fields = ("full_name", "=phone")
+    trigram_search_fields = ("full_name",)
+    raw_id_fields = ("user",)
+
+
+@admin.register(AdvocateProfile)
+class AdvocateProfileAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    list_display = ("full_name", "user_id", "bar_council_id", "is_verified", "rating")
+    list_filter = ("is_verified",)
+    search_fields = ("full_name", "=bar_council_id")
+    trigram_search_fields = ("full_name",)
+    raw_id_fields = ("user",)
+    filter_horizontal = ("specializations",)
+
+
 admin.site.register(Specialization)
 admin.site.register(OTP)
+admin.site.register(RevokedToken)
+admin.site.register(OutboxEvent)
+
+
+@admin.register(AuthAuditEvent)
+class AuthAuditEventAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
+    list_display = ("created_at", "event", "email", "user_id", "ip_address")
+    list_filter = ("event",)
+    search_fields = ("^email",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from . import outbox  # noqa: F401  (connects the directory outbox signals)
+        post_migrate.connect(_create_audit_partitions, sender=self)
+        post_migrate.connect(_create_search_indexes, sender=self)
+
+
+def _create_audit_partitions(sender, using, **kwargs):
+    from .audit import ensure_audit_partitions
+
+    ensure_audit_partitions(using=using)
+
+
+def _create_search_indexes(sender, using, **kwargs):
+    from casebridge_common.changelist import ensure_admin_search_indexes
+
+    ensure_admin_search_indexes(using=using)
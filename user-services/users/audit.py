@@ -0,0 +1,268 @@
+# users/audit.py
+import atexit
+import datetime
+import logging
+import re
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connection, connections
+from django.utils import timezone
+
+from .models import AuthAuditEvent
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "oldest"
+DROP_NEWEST = "newest"
+
+# Totals over every process that records audit events, kept in the shared cache (see AuditLog.publish_stats)
+STATS_COUNTERS = ("recorded", "written", "batches", "dropped_overflow", "dropped_write_errors")
+STATS_KEY = "auth_audit_stats:{}"
+
+
+class AuditLog:
+    """
+    Buffers authentication audit events in memory and writes them in
+    batches, so the login path never waits on an INSERT.
+
+    `record` appends to a bounded ring buffer of `capacity` events. A
+    background thread writes the buffer with one bulk_create per
+    `batch_size` events, every `window` seconds or as soon as a full batch is
+    waiting. When the buffer is full the `drop_policy` decides which event
+    is lost: the oldest buffered one (the default) or the new one. Every
+    lost event, including batches the database refused, is counted in
+    `stats()`.
+
+    `stats()` only covers this process. The flush thread also adds the
+    counters to totals in the shared cache at most every `stats_interval`
+    seconds, and once more on close, which is what `shared_audit_stats()`
+    reports.
+    """
+
+    def __init__(self, capacity=10000, batch_size=200, window=1.0, drop_policy=DROP_OLDEST, stats_interval=10.0):
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown audit drop policy {drop_policy!r}")
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.window = window
+        self.drop_policy = drop_policy
+        self.stats_interval = stats_interval
+
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+        self._stats = dict.fromkeys(STATS_COUNTERS, 0)
+        self._published = dict.fromkeys(STATS_COUNTERS, 0)
+        self._next_publish = 0.0
+
+    # ---------------- Producer side ----------------
+    def record(self, event, user=None, email="", request=None):
+        """Queues one event; `user` may be a User or a user id, `request` supplies the client address."""
+        meta = request.META if request is not None else {}
+        entry = AuthAuditEvent(
+            event=event,
+            user_id=getattr(user, "pk", user),
+            email=(email or getattr(user, "email", "") or "")[:254],
+            ip_address=meta.get("REMOTE_ADDR") or None,
+            user_agent=meta.get("HTTP_USER_AGENT", "")[:255],
+            created_at=timezone.now(),
+        )
+        with self._lock:
+            self._stats["recorded"] += 1
+            if len(self._buffer) >= self.capacity:
+                self._stats["dropped_overflow"] += 1
+                if self.drop_policy == DROP_NEWEST:
+                    return
+                self._buffer.popleft()
+            self._buffer.append(entry)
+            full = len(self._buffer) >= self.batch_size
+            self._ensure_started()
+        if full:
+            self._wakeup.set()
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="auth-audit-log", daemon=True)
+            self._thread.start()
+
+    # ---------------- Flushing ----------------
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.window)
+            self._wakeup.clear()
+            self.flush()
+            if time.monotonic() >= self._next_publish:
+                self.publish_stats()
+                self._next_publish = time.monotonic() + self.stats_interval
+
+    def _take_batch(self):
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def flush(self):
+        """Writes everything currently buffered; returns the number of events written."""
+        written = 0
+        with self._flush_lock:
+            batch = self._take_batch()
+            while batch:
+                written += self._write(batch)
+                batch = self._take_batch()
+        return written
+
+    def _write(self, batch):
+        try:
+            AuthAuditEvent.objects.bulk_create(batch)
+        except DatabaseError:
+            logger.exception("Dropping %s audit event(s) the database refused", len(batch))
+            # The flush thread keeps its connection; start the next batch on a fresh one.
+            if not connection.in_atomic_block:
+                connection.close()
+            with self._lock:
+                self._stats["dropped_write_errors"] += len(batch)
+            return 0
+        with self._lock:
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+        return len(batch)
+
+    def close(self):
+        """Stops the background thread and writes what is left."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.window + 5)
+        self.flush()
+        if self._thread is not None:
+            self.publish_stats()
+
+    # ---------------- Metrics ----------------
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, pending=len(self._buffer))
+        stats["dropped"] = stats["dropped_overflow"] + stats["dropped_write_errors"]
+        return stats
+
+    def publish_stats(self):
+        """Adds what this process counted since the last call to the shared totals."""
+        with self._lock:
+            current = {name: self._stats[name] for name in STATS_COUNTERS}
+        for name in STATS_COUNTERS:
+            delta = current[name] - self._published[name]
+            if not delta:
+                continue
+            key = STATS_KEY.format(name)
+            try:
+                cache.add(key, 0, timeout=None)
+                cache.incr(key, delta)
+            except Exception:
+                # Kept for the next call; a cache outage must not stop the flush thread
+                logger.warning("Could not publish audit stats", exc_info=True)
+                return
+            self._published[name] = current[name]
+
+
+def shared_audit_stats():
+    """Audit counters summed over every process, as far as their flush threads have published them."""
+    totals = cache.get_many([STATS_KEY.format(name) for name in STATS_COUNTERS])
+    stats = {name: totals.get(STATS_KEY.format(name), 0) for name in STATS_COUNTERS}
+    stats["dropped"] = stats["dropped_overflow"] + stats["dropped_write_errors"]
+    return stats
+
+
+audit_log = AuditLog(
+    capacity=settings.AUTH_AUDIT_BUFFER_SIZE,
+    batch_size=settings.AUTH_AUDIT_BATCH_SIZE,
+    window=settings.AUTH_AUDIT_FLUSH_MS / 1000,
+    drop_policy=settings.AUTH_AUDIT_DROP_POLICY,
+    stats_interval=settings.AUTH_AUDIT_STATS_INTERVAL,
+)
+atexit.register(audit_log.close)
+
+
+# ---------------- Monthly partitions ----------------
+TABLE = AuthAuditEvent._meta.db_table
+_PARTITION_NAME = re.compile(rf"^{TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def _month_start(day, offset=0):
+    month = day.year * 12 + day.month - 1 + offset
+    return datetime.datetime(month // 12, month % 12 + 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _create_parent(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE} (
+            id bigint GENERATED BY DEFAULT AS IDENTITY,
+            event varchar(32) NOT NULL,
+            user_id bigint NULL,
+            email varchar(254) NOT NULL DEFAULT '',
+            ip_address inet NULL,
+            user_agent varchar(255) NOT NULL DEFAULT '',
+            created_at timestamp with time zone NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_user_idx ON {TABLE} (user_id, created_at DESC)")
+    # Catches rows for a month nobody created a partition for; normally stays empty.
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+
+def ensure_audit_partitions(months_ahead=None, using=DEFAULT_DB_ALIAS):
+    """
+    Creates the audit table and its partitions for this month and the next
+    `months_ahead` months. Idempotent; runs after migrate and from a daily
+    beat task. On databases without declarative partitioning (SQLite in
+    development and tests) a plain table is created instead.
+    """
+    months_ahead = settings.AUTH_AUDIT_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    conn = connections[using]
+    if conn.vendor != "postgresql":
+        if TABLE not in conn.introspection.table_names():
+            with conn.schema_editor() as editor:
+                editor.create_model(AuthAuditEvent)
+        return []
+
+    created = []
+    today = timezone.now()
+    with conn.cursor() as cursor:
+        _create_parent(cursor)
+        for offset in range(months_ahead + 1):
+            start, end = _month_start(today, offset), _month_start(today, offset + 1)
+            name = f"{TABLE}_y{start:%Y}m{start:%m}"
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)", [start, end],
+            )
+            created.append(name)
+    return created
+
+
+def drop_expired_audit_partitions(retention_months=None):
+    """Drops the monthly partitions that lie wholly before the last `retention_months` months; returns their names."""
+    retention_months = settings.AUTH_AUDIT_RETENTION_MONTHS if retention_months is None else retention_months
+    if connection.vendor != "postgresql":
+        return []
+
+    cutoff = _month_start(timezone.now(), -retention_months)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s", [TABLE],
+        )
+        expired = []
+        for (name,) in cursor.fetchall():
+            match = _PARTITION_NAME.match(name)
+            if match and datetime.datetime(int(match[1]), int(match[2]), 1, tzinfo=datetime.timezone.utc) < cutoff:
+                expired.append(name)
+        for name in expired:
+            cursor.execute(f"DROP TABLE IF EXISTS {name}")
+    return expired
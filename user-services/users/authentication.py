@@ -0,0 +1,15 @@
+# users/authentication.py
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .introspection import revoked_jtis
+
+
+class RevocationAwareJWTAuthentication(JWTAuthentication):
+    """SimpleJWT authentication that also refuses tokens revoked via logout."""
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if token.get("jti") in revoked_jtis:
+            raise InvalidToken({"detail": "Token has been revoked", "code": "token_revoked"})
+        return token
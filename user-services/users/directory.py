@@ -0,0 +1,42 @@
+# users/directory.py
+from django.conf import settings
+from django.db.models import CharField, F
+from django.db.models.functions import Coalesce
+
+from .models import User
+
+
+def _clean_ids(ids):
+    cleaned = []
+    for value in ids or []:
+        try:
+            cleaned.append(int(value))
+        except (TypeError, ValueError):
+            continue
+    return list(dict.fromkeys(cleaned))
+
+
+def directory_queryset():
+    """Users with `display_name` annotated: advocate or client full name, else the email."""
+    return (
+        User.objects.annotate(display_name=Coalesce(
+            F("advocate_profile__full_name"), F("client_profile__full_name"), F("email"),
+            output_field=CharField(),
+        ))
+        .order_by()
+    )
+
+
+def get_users_directory(ids):
+    """
+    Returns id/email/role/display_name for the given user ids in a single
+    primary-key lookup. Unknown ids are simply absent from the result; more
+    than USER_DIRECTORY_MAX_IDS ids raise ValueError rather than being
+    dropped, so callers never mistake the excess for missing users.
+    """
+    ids = _clean_ids(ids)
+    if len(ids) > settings.USER_DIRECTORY_MAX_IDS:
+        raise ValueError(f"At most {settings.USER_DIRECTORY_MAX_IDS} ids per request, got {len(ids)}")
+    if not ids:
+        return []
+    return list(directory_queryset().filter(id__in=ids).values("id", "email", "role", "display_name"))
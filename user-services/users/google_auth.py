@@ -0,0 +1,153 @@
+# users/google_auth.py
+import logging
+import re
+import threading
+import time
+
+import requests
+from django.conf import settings
+from google.auth import jwt
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleCertsUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Google sign-in is temporarily unavailable, please retry shortly."
+    default_code = "google_certs_unavailable"
+
+
+class GoogleTokenVerifier:
+    """
+    Verifies Google ID tokens locally against cached signing certs.
+
+    Certs are fetched over one pooled HTTP session and kept for as long as
+    Google's Cache-Control max-age allows. Within `refresh_margin` seconds of
+    expiry a background refresh is started, so requests keep using the
+    current certs instead of waiting on the fetch. A token signed with a key
+    id we have not seen (Google rotated keys early) triggers at most one
+    forced refresh per `refresh_margin`.
+    """
+
+    def __init__(self, certs_url, audience, default_ttl=300, refresh_margin=60, timeout=5):
+        self.certs_url = certs_url
+        self.audience = audience
+        self.default_ttl = default_ttl
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        self._certs = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._refreshing = False
+        self._stats = {"fetches": 0, "fetch_errors": 0, "verified": 0}
+
+    # ---------------- Certs ----------------
+    def _ttl(self, response):
+        match = _MAX_AGE.search(response.headers.get("Cache-Control", ""))
+        if not match:
+            return self.default_ttl
+        return max(0, int(match.group(1)) - int(response.headers.get("Age", 0) or 0))
+
+    def _fetch(self):
+        try:
+            response = self.session.get(self.certs_url, timeout=self.timeout)
+            response.raise_for_status()
+            certs = response.json()
+        except (requests.RequestException, ValueError):
+            logger.warning("Could not refresh Google certs from %s", self.certs_url, exc_info=True)
+            with self._lock:
+                self._stats["fetch_errors"] += 1
+                return self._certs
+
+        now = time.monotonic()
+        with self._lock:
+            self._certs = certs
+            self._expires_at = now + self._ttl(response)
+            self._fetched_at = now
+            self._stats["fetches"] += 1
+        return certs
+
+    def refresh(self):
+        """Fetches the current certs; keeps the previous ones if the fetch fails."""
+        with self._fetch_lock:
+            return self._fetch()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="google-certs-refresh", daemon=True).start()
+
+    def get_certs(self):
+        with self._lock:
+            certs, expires_at = self._certs, self._expires_at
+        now = time.monotonic()
+        if not certs or now >= expires_at:
+            with self._fetch_lock:
+                # Another thread may have refreshed while we waited for the lock.
+                with self._lock:
+                    certs, expires_at = self._certs, self._expires_at
+                if not certs or time.monotonic() >= expires_at:
+                    certs = self._fetch()
+        elif now >= expires_at - self.refresh_margin:
+            self._refresh_in_background()
+        if not certs:
+            raise GoogleCertsUnavailable()
+        return certs
+
+    def _refresh_for_unknown_key(self, key_id):
+        with self._lock:
+            recently = time.monotonic() - self._fetched_at < self.refresh_margin
+        if recently:
+            return self._certs
+        logger.info("Google signing key %s not cached, refreshing certs", key_id)
+        return self.refresh()
+
+    # ---------------- Verification ----------------
+    def verify(self, token):
+        """
+        Returns the token's claims. Raises ValueError for anything that is
+        not a valid, unexpired Google ID token for our client id.
+        """
+        certs = self.get_certs()
+        key_id = jwt.decode_header(token).get("kid")
+        if key_id and key_id not in certs:
+            certs = self._refresh_for_unknown_key(key_id)
+
+        claims = jwt.decode(token, certs=certs, audience=self.audience)
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {claims.get('iss')}")
+        with self._lock:
+            self._stats["verified"] += 1
+        return claims
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, keys=len(self._certs), expires_in=max(0.0, self._expires_at - time.monotonic()))
+
+
+google_verifier = GoogleTokenVerifier(
+    certs_url=settings.GOOGLE_CERTS_URL,
+    audience=settings.GOOGLE_CLIENT_ID,
+    default_ttl=settings.GOOGLE_CERTS_DEFAULT_TTL,
+    refresh_margin=settings.GOOGLE_CERTS_REFRESH_MARGIN,
+    timeout=settings.GOOGLE_CERTS_TIMEOUT,
+)
@@ -0,0 +1,147 @@
+# users/hashing.py
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashPoolSaturated(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Authentication is busy, please retry shortly."
+    default_code = "hash_pool_saturated"
+    wait = 1  # surfaced as Retry-After by DRF's exception handler
+
+
+def _init_worker():
+    # Needed with the spawn start method; a no-op for forked workers.
+    import django
+    django.setup()
+
+
+def _check(raw_password, encoded):
+    return check_password(raw_password, encoded)
+
+
+class PasswordHashPool:
+    """
+    Bounded process pool for request-path password hashing.
+
+    Hashing runs outside the request worker, and at most `max_pending` jobs
+    may be queued or running at once; anything beyond that fails fast with
+    HashPoolSaturated instead of queueing behind a login storm. With
+    `workers = 0` jobs run inline (still subject to the pending limit).
+    """
+
+    def __init__(self, workers, max_pending, timeout):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._pending = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self._executor
+
+    def _discard_executor(self, executor):
+        # A worker died (e.g. OOM-killed) and broke the pool: the next call starts a fresh one
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _admit(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HashPoolSaturated()
+            self._pending += 1
+
+    def _release(self, *args):
+        with self._lock:
+            self._pending -= 1
+
+    def run(self, fn, *args):
+        self._admit()
+        if not self.workers:
+            try:
+                return fn(*args)
+            finally:
+                self._release()
+
+        with self._lock:
+            executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException as exc:
+            self._release()
+            if isinstance(exc, BrokenProcessPool):
+                self._discard_executor(executor)
+                raise HashPoolSaturated()
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise HashPoolSaturated()
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise HashPoolSaturated()
+
+    def check_password(self, raw_password, encoded):
+        return self.run(_check, raw_password, encoded)
+
+    def make_password(self, raw_password):
+        return self.run(make_password, raw_password)
+
+    def stats(self):
+        with self._lock:
+            return {"workers": self.workers, "pending": self._pending, "max_pending": self.max_pending, "rejected": self._rejected}
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout=settings.PASSWORD_HASH_TIMEOUT,
+)
+
+
+def verify_user_password(user, raw_password):
+    """
+    check_password for the request path: runs in the hash pool and upgrades
+    the stored hash when the hasher's parameters have changed.
+    """
+    if not password_hash_pool.check_password(raw_password, user.password):
+        return False
+    if identify_hasher(user.password).must_update(user.password):
+        user.password = password_hash_pool.make_password(raw_password)
+        user.save(update_fields=["password"])
+    return True
+
+
+def run_dummy_hash(raw_password):
+    """Keeps unknown-email logins as slow as real ones, like ModelBackend does."""
+    password_hash_pool.make_password(raw_password)
+
+
+def hash_passwords(passwords):
+    """
+    Hashes many raw passwords for batch jobs such as bulk onboarding. Uses a
+    short-lived pool of its own so large imports never starve logins.
+    With PASSWORD_HASH_WORKERS = 0 everything is hashed inline.
+    """
+    passwords = list(passwords)
+    workers = settings.PASSWORD_HASH_WORKERS
+    if not workers or len(passwords) < 2:
+        return [make_password(p) for p in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
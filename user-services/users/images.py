@@ -0,0 +1,84 @@
+# users/images.py
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from .models import ClientProfile, AdvocateProfile
+
+PROFILE_MODELS = {"client": ClientProfile, "advocate": AdvocateProfile}
+THUMBNAIL_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+
+def render_thumbnail(source):
+    """
+    Square, fixed-size thumbnail of an uploaded image. Only pixel data is
+    copied into the new image, so EXIF/GPS and other metadata are dropped.
+    """
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGB")
+        size = settings.PROFILE_THUMBNAIL_SIZE
+        thumb = ImageOps.fit(image, (size, size), method=Image.Resampling.LANCZOS)
+
+    clean = Image.new("RGB", thumb.size)
+    clean.paste(thumb)
+    buffered = BytesIO()
+    clean.save(buffered, format=settings.PROFILE_THUMBNAIL_FORMAT, quality=settings.PROFILE_THUMBNAIL_QUALITY)
+    return buffered.getvalue()
+
+
+def thumbnail_name(profile):
+    digest = hashlib.sha1(profile.profile_image.name.encode()).hexdigest()[:12]
+    return f"{profile.pk}-{digest}.{THUMBNAIL_EXTENSIONS[settings.PROFILE_THUMBNAIL_FORMAT]}"
+
+
+def generate_profile_thumbnail(kind, profile_id, image_name):
+    """
+    Builds and stores the thumbnail for `image_name`. Skips quietly if the
+    profile has since got a different image, so late tasks never clobber a
+    newer upload. Returns the stored thumbnail name, or None.
+    """
+    model = PROFILE_MODELS[kind]
+    profile = model.objects.filter(pk=profile_id).first()
+    if profile is None or profile.profile_image.name != image_name:
+        return None
+
+    with profile.profile_image.open("rb") as source:
+        data = render_thumbnail(source)
+
+    old_thumbnail = profile.profile_thumbnail.name
+    field = model._meta.get_field("profile_thumbnail")
+    name = field.generate_filename(profile, thumbnail_name(profile))
+    name = field.storage.save(name, ContentFile(data))
+
+    updated = model.objects.filter(pk=profile_id, profile_image=image_name).update(profile_thumbnail=name)
+    if not updated:
+        field.storage.delete(name)
+        return None
+    if old_thumbnail and old_thumbnail != name:
+        field.storage.delete(old_thumbnail)
+    return name
+
+
+def schedule_profile_thumbnail(kind, profile):
+    """
+    Drops the previous image's thumbnail, so readers fall back to the new
+    upload until its own is ready (or for good, if that fails), and queues
+    thumbnail generation once the transaction that stored the upload commits.
+    """
+    from .tasks import process_profile_image_task
+
+    old_thumbnail, storage = profile.profile_thumbnail.name, profile.profile_thumbnail.storage
+    if old_thumbnail:
+        type(profile).objects.filter(pk=profile.pk).update(profile_thumbnail=None)
+        profile.profile_thumbnail = None
+        transaction.on_commit(lambda: storage.delete(old_thumbnail))
+    if not profile.profile_image:
+        return
+    image_name = profile.profile_image.name
+    transaction.on_commit(lambda: process_profile_image_task.delay(kind, profile.pk, image_name))
+
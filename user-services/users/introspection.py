@@ -0,0 +1,178 @@
+# users/introspection.py
+import datetime
+import threading
+import time
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import IssuedToken, RevokedToken
+from .revocation import delta_message, publish
+
+User = get_user_model()
+
+
+class RevocationSet:
+    """
+    In-memory copy of the revoked `jti`s that have not expired yet.
+
+    Revocations made in this process are visible immediately; those made by
+    other workers are picked up by a delta query at most once every
+    `sync_interval` seconds, so checking a token never costs a query.
+    """
+
+    # Rows committed slightly out of order are caught by re-reading this far back.
+    overlap = datetime.timedelta(seconds=5)
+
+    def __init__(self, sync_interval):
+        self.sync_interval = sync_interval
+        self._expiry = {}
+        self._synced_at = None
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def _sync(self):
+        now = timezone.now()
+        rows = RevokedToken.objects.filter(expires_at__gt=now)
+        if self._synced_at is not None:
+            rows = rows.filter(revoked_at__gte=self._synced_at - self.overlap)
+        rows = list(rows.values_list("jti", "expires_at"))
+        with self._lock:
+            for jti, expires_at in rows:
+                self._expiry[jti] = expires_at.timestamp()
+            stamp = now.timestamp()
+            self._expiry = {jti: exp for jti, exp in self._expiry.items() if exp > stamp}
+            self._synced_at = now
+
+    def ensure_fresh(self):
+        if time.monotonic() < self._next_sync:
+            return
+        with self._sync_lock:
+            if time.monotonic() < self._next_sync:
+                return
+            self._sync()
+            self._next_sync = time.monotonic() + self.sync_interval
+
+    def add(self, jti, exp):
+        with self._lock:
+            self._expiry[jti] = exp
+
+    def __contains__(self, jti):
+        self.ensure_fresh()
+        with self._lock:
+            exp = self._expiry.get(jti)
+        return exp is not None and exp > time.time()
+
+    def clear(self):
+        with self._lock:
+            self._expiry.clear()
+            self._synced_at = None
+            self._next_sync = 0.0
+
+
+revoked_jtis = RevocationSet(sync_interval=settings.TOKEN_REVOCATION_SYNC_INTERVAL)
+
+
+def revoke_token(token, user=None):
+    """Revokes a validated SimpleJWT token until its own expiry."""
+    jti, exp = token["jti"], token["exp"]
+    expires_at = datetime.datetime.fromtimestamp(exp, tz=datetime.timezone.utc)
+    # ignore_conflicts: revoking an already revoked token is a no-op
+    RevokedToken.objects.bulk_create([RevokedToken(jti=jti, user=user, expires_at=expires_at)], ignore_conflicts=True)
+    revoked_jtis.add(jti, exp)
+    transaction.on_commit(lambda: publish(delta_message([(jti, exp)])))
+
+
+def revoke_user_tokens(user):
+    """Revokes every unexpired token issued to `user`, e.g. after a password reset. Returns how many."""
+    issued = list(
+        IssuedToken.objects.filter(user=user, expires_at__gt=timezone.now()).values_list("jti", "expires_at")
+    )
+    RevokedToken.objects.bulk_create(
+        [RevokedToken(jti=jti, user=user, expires_at=expires_at) for jti, expires_at in issued], ignore_conflicts=True,
+    )
+    revoked = [(jti, expires_at.timestamp()) for jti, expires_at in issued]
+    for jti, exp in revoked:
+        revoked_jtis.add(jti, exp)
+    if revoked:
+        transaction.on_commit(lambda: publish(delta_message(revoked)))
+    return len(revoked)
+
+
+class UserStatusCache:
+    """Short-lived user_id -> (is_active, role, claims_version) cache; misses for a whole batch cost one query."""
+
+    def __init__(self, ttl, maxsize=50000):
+        self._status = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get_many(self, user_ids):
+        with self._lock:
+            found = {uid: self._status[uid] for uid in user_ids if uid in self._status}
+        missing = [uid for uid in user_ids if uid not in found]
+        if missing:
+            rows = {row[0]: row[1:] for row in
+                    User.objects.filter(id__in=missing).values_list("id", "is_active", "role", "claims_version")}
+            # Unknown ids are cached too, so a deleted user does not cost a query per token.
+            fetched = {uid: rows.get(uid, (False, None, None)) for uid in missing}
+            with self._lock:
+                self._status.update(fetched)
+            found.update(fetched)
+        return found
+
+    def clear(self):
+        with self._lock:
+            self._status.clear()
+
+
+user_status = UserStatusCache(ttl=settings.TOKEN_INTROSPECTION_USER_TTL)
+
+INACTIVE = {"active": False, "user_id": None, "role": None, "exp": None, "stale_claims": False}
+
+
+def introspect_tokens(raw_tokens):
+    """
+    Introspects access tokens in bulk. Returns one dict per token, in order:
+    `{"active", "user_id", "role", "exp", "stale_claims"}`. A token is
+    active when its signature and expiry check out, its jti is not revoked
+    and its user is still active; anything else yields `INACTIVE`.
+    `stale_claims` means the identity claims it carries have since changed.
+    More than TOKEN_INTROSPECTION_MAX_TOKENS tokens raise ValueError rather
+    than being dropped, so callers always get one result per token.
+    """
+    if len(raw_tokens) > settings.TOKEN_INTROSPECTION_MAX_TOKENS:
+        raise ValueError(f"At most {settings.TOKEN_INTROSPECTION_MAX_TOKENS} tokens per request, got {len(raw_tokens)}")
+    claims = []
+    for raw in raw_tokens:
+        try:
+            token = AccessToken(raw)
+        except TokenError:
+            claims.append(None)
+            continue
+        claims.append(None if token.get("jti") in revoked_jtis else token)
+
+    user_claim = api_settings.USER_ID_CLAIM
+    statuses = user_status.get_many({int(t[user_claim]) for t in claims if t is not None})
+
+    results = []
+    for token in claims:
+        if token is None:
+            results.append(dict(INACTIVE))
+            continue
+        user_id = int(token[user_claim])
+        is_active, role, claims_version = statuses[user_id]
+        if not is_active:
+            results.append(dict(INACTIVE))
+            continue
+        results.append({
+            "active": True, "user_id": user_id, "role": role, "exp": token["exp"],
+            "stale_claims": token.get("claims_version") != claims_version,
+        })
+    return results
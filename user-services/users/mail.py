@@ -0,0 +1,125 @@
+# users/mail.py
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+logger = logging.getLogger(__name__)
+
+
+class MailDispatcher:
+    """
+    Sends mail in batches over one persistent SMTP connection.
+
+    The mail tasks in users.tasks call `deliver`, which sends before
+    returning and reports what failed, so a message is acknowledged only
+    once the SMTP server accepted it. The connection is kept open across
+    calls, so a worker sending a run of mails connects once; one left idle
+    for `idle_timeout` seconds is reopened before use rather than trusted.
+    Messages that fail are retried one by one (reopening the connection if
+    it dropped) up to `max_retries` times before being counted as failed.
+    """
+
+    def __init__(self, batch_size=100, idle_timeout=30.0, max_retries=3, connection_factory=get_connection):
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self.max_retries = max_retries
+        self.connection_factory = connection_factory
+
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._connection = None
+        self._last_used = 0.0
+
+        self._stats = {"queued": 0, "sent": 0, "failed": 0, "retried": 0, "batches": 0, "send_seconds": 0.0}
+
+    def deliver(self, messages):
+        """
+        Sends `messages` before returning, `batch_size` at a time over the
+        persistent connection, and returns those that still failed.
+        """
+        messages = list(messages)
+        with self._lock:
+            self._stats["queued"] += len(messages)
+        failed = []
+        with self._send_lock:
+            if self._connection is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                # The server has likely dropped an idle session; don't spend a retry finding out
+                self._reset_connection()
+            for start in range(0, len(messages), self.batch_size):
+                failed += self._send_batch(messages[start:start + self.batch_size])
+            self._last_used = time.monotonic()
+        return failed
+
+    def _open(self):
+        if self._connection is None:
+            self._connection = self.connection_factory(fail_silently=False)
+            self._connection.open()
+        return self._connection
+
+    def _reset_connection(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+        self._connection = None
+
+    def _send_one(self, message):
+        try:
+            return self._open().send_messages([message]) == 1
+        except Exception as e:
+            logger.warning("Mail to %s failed: %s", message.to, e)
+            self._reset_connection()
+            return False
+
+    def _send_batch(self, batch):
+        started = time.monotonic()
+        failed = [m for m in batch if not self._send_one(m)]
+
+        for attempt in range(1, self.max_retries + 1):
+            if not failed:
+                break
+            time.sleep(min(0.1 * 2 ** (attempt - 1), 2.0))
+            with self._lock:
+                self._stats["retried"] += len(failed)
+            failed = [m for m in failed if not self._send_one(m)]
+
+        sent = len(batch) - len(failed)
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["sent"] += sent
+            self._stats["failed"] += len(failed)
+            self._stats["send_seconds"] += time.monotonic() - started
+        for message in failed:
+            logger.error("Giving up on mail to %s after %s retries", message.to, self.max_retries)
+        return failed
+
+    def close(self):
+        """Closes the persistent connection; the next delivery opens a new one."""
+        with self._send_lock:
+            self._reset_connection()
+
+    # ---------------- Metrics ----------------
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["throughput_per_second"] = stats["sent"] / stats["send_seconds"] if stats["send_seconds"] else 0.0
+        return stats
+
+
+def build_message(subject, body, to):
+    return EmailMessage(subject=subject, body=body, from_email=settings.DEFAULT_FROM_EMAIL, to=[to])
+
+
+def build_welcome_message(email, full_name):
+    return build_message("Welcome to Our Platform", f"Hello {full_name},\n\nThank you for registering!", email)
+
+
+mail_dispatcher = MailDispatcher(
+    batch_size=settings.MAIL_DISPATCH_BATCH_SIZE,
+    idle_timeout=settings.MAIL_DISPATCH_IDLE_TIMEOUT,
+    max_retries=settings.MAIL_DISPATCH_MAX_RETRIES,
+)
@@ -0,0 +1,201 @@
+import json
+import math
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import pyotp
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from users.audit import AuditLog, audit_log
+from users.google_auth import google_verifier
+from users.models import AdvocateProfile, ClientProfile, User
+from users.throttles import login_failures, mfa_failures
+from users.tokens import get_tokens_for_user
+
+FLOWS = ("register", "login", "mfa_verify", "google_login", "profile_update")
+PASSWORD = "BenchPass123!"
+MFA_EVERY = 10  # every 10th seeded user has MFA enabled
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class _QueryCounter:
+    """connection.execute_wrapper that counts queries without recording their SQL."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the auth flows (register, login, MFA verify, stubbed Google login, profile update) "
+        "in-process against a throwaway test database; prints throughput, latency percentiles and "
+        "queries per request for each flow as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Users, with profiles, seeded before measuring.")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per flow.")
+        parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per flow before measuring.")
+        parser.add_argument("--flows", nargs="+", choices=FLOWS, default=list(FLOWS))
+        parser.add_argument("--fast-hasher", action="store_true",
+                            help="Hash passwords with MD5, leaving out the PBKDF2 cost to expose everything else.")
+        parser.add_argument("--output", help="Also write the report to this file.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=set())
+        try:
+            with ExitStack() as stack:
+                if options["fast_hasher"]:
+                    stack.enter_context(override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]))
+                # Only the request path is measured: no broker, and audit events are written between flows.
+                stack.enter_context(patch("users.views.send_welcome_email_task.delay"))
+                stack.enter_context(patch.object(AuditLog, "_ensure_started"))
+                stack.enter_context(patch.object(google_verifier, "verify", side_effect=self.verify_google_token))
+                report = self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
+
+    @staticmethod
+    def verify_google_token(token):
+        # The stubbed "ID token" is just the account's email.
+        return {"email": token, "name": token.split("@")[0], "email_verified": True}
+
+    def run(self, options):
+        started = time.perf_counter()
+        self.seed(options["users"])
+        report = {
+            "database": connection.vendor,
+            "password_hasher": get_hasher().algorithm,
+            "users": options["users"],
+            "requests_per_flow": options["requests"],
+            "seed_seconds": round(time.perf_counter() - started, 3),
+            "flows": {},
+        }
+        for flow in options["flows"]:
+            report["flows"][flow] = self.measure(flow, options["warmup"], options["requests"])
+        return report
+
+    # ---------------- Seeding ----------------
+    def seed(self, count):
+        """Half clients, half advocates, each with a profile; bulk inserts, so no outbox events are recorded."""
+        password_hash = make_password(PASSWORD)
+        users = []
+        for n in range(count):
+            role = "client" if n % 2 == 0 else "advocate"
+            mfa = n % MFA_EVERY == 0
+            users.append(User(
+                email=f"bench-{role}-{n}@example.com", password=password_hash, role=role,
+                mfa_enabled=mfa, mfa_type="TOTP" if mfa else None, mfa_secret=pyotp.random_base32() if mfa else None,
+            ))
+        User.objects.bulk_create(users, batch_size=500)
+        users = list(User.objects.order_by("id"))
+        ClientProfile.objects.bulk_create(
+            [ClientProfile(user=u, full_name=f"Client {u.id}") for u in users if u.role == "client"], batch_size=500,
+        )
+        AdvocateProfile.objects.bulk_create(
+            [AdvocateProfile(user=u, full_name=f"Advocate {u.id}", bar_council_id=f"BENCH{u.id}") for u in users if u.role == "advocate"],
+            batch_size=500,
+        )
+        self.clients = [u for u in users if u.role == "client" and not u.mfa_enabled]
+        self.mfa_users = [u for u in users if u.mfa_enabled]
+        if not self.clients or not self.mfa_users:
+            raise ValueError(f"--users must be at least {MFA_EVERY + 1} to cover every flow")
+        self.access_tokens = {}
+        self.registered = 0
+
+    # ---------------- Flows ----------------
+    # Each returns (method, url, payload, headers) for the n-th request.
+    def register(self, n):
+        self.registered += 1
+        email = f"bench-new-{self.registered}@example.com"
+        return "post", reverse("user-register"), {"email": email, "password": PASSWORD, "confirm_password": PASSWORD}, {}
+
+    def login(self, n):
+        user = self.clients[n % len(self.clients)]
+        return "post", reverse("login"), {"email": user.email, "password": PASSWORD}, {}
+
+    def mfa_verify(self, n):
+        user = self.mfa_users[n % len(self.mfa_users)]
+        return "post", reverse("verify-mfa"), {"user_id": user.id, "otp": pyotp.TOTP(user.mfa_secret).now()}, {}
+
+    def google_login(self, n):
+        user = self.clients[n % len(self.clients)]
+        return "post", reverse("google-login"), {"token": user.email}, {}
+
+    def profile_update(self, n):
+        user = self.clients[n % len(self.clients)]
+        if user.id not in self.access_tokens:
+            self.access_tokens[user.id] = get_tokens_for_user(user)["access"]
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.access_tokens[user.id]}"}
+        return "put", reverse("client-profile-update"), {"city": f"City {n}"}, headers
+
+    # ---------------- Measuring ----------------
+    def measure(self, flow, warmup, requests):
+        build = getattr(self, flow)
+        client = APIClient()
+        counter = _QueryCounter()
+        latencies, queries, errors, first_error = [], [], 0, None
+
+        for n in range(warmup):
+            method, url, payload, headers = build(n)
+            getattr(client, method)(url, payload, format="json", **headers)
+
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            for n in range(warmup, warmup + requests):
+                method, url, payload, headers = build(n)
+                counter.count = 0
+                request_started = time.perf_counter()
+                response = getattr(client, method)(url, payload, format="json", **headers)
+                latencies.append(time.perf_counter() - request_started)
+                queries.append(counter.count)
+                if response.status_code >= 400:
+                    errors += 1
+                    first_error = first_error or {"status": response.status_code, "body": response.content.decode()[:500]}
+            elapsed = time.perf_counter() - started
+
+        # Keep throttles and the audit buffer from carrying one flow's state into the next.
+        audit_log.flush()
+        login_failures.clear()
+        mfa_failures.clear()
+
+        ordered = sorted(latencies)
+        result = {
+            "requests": requests,
+            "errors": errors,
+            "seconds": round(elapsed, 3),
+            "throughput_rps": round(requests / elapsed, 1) if elapsed else None,
+            "latency_ms": {
+                "mean": round(sum(ordered) / len(ordered) * 1000, 2),
+                "p50": round(percentile(ordered, 50) * 1000, 2),
+                "p95": round(percentile(ordered, 95) * 1000, 2),
+                "p99": round(percentile(ordered, 99) * 1000, 2),
+                "max": round(ordered[-1] * 1000, 2),
+            },
+            "queries_per_request": {"mean": round(sum(queries) / len(queries), 2), "max": max(queries)},
+        }
+        if first_error:
+            result["first_error"] = first_error
+        return result
@@ -0,0 +1,134 @@
+import functools
+import json
+import socketserver
+import threading
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from users.mail import build_welcome_message, mail_dispatcher
+from users.tasks import send_welcome_email_task, send_welcome_emails_task
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept and discard mail from Django's SMTP backend."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.connections += 1
+        time.sleep(self.server.connect_latency)
+        self.reply("220 bench-smtp ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 bench-smtp")
+            elif command == "DATA":
+                self.reply("354 end with <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                self.server.messages += 1
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class _SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, connect_latency):
+        super().__init__(("127.0.0.1", 0), _SMTPSinkHandler)
+        self.connect_latency = connect_latency
+        self.connections = 0
+        self.messages = 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark per-message send_mail against the mail tasks (one welcome task per mail, and the batch "
+        "task bulk onboarding queues) using a local SMTP stand-in. Tasks run in-process, without a broker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=500)
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--connect-latency-ms", type=float, default=5.0,
+                            help="Delay before the SMTP greeting, to model TLS/handshake cost.")
+
+    def handle(self, *args, **options):
+        sink = _SMTPSink(options["connect_latency_ms"] / 1000)
+        threading.Thread(target=sink.serve_forever, daemon=True).start()
+        host, port = sink.server_address
+        connection_factory = functools.partial(
+            get_connection, backend="django.core.mail.backends.smtp.EmailBackend",
+            host=host, port=port, username="", password="", use_tls=False, use_ssl=False,
+        )
+        messages = [build_welcome_message(f"user{i}@example.com", f"User {i}") for i in range(options["messages"])]
+
+        # The tasks send through the module's dispatcher; point it at the stand-in for the run
+        saved = mail_dispatcher.connection_factory, mail_dispatcher.batch_size
+        mail_dispatcher.connection_factory, mail_dispatcher.batch_size = connection_factory, options["batch_size"]
+        mail_dispatcher.close()
+        try:
+            results = {
+                "per_message": self.run_per_message(sink, connection_factory, messages),
+                "welcome_task": self.run_welcome_task(sink, messages),
+                "welcome_batch_task": self.run_welcome_batch_task(sink, messages, options["batch_size"]),
+            }
+        finally:
+            mail_dispatcher.close()
+            mail_dispatcher.connection_factory, mail_dispatcher.batch_size = saved
+            sink.shutdown()
+            sink.server_close()
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def measure(self, sink, run):
+        sink.connections = sink.messages = 0
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        return {
+            "messages": sink.messages,
+            "smtp_connections": sink.connections,
+            "seconds": round(elapsed, 4),
+            "messages_per_second": round(sink.messages / elapsed, 1) if elapsed else None,
+        }
+
+    def run_per_message(self, sink, connection_factory, messages):
+        def run():
+            for message in messages:
+                connection_factory(fail_silently=False).send_messages([message])
+        return self.measure(sink, run)
+
+    def run_tasks(self, sink, run):
+        mail_dispatcher.close()
+        before = mail_dispatcher.stats()
+        result = self.measure(sink, run)
+        after = mail_dispatcher.stats()
+        result["failed"] = after["failed"] - before["failed"]
+        result["retried"] = after["retried"] - before["retried"]
+        return result
+
+    def run_welcome_task(self, sink, messages):
+        def run():
+            for message in messages:
+                send_welcome_email_task.apply(args=[message.to[0], "User"], throw=True)
+        return self.run_tasks(sink, run)
+
+    def run_welcome_batch_task(self, sink, messages, batch_size):
+        recipients = [(message.to[0], "User") for message in messages]
+
+        def run():
+            for start in range(0, len(recipients), batch_size):
+                send_welcome_emails_task.apply(args=[recipients[start:start + batch_size]], throw=True)
+        return self.run_tasks(sink, run)
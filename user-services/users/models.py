@@ -1,4 +1,5 @@
 # users/models.py
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.utils import timezone
@@ -17,6 +18,14 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
 
+    def create_user_with_password_hash(self, email, password_hash, role="client", **extra_fields):
+        """Like create_user, for a password already hashed elsewhere (e.g. the hash pool)."""
+        if not email:
+            raise ValueError("Email must be provided")
+        user = self.model(email=self.normalize_email(email), role=role, password=password_hash, **extra_fields)
+        user.save(using=self._db)
+        return user
+
     def create_superuser(self, email, password=None, **extra_fields):
         extra_fields.setdefault("role", "admin")
         extra_fields.setdefault("is_staff", True)
@@ -43,6 +52,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     mfa_type = models.CharField(max_length=10, choices=[("TOTP", "TOTP")], blank=True, null=True)
     mfa_secret = models.CharField(max_length=64, blank=True, null=True)
 
+    # Bumped whenever a claim embedded in issued tokens changes (users.tokens)
+    claims_version = models.PositiveIntegerField(default=1)
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
@@ -74,6 +86,7 @@ class ClientProfile(models.Model):
     state = models.CharField(max_length=120, blank=True, null=True)
     pincode = models.CharField(max_length=20, blank=True, null=True)
     profile_image = models.ImageField(upload_to="clients/", blank=True, null=True)
+    profile_thumbnail = models.ImageField(upload_to="clients/thumbs/", blank=True, null=True, editable=False)
 
     def __str__(self):
         return self.full_name or self.user.email
@@ -108,8 +121,11 @@ class AdvocateProfile(models.Model):
 
     # Profile info
     profile_image = models.ImageField(upload_to="advocates/", blank=True, null=True)
+    profile_thumbnail = models.ImageField(upload_to="advocates/thumbs/", blank=True, null=True, editable=False)
     is_verified = models.BooleanField(default=False)
-    rating = models.FloatField(default=0.0)
+    rating = models.FloatField(default=0.0)  # Bayesian average of the reviews, kept by client-service's clients.reviews
+    rating_sum = models.BigIntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
     cases_count = models.IntegerField(default=0)
     wins_count = models.IntegerField(default=0)
 
@@ -125,20 +141,133 @@ class AdvocateProfile(models.Model):
         indexes = [models.Index(fields=["user"]), models.Index(fields=["bar_council_id"]), models.Index(fields=["full_name"])]
 
 
+class OTPQuerySet(models.QuerySet):
+    def expiry_cutoff(self):
+        return timezone.now() - datetime.timedelta(minutes=settings.OTP_TTL_MINUTES)
+
+    def active(self):
+        """Unused codes that have not expired; served by the partial (user, is_used, created_at) index."""
+        return self.filter(is_used=False, created_at__gte=self.expiry_cutoff())
+
+    def expired(self):
+        return self.filter(created_at__lt=self.expiry_cutoff())
+
+
 class OTP(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    code = models.CharField(max_length=6, db_index=True)
+    code_hash = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
-    is_used = models.BooleanField(default=False, db_index=True)
+    is_used = models.BooleanField(default=False)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    objects = OTPQuerySet.as_manager()
 
     def is_expired(self):
-        return timezone.now() > self.created_at + datetime.timedelta(minutes=5)
+        return timezone.now() > self.created_at + datetime.timedelta(minutes=settings.OTP_TTL_MINUTES)
 
     def mark_used(self):
         self.is_used = True
-        self.save()
+        self.save(update_fields=["is_used"])
 
     class Meta:
         db_table = "otp"
         ordering = ["-created_at"]
-        indexes = [models.Index(fields=["user"]), models.Index(fields=["code"])]
+        indexes = [
+            models.Index(
+                fields=["user", "is_used", "created_at"],
+                condition=models.Q(is_used=False),
+                name="otp_user_unused_idx",
+            ),
+            models.Index(fields=["created_at"], name="otp_created_at_idx"),
+        ]
+
+
+class RevokedToken(models.Model):
+    """A token id (`jti`) that must no longer be accepted, kept until the token would have expired anyway."""
+    jti = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="revoked_tokens", null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+    class Meta:
+        db_table = "revoked_token"
+        ordering = ["-revoked_at"]
+
+
+class IssuedToken(models.Model):
+    """A token id (`jti`) handed out at login, kept until expiry so the user's sessions can be revoked together."""
+    jti = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="issued_tokens")
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+    class Meta:
+        db_table = "issued_token"
+
+
+class OutboxEvent(models.Model):
+    """
+    A user directory change, written in the same transaction as the change
+    itself and relayed to the other services by users.outbox. `payload` is
+    the user's directory record at that point; `id` doubles as its version.
+    """
+    TOPIC_CHOICES = (
+        ("user.upserted", "User upserted"),
+        ("user.deleted", "User deleted"),
+    )
+
+    topic = models.CharField(max_length=40, choices=TOPIC_CHOICES)
+    aggregate_id = models.BigIntegerField()
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.topic} #{self.aggregate_id}"
+
+    class Meta:
+        db_table = "user_outbox"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["id"], condition=models.Q(published_at__isnull=True), name="user_outbox_pending_idx"),
+            models.Index(fields=["published_at"], name="user_outbox_published_idx"),
+        ]
+
+
+class AuthAuditEvent(models.Model):
+    """
+    One authentication attempt. The table is range-partitioned by month on
+    `created_at`, so it is created and maintained by users.audit rather than
+    by migrations; rows are written in batches by the audit log buffer.
+    """
+    EVENT_CHOICES = (
+        ("login_succeeded", "Login succeeded"),
+        ("login_mfa_required", "Login pending MFA"),
+        ("login_failed", "Login failed"),
+        ("google_login_succeeded", "Google login succeeded"),
+        ("google_login_mfa_required", "Google login pending MFA"),
+        ("google_login_failed", "Google login failed"),
+        ("mfa_verified", "MFA verified"),
+        ("mfa_failed", "MFA failed"),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    event = models.CharField(max_length=32, choices=EVENT_CHOICES)
+    user_id = models.BigIntegerField(null=True, blank=True)
+    email = models.CharField(max_length=254, blank=True, default="")
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.event} {self.email or self.user_id} @ {self.created_at:%Y-%m-%d %H:%M:%S}"
+
+    class Meta:
+        db_table = "auth_audit_log"
+        managed = False
+        ordering = ["-created_at"]
@@ -0,0 +1,91 @@
+# users/onboarding.py
+from django.db import IntegrityError, transaction
+
+from .hashing import hash_passwords
+from .models import User, AdvocateProfile
+from .outbox import record_user_changes
+from .serializers import AdvocateBulkRowSerializer
+from .tasks import send_welcome_emails_task
+
+
+class BulkOnboardingError(Exception):
+    pass
+
+
+def _validate_rows(rows):
+    """Validates rows without touching the DB; returns (valid rows, errors by row index)."""
+    valid, errors = [], {}
+    for index, row in enumerate(rows):
+        serializer = AdvocateBulkRowSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors[index] = serializer.errors
+    return valid, errors
+
+
+def _reject_duplicates(valid, errors):
+    """Drops rows whose email or bar council ID repeats in the batch or already exists."""
+    emails = {data["email"] for _, data in valid}
+    bar_ids = {data["bar_council_id"] for _, data in valid}
+    taken_emails = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+    taken_bar_ids = set(AdvocateProfile.objects.filter(bar_council_id__in=bar_ids).values_list("bar_council_id", flat=True))
+
+    seen_emails, seen_bar_ids, accepted = set(), set(), []
+    for index, data in valid:
+        row_errors = {}
+        if data["email"] in taken_emails:
+            row_errors["email"] = ["Email already exists"]
+        elif data["email"] in seen_emails:
+            row_errors["email"] = ["Duplicate email in batch"]
+        if data["bar_council_id"] in taken_bar_ids:
+            row_errors["bar_council_id"] = ["Bar council ID already exists"]
+        elif data["bar_council_id"] in seen_bar_ids:
+            row_errors["bar_council_id"] = ["Duplicate bar council ID in batch"]
+
+        seen_emails.add(data["email"])
+        seen_bar_ids.add(data["bar_council_id"])
+        if row_errors:
+            errors[index] = row_errors
+        else:
+            accepted.append((index, data))
+    return accepted
+
+
+def bulk_register_advocates(rows):
+    """
+    Registers a roster of advocates in one transaction.
+
+    Uniqueness is checked with one query per key, passwords are hashed in the
+    hash pool, users and profiles are inserted with bulk_create and a single
+    welcome-mail job is queued. Invalid rows are skipped and reported.
+    Returns (created, errors) where created is a list of {"row", "user_id"}
+    and errors is a list of {"row", "errors"}.
+    """
+    valid, errors = _validate_rows(rows)
+    accepted = _reject_duplicates(valid, errors) if valid else []
+
+    created = []
+    if accepted:
+        hashes = hash_passwords(data["password"] for _, data in accepted)
+        users = [
+            User(email=data["email"], role="advocate", password=password_hash)
+            for (_, data), password_hash in zip(accepted, hashes)
+        ]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                AdvocateProfile.objects.bulk_create([
+                    AdvocateProfile(user=user, full_name=data["full_name"], bar_council_id=data["bar_council_id"])
+                    for user, (_, data) in zip(users, accepted)
+                ])
+                # bulk_create sends no signals, so the directory events are written here.
+                record_user_changes([user.id for user in users])
+                recipients = [[user.email, data["full_name"]] for user, (_, data) in zip(users, accepted)]
+                transaction.on_commit(lambda: send_welcome_emails_task.delay(recipients))
+        except IntegrityError as e:
+            raise BulkOnboardingError("Roster conflicts with advocates registered concurrently, please retry") from e
+
+        created = [{"row": index, "user_id": user.id} for user, (index, _) in zip(users, accepted)]
+
+    return created, [{"row": index, "errors": errors[index]} for index in sorted(errors)]
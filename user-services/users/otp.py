@@ -0,0 +1,64 @@
+# users/otp.py
+import hashlib
+import hmac
+import secrets
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+
+from .models import OTP
+
+
+def hash_otp(user_id, code):
+    # Keyed by SECRET_KEY and bound to the user, so a leaked table row is not a usable code.
+    message = f"{user_id}:{code}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def generate_otp_code():
+    return f"{secrets.randbelow(10 ** 6):06d}"
+
+
+def issue_otp(user):
+    """Invalidates the user's outstanding codes and returns a fresh plaintext code."""
+    code = generate_otp_code()
+    with transaction.atomic():
+        OTP.objects.active().filter(user=user).update(is_used=True)
+        OTP.objects.create(user=user, code_hash=hash_otp(user.id, code))
+    return code
+
+
+def verify_otp(user, code):
+    """
+    Consumes the user's current code if `code` matches. Every wrong guess
+    counts against the code, which is burned after OTP_MAX_ATTEMPTS.
+    """
+    otp = OTP.objects.active().filter(user=user).order_by("-created_at").first()
+    if otp is None:
+        return False
+
+    if not hmac.compare_digest(otp.code_hash, hash_otp(user.id, str(code))):
+        OTP.objects.filter(pk=otp.pk).update(
+            attempts=F("attempts") + 1,
+            is_used=Case(When(attempts__gte=settings.OTP_MAX_ATTEMPTS - 1, then=Value(True)), default=Value(False)),
+        )
+        return False
+
+    # Conditional update so two concurrent resets cannot both consume the code.
+    return OTP.objects.filter(pk=otp.pk, is_used=False).update(is_used=True) == 1
+
+
+def purge_expired_otps(batch_size=None, max_batches=None):
+    """Deletes expired codes in bounded batches; returns the number of rows removed."""
+    batch_size = batch_size or settings.OTP_PURGE_BATCH_SIZE
+    max_batches = max_batches or settings.OTP_PURGE_MAX_BATCHES
+    removed = 0
+    for _ in range(max_batches):
+        ids = list(OTP.objects.expired().order_by("created_at").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        removed += OTP.objects.filter(id__in=ids).delete()[0]
+        if len(ids) < batch_size:
+            break
+    return removed
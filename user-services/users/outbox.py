@@ -0,0 +1,120 @@
+# users/outbox.py
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from casebridge_common.directory import USER_DIRECTORY_EXCHANGE
+
+from user_services.celery import app
+from .directory import directory_queryset
+from .models import AdvocateProfile, ClientProfile, OutboxEvent, User
+
+RECORD_FIELDS = ("id", "email", "role", "display_name", "is_active")
+# Saves that only touch other columns (password, last_login, MFA, ...) do not change the directory.
+USER_FIELDS = {"email", "role", "is_active"}
+PROFILE_FIELDS = {"full_name", "user"}
+
+
+def record_user_changes(user_ids):
+    """
+    Writes one `user.upserted` outbox event per user, carrying the user's
+    directory record as of now. Runs inside the caller's transaction so the
+    event commits (or rolls back) with the change. The user rows are locked
+    first, so events for one user are numbered in commit order.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return
+    with transaction.atomic():
+        rows = directory_queryset().filter(id__in=user_ids).select_for_update(of=("self",)).values(*RECORD_FIELDS)
+        OutboxEvent.objects.bulk_create([
+            OutboxEvent(topic="user.upserted", aggregate_id=row["id"], payload=row) for row in rows
+        ])
+
+
+def record_user_deleted(user):
+    payload = {"id": user.pk, "email": user.email, "role": user.role, "display_name": user.email, "is_active": False}
+    OutboxEvent.objects.create(topic="user.deleted", aggregate_id=user.pk, payload=payload)
+
+
+def _user_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields and not USER_FIELDS & set(update_fields)):
+        return
+    record_user_changes([instance.pk])
+
+
+def _profile_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields and not PROFILE_FIELDS & set(update_fields)):
+        return
+    record_user_changes([instance.user_id])
+
+
+def _profile_deleted(sender, instance, **kwargs):
+    record_user_changes([instance.user_id])
+
+
+def _user_deleted(sender, instance, **kwargs):
+    record_user_deleted(instance)
+
+
+post_save.connect(_user_saved, sender=User, dispatch_uid="user_outbox_user_save")
+post_delete.connect(_user_deleted, sender=User, dispatch_uid="user_outbox_user_delete")
+for _model in (ClientProfile, AdvocateProfile):
+    post_save.connect(_profile_saved, sender=_model, dispatch_uid=f"user_outbox_{_model._meta.model_name}_save")
+    post_delete.connect(_profile_deleted, sender=_model, dispatch_uid=f"user_outbox_{_model._meta.model_name}_delete")
+
+
+def event_message(event):
+    return dict(event.payload, version=event.id, deleted=event.topic == "user.deleted")
+
+
+def publish_batch(events):
+    """Publishes `events` as one message; persistent, so it survives a broker restart."""
+    message = {"type": "user_directory", "events": [event_message(e) for e in events]}
+    with app.producer_or_acquire() as producer:
+        producer.publish(
+            message, exchange=USER_DIRECTORY_EXCHANGE, routing_key="", serializer="json",
+            declare=[USER_DIRECTORY_EXCHANGE], delivery_mode=2, retry=True, retry_policy={"max_retries": 3},
+        )
+
+
+def relay_outbox(batch_size=None, max_batches=None):
+    """
+    Publishes pending outbox events oldest first, `batch_size` per message,
+    and marks them published. Rows are claimed with SKIP LOCKED, so relays
+    running side by side never publish the same batch; an event is only
+    marked once the broker has it, so a failed publish is retried by the next
+    run and consumers may see an event twice (they apply by version).
+    Returns the number of events relayed.
+    """
+    batch_size = batch_size or settings.USER_OUTBOX_BATCH_SIZE
+    max_batches = max_batches or settings.USER_OUTBOX_MAX_BATCHES
+    relayed = 0
+    for _ in range(max_batches):
+        with transaction.atomic():
+            events = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(published_at__isnull=True).order_by("id")[:batch_size]
+            )
+            if not events:
+                break
+            publish_batch(events)
+            OutboxEvent.objects.filter(id__in=[e.id for e in events]).update(published_at=timezone.now())
+        relayed += len(events)
+        if len(events) < batch_size:
+            break
+    return relayed
+
+
+def purge_published_events():
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.USER_OUTBOX_RETENTION)
+    return OutboxEvent.objects.filter(published_at__lt=cutoff).delete()[0]
+
+
+def export_directory(after_id, limit):
+    """One page of directory records with id > after_id, for consumers bootstrapping their copy."""
+    limit = min(int(limit), settings.USER_OUTBOX_EXPORT_MAX)
+    rows = directory_queryset().filter(id__gt=int(after_id)).order_by("id").values(*RECORD_FIELDS)[:limit]
+    return [dict(row, version=0, deleted=False) for row in rows]
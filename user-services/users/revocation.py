@@ -0,0 +1,53 @@
+# users/revocation.py
+import logging
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from casebridge_auth.revocation import REVOCATION_EXCHANGE, BloomFilter
+
+from user_services.celery import app
+from .models import IssuedToken, RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+def build_snapshot():
+    """
+    Bloom filter over every revoked, unexpired jti. One indexed query; the
+    filter is sized with headroom so the false-positive rate stays near
+    TOKEN_REVOCATION_BLOOM_FP_RATE until the next snapshot.
+    """
+    jtis = list(RevokedToken.objects.filter(expires_at__gt=timezone.now()).values_list("jti", flat=True))
+    bloom = BloomFilter.for_capacity(
+        max(len(jtis) * 2, settings.TOKEN_REVOCATION_BLOOM_MIN_CAPACITY), settings.TOKEN_REVOCATION_BLOOM_FP_RATE,
+    )
+    for jti in jtis:
+        bloom.add(jti)
+    return {"type": "snapshot", "generated_at": time.time(), "count": len(jtis), "bloom": bloom.to_dict()}
+
+
+def delta_message(revoked):
+    """Exact list of (jti, exp) pairs revoked since the last snapshot."""
+    return {"type": "delta", "generated_at": time.time(), "revoked": [[jti, exp] for jti, exp in revoked]}
+
+
+def publish(message):
+    """Fans `message` out to every subscribed process. Best effort: the next snapshot heals a lost delta."""
+    try:
+        with app.producer_or_acquire() as producer:
+            producer.publish(
+                message, exchange=REVOCATION_EXCHANGE, routing_key="", serializer="json",
+                declare=[REVOCATION_EXCHANGE], retry=True, retry_policy={"max_retries": 1},
+            )
+    except Exception:
+        logger.warning("Could not publish token revocation %s", message.get("type"), exc_info=True)
+        return False
+    return True
+
+
+def purge_expired_revocations():
+    """Expired tokens fail validation on their own; their rows are no longer needed."""
+    now = timezone.now()
+    IssuedToken.objects.filter(expires_at__lte=now).delete()
+    return RevokedToken.objects.filter(expires_at__lte=now).delete()[0]
@@ -1,8 +1,12 @@
 # users/serializers.py
 from rest_framework import serializers
+from django.db import transaction
 from django.core.validators import RegexValidator
 from django.contrib.auth import get_user_model
-from .models import ClientProfile, AdvocateProfile, Specialization
+from .models import ClientProfile, AdvocateProfile
+from .hashing import password_hash_pool, verify_user_password, run_dummy_hash
+from .throttles import login_failures
+from .specializations import sync_specializations
 
 User = get_user_model()
 
@@ -27,8 +31,10 @@ class UserRegisterSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop("confirm_password")
-        user = User.objects.create_user(email=validated_data["email"], password=validated_data["password"], role="client")
-        ClientProfile.objects.create(user=user, full_name=user.email)
+        password_hash = password_hash_pool.make_password(validated_data["password"])
+        with transaction.atomic():
+            user = User.objects.create_user_with_password_hash(email=validated_data["email"], password_hash=password_hash, role="client")
+            ClientProfile.objects.create(user=user, full_name=user.email)
         return user
 
 
@@ -61,21 +67,42 @@ class AdvocateRegisterSerializer(serializers.Serializer):
         bar_council_id = validated_data.pop("bar_council_id")
         full_name = validated_data.pop("full_name")
 
-        user = User.objects.create_user(email=validated_data["email"], password=validated_data["password"], role="advocate")
-        AdvocateProfile.objects.create(user=user, bar_council_id=bar_council_id, full_name=full_name)
+        password_hash = password_hash_pool.make_password(validated_data["password"])
+        with transaction.atomic():
+            user = User.objects.create_user_with_password_hash(email=validated_data["email"], password_hash=password_hash, role="advocate")
+            AdvocateProfile.objects.create(user=user, bar_council_id=bar_council_id, full_name=full_name)
         return user
 
 
+class AdvocateBulkRowSerializer(AdvocateRegisterSerializer):
+    """Per-row validation for bulk onboarding; uniqueness is checked once for the whole batch."""
+
+    def validate_email(self, value):
+        return User.objects.normalize_email(value)
+
+    def validate_bar_council_id(self, value):
+        return value
+
+
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
 
     def validate(self, data):
-        from django.contrib.auth import authenticate
-        # authenticate expects username kwarg, but USERNAME_FIELD is email — pass as username
-        user = authenticate(username=data["email"], password=data["password"])
-        if not user:
+        # Same checks as ModelBackend.authenticate, but the hash runs in the
+        # bounded hash pool and repeated failures for an email are refused early.
+        email = User.objects.normalize_email(data["email"])
+        throttle_key = email.lower()
+        login_failures.check(throttle_key)
+
+        user = User.objects.filter(email=email).first()
+        if user is None:
+            run_dummy_hash(data["password"])
+        if user is None or not verify_user_password(user, data["password"]) or not user.is_active:
+            login_failures.failure(throttle_key)
             raise serializers.ValidationError("Invalid email or password")
+
+        login_failures.success(throttle_key)
         data["user"] = user
         return data
 
@@ -83,7 +110,8 @@ class LoginSerializer(serializers.Serializer):
 class ClientProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = ClientProfile
-        fields = ["full_name", "phone", "address_line1", "address_line2", "city", "state", "pincode", "profile_image"]
+        fields = ["full_name", "phone", "address_line1", "address_line2", "city", "state", "pincode", "profile_image", "profile_thumbnail"]
+        read_only_fields = ["profile_thumbnail"]
 
 
 class AdvocateProfileSerializer(serializers.ModelSerializer):
@@ -94,19 +122,18 @@ class AdvocateProfileSerializer(serializers.ModelSerializer):
         fields = [
             "full_name", "phone", "gender", "dob", "bar_council_id", "enrollment_year",
             "experience_years", "languages", "specializations",
-            "address_line1", "address_line2", "city", "state", "pincode", "profile_image"
+            "address_line1", "address_line2", "city", "state", "pincode", "profile_image", "profile_thumbnail"
         ]
+        read_only_fields = ["profile_thumbnail"]
 
     def update(self, instance, validated_data):
-        # Handle specializations list
-        specs = validated_data.pop("specializations", [])
+        # Handle specializations list; when given it replaces the current set
+        specs = validated_data.pop("specializations", None)
         for attr, val in validated_data.items():
             setattr(instance, attr, val)
         instance.save()
-        if specs:
-            for name in specs:
-                spec, _ = Specialization.objects.get_or_create(name=name)
-                instance.specializations.add(spec)
+        if specs is not None:
+            sync_specializations(instance, specs)
         return instance
 
 
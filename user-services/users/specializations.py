@@ -0,0 +1,22 @@
+# users/specializations.py
+from casebridge_common.specializations import SpecializationResolver, sync_specializations as _sync_specializations
+from django.db.models.signals import post_delete, post_save
+
+from .models import Specialization
+
+specialization_resolver = SpecializationResolver(Specialization)
+
+
+def _forget_specialization(sender, instance, created=False, **kwargs):
+    # A rename or delete must not leave a stale name -> id mapping behind, in any worker.
+    if not created:
+        specialization_resolver.forget()
+
+
+post_save.connect(_forget_specialization, sender=Specialization, dispatch_uid="specialization_resolver_save")
+post_delete.connect(_forget_specialization, sender=Specialization, dispatch_uid="specialization_resolver_delete")
+
+
+def sync_specializations(profile, names):
+    """Makes `profile.specializations` exactly `names` (see casebridge_common.specializations)."""
+    _sync_specializations(profile, names, specialization_resolver)
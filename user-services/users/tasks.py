@@ -1,17 +1,110 @@
 # users/tasks.py
 from celery import shared_task
-from django.core.mail import send_mail
-from django.conf import settings
-
-@shared_task
-def send_welcome_email_task(email, full_name):
-    try:
-        send_mail(
-            subject="Welcome to Our Platform",
-            message=f"Hello {full_name},\n\nThank you for registering!",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=False,
-        )
-    except Exception as e:
-        print(f"Failed to send welcome email: {e}")
+
+from .audit import drop_expired_audit_partitions, ensure_audit_partitions, shared_audit_stats
+from .directory import get_users_directory
+from .mail import mail_dispatcher, build_message, build_welcome_message
+from .otp import purge_expired_otps
+from .images import generate_profile_thumbnail
+from .introspection import introspect_tokens
+from .outbox import export_directory, purge_published_events, relay_outbox
+from .revocation import build_snapshot, publish, purge_expired_revocations
+
+
+# Mail tasks send before returning and are acked late, so a worker that dies
+# mid-send leaves the message queued for another one instead of losing it.
+MAIL_TASK_OPTIONS = {"bind": True, "acks_late": True, "reject_on_worker_lost": True, "max_retries": 5, "default_retry_delay": 60}
+
+
+@shared_task(**MAIL_TASK_OPTIONS)
+def send_welcome_email_task(self, email, full_name):
+    if mail_dispatcher.deliver([build_welcome_message(email, full_name)]):
+        raise self.retry()
+
+
+@shared_task(**MAIL_TASK_OPTIONS)
+def send_welcome_emails_task(self, recipients):
+    """Sends welcome mails for a batch of (email, full_name) pairs; only failed recipients are retried."""
+    failed = {m.to[0] for m in mail_dispatcher.deliver([build_welcome_message(email, name) for email, name in recipients])}
+    if failed:
+        raise self.retry(args=[[(email, name) for email, name in recipients if email in failed]])
+
+
+@shared_task(**MAIL_TASK_OPTIONS)
+def send_notification_email_task(self, email, subject, message):
+    if mail_dispatcher.deliver([build_message(subject, message, email)]):
+        raise self.retry()
+
+
+@shared_task
+def get_mail_dispatch_stats():
+    return mail_dispatcher.stats()
+
+
+@shared_task
+def get_auth_audit_stats():
+    # The events are recorded by the web processes, not by this worker
+    return shared_audit_stats()
+
+
+@shared_task
+def maintain_audit_partitions_task():
+    return {"ensured": ensure_audit_partitions(), "dropped": drop_expired_audit_partitions()}
+
+
+@shared_task
+def purge_expired_otps_task():
+    return purge_expired_otps()
+
+
+@shared_task
+def process_profile_image_task(kind, profile_id, image_name):
+    return generate_profile_thumbnail(kind, profile_id, image_name)
+
+
+# ------------------------- User Directory RPC -------------------------
+@shared_task(name="user_service.tasks.get_user_info")
+def get_user_info(user_id):
+    users = get_users_directory([user_id])
+    return users[0] if users else None
+
+
+@shared_task(name="user_service.tasks.get_users_info")
+def get_users_info(ids):
+    return get_users_directory(ids)
+
+
+# ------------------------- Token Introspection RPC -------------------------
+@shared_task(name="user_service.tasks.introspect_tokens")
+def introspect_tokens_task(tokens):
+    return introspect_tokens(tokens)
+
+
+# ------------------------- Token Revocation Snapshots -------------------------
+@shared_task(name="user_service.tasks.get_revocation_snapshot")
+def get_revocation_snapshot():
+    return build_snapshot()
+
+
+@shared_task
+def publish_revocation_snapshot_task():
+    purged = purge_expired_revocations()
+    snapshot = build_snapshot()
+    publish(snapshot)
+    return {"purged": purged, "revoked": snapshot["count"]}
+
+
+# ------------------------- User Directory Outbox -------------------------
+@shared_task
+def relay_user_outbox_task():
+    return relay_outbox()
+
+
+@shared_task
+def purge_user_outbox_task():
+    return purge_published_events()
+
+
+@shared_task(name="user_service.tasks.export_user_directory")
+def export_user_directory(after_id, limit):
+    return export_directory(after_id, limit)
@@ -0,0 +1,29 @@
+from unittest.mock import patch
+
+from rest_framework.test import APITestCase
+
+from users.audit import AuditLog, audit_log
+
+# The suite must not need the shared Redis cache; tests that touch the cache run against this one
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class AuditedAPITestCase(APITestCase):
+    """
+    APITestCase for views that record auth audit events. The global audit
+    log's flush thread is never started: it would write from its own
+    connection, outside the test transaction, and lock the test database.
+    Whatever a test buffers is flushed when it ends, inside its transaction,
+    so it is rolled back with everything else.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        patcher = patch.object(AuditLog, "_ensure_started")
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        super().setUpClass()
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(audit_log.flush)
@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from users.models import AdvocateProfile
+
+User = get_user_model()
+
+
+class AdminChangelistTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(email="admin@gmail.com", password="AdminPass123!", role="admin")
+        self.client.force_login(self.admin)
+        for n in range(5):
+            user = User.objects.create_user(email=f"advocate{n}@gmail.com", password="AdvocatePass123!", role="advocate")
+            AdvocateProfile.objects.create(user=user, full_name=f"Advocate {n}", bar_council_id=f"BAR{n}")
+
+    def test_advocate_changelist_does_not_load_users_per_row(self):
+        url = reverse("admin:users_advocateprofile_changelist")
+        self.client.get(url)
+        # Session, admin user, one COUNT and the page itself.
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertContains(response, "Advocate 4")
+
+    def test_user_search(self):
+        url = reverse("admin:users_user_changelist")
+        response = self.client.get(url, {"q": "advocate3"})
+        self.assertContains(response, "advocate3@gmail.com")
+        self.assertNotContains(response, "advocate1@gmail.com")
+        response = self.client.get(url, {"q": "ad"})
+        self.assertContains(response, "admin@gmail.com")
+        self.assertEqual(response.context["cl"].result_count, 6)
@@ -0,0 +1,134 @@
+import datetime
+from unittest.mock import patch
+
+import pyotp
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.audit import AuditLog, DROP_NEWEST, _month_start, audit_log
+from users.tasks import get_auth_audit_stats
+from users.tests.base import LOCMEM_CACHES
+from users.models import AuthAuditEvent
+from users.throttles import login_failures, mfa_failures
+
+User = get_user_model()
+
+
+@patch.object(AuditLog, "_ensure_started")
+class AuditBufferTests(TestCase):
+
+    def test_full_buffer_drops_oldest_and_counts_it(self, started):
+        log = AuditLog(capacity=3, batch_size=10)
+        for n in range(5):
+            log.record("login_failed", email=f"user{n}@gmail.com")
+
+        self.assertEqual(log.stats()["dropped_overflow"], 2)
+        log.flush()
+        self.assertEqual(sorted(AuthAuditEvent.objects.values_list("email", flat=True)),
+                         ["user2@gmail.com", "user3@gmail.com", "user4@gmail.com"])
+
+    def test_drop_newest_keeps_the_buffered_events(self, started):
+        log = AuditLog(capacity=2, batch_size=10, drop_policy=DROP_NEWEST)
+        for n in range(4):
+            log.record("login_failed", email=f"user{n}@gmail.com")
+        log.flush()
+        self.assertEqual(sorted(AuthAuditEvent.objects.values_list("email", flat=True)), ["user0@gmail.com", "user1@gmail.com"])
+        self.assertEqual(log.stats()["dropped"], 2)
+
+    def test_flush_writes_one_insert_per_batch(self, started):
+        log = AuditLog(capacity=100, batch_size=3)
+        for n in range(7):
+            log.record("login_succeeded", user=n + 1)
+        with self.assertNumQueries(3):
+            self.assertEqual(log.flush(), 7)
+        self.assertEqual(log.stats()["batches"], 3)
+
+    def test_refused_batches_are_counted_as_dropped(self, started):
+        log = AuditLog(capacity=100, batch_size=10)
+        log.record("login_failed", email="user@gmail.com")
+        with patch.object(AuthAuditEvent.objects, "bulk_create", side_effect=DatabaseError("partition missing")):
+            self.assertEqual(log.flush(), 0)
+        stats = log.stats()
+        self.assertEqual((stats["dropped_write_errors"], stats["pending"]), (1, 0))
+
+    def test_month_boundaries(self, started):
+        december = datetime.datetime(2026, 12, 15, tzinfo=datetime.timezone.utc)
+        self.assertEqual(_month_start(december, 1), datetime.datetime(2027, 1, 1, tzinfo=datetime.timezone.utc))
+        self.assertEqual(_month_start(december, -12), datetime.datetime(2025, 12, 1, tzinfo=datetime.timezone.utc))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@patch.object(AuditLog, "_ensure_started")
+class SharedAuditStatsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_counters_of_every_process_are_summed(self, started):
+        # Two web processes, each with its own buffer
+        first, second = AuditLog(capacity=1, batch_size=10), AuditLog(capacity=10, batch_size=10)
+        for log, events in ((first, 3), (second, 2)):
+            for n in range(events):
+                log.record("login_failed", email=f"user{n}@gmail.com")
+            log.flush()
+            log.publish_stats()
+        first.publish_stats()
+
+        stats = get_auth_audit_stats()
+        self.assertEqual((stats["recorded"], stats["written"], stats["dropped_overflow"]), (5, 3, 2))
+        self.assertEqual(stats["dropped"], 2)
+
+    def test_unpublished_counters_are_kept_when_the_cache_fails(self, started):
+        log = AuditLog(capacity=10, batch_size=10)
+        log.record("login_failed", email="user@gmail.com")
+        with patch("users.audit.cache.incr", side_effect=ConnectionError):
+            log.publish_stats()
+        log.publish_stats()
+        self.assertEqual(get_auth_audit_stats()["recorded"], 1)
+
+
+@patch.object(AuditLog, "_ensure_started")
+class AuthAuditViewTests(APITestCase):
+
+    def setUp(self):
+        login_failures.clear()
+        mfa_failures.clear()
+        audit_log.flush()
+        AuthAuditEvent.objects.all().delete()
+        self.user = User.objects.create_user(email="advocate@gmail.com", password="AdvocatePass123!", role="advocate")
+
+    def events(self):
+        audit_log.flush()
+        return list(AuthAuditEvent.objects.order_by("id").values_list("event", "user_id", "email"))
+
+    def test_login_attempts_are_recorded_off_the_request_path(self, started):
+        login = reverse("login")
+        with self.assertNumQueries(1):
+            self.client.post(login, {"email": "advocate@gmail.com", "password": "WrongPass12!"}, format="json")
+        self.client.post(login, {"email": "advocate@gmail.com", "password": "AdvocatePass123!"}, format="json",
+                         REMOTE_ADDR="10.0.0.7")
+
+        self.assertEqual(self.events(), [
+            ("login_failed", None, "advocate@gmail.com"),
+            ("login_succeeded", self.user.id, "advocate@gmail.com"),
+        ])
+        self.assertEqual(AuthAuditEvent.objects.get(event="login_succeeded").ip_address, "10.0.0.7")
+
+    def test_mfa_verification_is_recorded(self, started):
+        self.user.mfa_enabled = True
+        self.user.mfa_secret = pyotp.random_base32()
+        self.user.save()
+        url = reverse("verify-mfa")
+
+        response = self.client.post(url, {"user_id": self.user.id, "otp": "000000"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        otp = pyotp.TOTP(self.user.mfa_secret).now()
+        response = self.client.post(url, {"user_id": self.user.id, "otp": otp}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual([e[0] for e in self.events()], ["mfa_failed", "mfa_verified"])
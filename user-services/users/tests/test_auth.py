@@ -1,26 +1,27 @@
 from unittest.mock import patch
 from django.urls import reverse
-from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
 
+from users.throttles import login_failures
+from users.tests.base import AuditedAPITestCase
+
 User = get_user_model()
 
 
-class AuthAPITests(APITestCase):
+class AuthAPITests(AuditedAPITestCase):
 
     def setUp(self):
+        login_failures.clear()
         self.client_user = User.objects.create_user(
             email="client@gmail.com",
             password="ClientPass123!",
-            username="clientuser",
             role="client"
         )
 
         self.advocate_user = User.objects.create_user(
             email="advocate@gmail.com",
             password="AdvocatePass123!",
-            username="advocateuser",
             role="advocate"
         )
 
@@ -34,37 +35,34 @@ class AuthAPITests(APITestCase):
 
     # --------------------------- REGISTER TESTS ---------------------------
 
-    @patch("users.views.send_welcome_email.delay")
-    @patch("users.views.emit_user_created_event")
-    def test_client_register(self, mock_event, mock_welcome):
-        url = reverse("client-register")
+    @patch("users.views.send_welcome_email_task.delay")
+    def test_client_register(self, mock_welcome):
+        url = reverse("user-register")
         data = {
-            "username": "newclientuser",
             "email": "newclient@gmail.com",
             "password": "NewClientPass123!",
             "confirm_password": "NewClientPass123!",
-            "role": "client",   
         }
 
         response = self.client.post(url, data, format="json")
         self.assertStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(User.objects.get(email="newclient@gmail.com").role, "client")
+        mock_welcome.assert_called_once()
 
-    @patch("users.views.send_welcome_email.delay")
-    @patch("users.views.emit_user_created_event")
-    def test_advocate_register(self, mock_event, mock_welcome):
+    @patch("users.views.send_welcome_email_task.delay")
+    def test_advocate_register(self, mock_welcome):
         url = reverse("advocate-register")
         data = {
-            "username": "newadvocateuser",
             "email": "newadvocate@gmail.com",
             "password": "NewAdvocatePass123!",
             "confirm_password": "NewAdvocatePass123!",
-            "role": "advocate",            # REQUIRED
-            "phone_number": "9998887776",  # REQUIRED
-            "bar_council_number": "BAR1234",  # REQUIRED
+            "full_name": "New Advocate",
+            "bar_council_id": "BAR1234",
         }
 
         response = self.client.post(url, data, format="json")
         self.assertStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(User.objects.get(email="newadvocate@gmail.com").advocate_profile.bar_council_id, "BAR1234")
 
     # --------------------------- LOGIN TESTS ---------------------------
 
@@ -76,7 +74,7 @@ class AuthAPITests(APITestCase):
         }
         response = self.client.post(url, data, format="json")
         self.assertStatus(response, status.HTTP_200_OK)
-        self.assertIn("token", response.data)
+        self.assertIn("tokens", response.data["data"])
 
     def test_login_wrong_password(self):
         url = reverse("login")
@@ -86,30 +84,25 @@ class AuthAPITests(APITestCase):
         }
         response = self.client.post(url, data, format="json")
         self.assertStatus(response, status.HTTP_400_BAD_REQUEST)
-        self.assertIn("detail", response.data)
+        self.assertIn("non_field_errors", response.data)
 
     # ---------------------- FORGET / RESET PASSWORD ----------------------
 
-    @patch("django.core.mail.send_mail")
+    @patch("users.views.send_notification_email_task.delay")
     def test_forgot_password(self, mock_mail):
         url = reverse("forget-password")
         data = {"email": "client@gmail.com"}
         response = self.client.post(url, data, format="json")
         self.assertStatus(response, status.HTTP_200_OK)
-
-        # OTP stored?
-        from users import views as user_views
-        self.assertIn("client@gmail.com", user_views.otp_storage)
+        self.assertEqual(mock_mail.call_args.args[0], "client@gmail.com")
 
     def test_reset_password(self):
         # 1. Generate OTP
-        with patch("django.core.mail.send_mail"):
+        with patch("users.views.send_notification_email_task.delay") as mock_mail:
             self.client.post(reverse("forget-password"), {"email": "client@gmail.com"}, format="json")
 
-        # 2. Retrieve OTP
-        from users import views as user_views
-        otp = user_views.otp_storage.get("client@gmail.com")
-        self.assertIsNotNone(otp)
+        # 2. Retrieve OTP from the mailed message
+        otp = mock_mail.call_args.args[2].split("code is ")[1][:6]
 
         # 3. Reset password
         url = reverse("reset-password")
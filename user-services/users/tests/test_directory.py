@@ -0,0 +1,51 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from users.models import AdvocateProfile, ClientProfile
+from users.tasks import get_user_info, get_users_info
+
+User = get_user_model()
+
+
+class UserDirectoryTests(APITestCase):
+
+    def setUp(self):
+        self.client_user = User.objects.create_user(email="client@gmail.com", password="ClientPass123!", role="client")
+        ClientProfile.objects.create(user=self.client_user, full_name="Client Name")
+        self.advocate_user = User.objects.create_user(email="advocate@gmail.com", password="AdvocatePass123!", role="advocate")
+        AdvocateProfile.objects.create(user=self.advocate_user, full_name="Advocate Name", bar_council_id="BAR1")
+        self.bare_user = User.objects.create_user(email="bare@gmail.com", password="BarePass123!", role="client")
+
+    def test_bulk_task_uses_one_query(self):
+        ids = [self.client_user.id, self.advocate_user.id, self.bare_user.id, 999999]
+        with self.assertNumQueries(1):
+            users = {u["id"]: u for u in get_users_info(ids)}
+
+        self.assertEqual(set(users), set(ids[:3]))
+        self.assertEqual(users[self.client_user.id]["display_name"], "Client Name")
+        self.assertEqual(users[self.advocate_user.id]["display_name"], "Advocate Name")
+        self.assertEqual(users[self.advocate_user.id]["role"], "advocate")
+        self.assertEqual(users[self.bare_user.id]["display_name"], "bare@gmail.com")
+
+    @override_settings(USER_DIRECTORY_MAX_IDS=2)
+    def test_bulk_task_rejects_oversized_requests(self):
+        with self.assertRaises(ValueError):
+            get_users_info([self.client_user.id, self.advocate_user.id, self.bare_user.id])
+
+    def test_single_task(self):
+        self.assertEqual(get_user_info(self.client_user.id)["email"], "client@gmail.com")
+        self.assertIsNone(get_user_info(999999))
+
+    def test_directory_endpoint(self):
+        self.client.force_authenticate(self.client_user)
+        response = self.client.post(reverse("user-directory"), {"ids": [self.advocate_user.id]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["users"][0]["display_name"], "Advocate Name")
+
+    def test_directory_endpoint_rejects_non_list(self):
+        self.client.force_authenticate(self.client_user)
+        response = self.client.post(reverse("user-directory"), {"ids": "1,2"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
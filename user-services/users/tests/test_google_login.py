@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import rsa
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from google.auth import crypt, jwt
+from rest_framework import status
+
+from users.google_auth import GoogleTokenVerifier
+from users.tests.base import AuditedAPITestCase
+
+User = get_user_model()
+AUDIENCE = "test-client.apps.googleusercontent.com"
+
+
+class StubCertServer:
+    """Serves Google-style {kid: PEM} certs on localhost and counts fetches."""
+
+    def __init__(self, max_age=3600):
+        self.certs = {}
+        self.max_age = max_age
+        self.hits = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.hits += 1
+                body = json.dumps(stub.certs).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", f"public, max-age={stub.max_age}, must-revalidate")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/oauth2/v1/certs"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def new_key(kid):
+    public, private = rsa.newkeys(1024)
+    signer = crypt.RSASigner.from_string(private.save_pkcs1().decode(), key_id=kid)
+    return signer, public.save_pkcs1().decode()
+
+
+def google_token(signer, email="person@gmail.com", audience=AUDIENCE, issuer="https://accounts.google.com"):
+    now = int(time.time())
+    payload = {"iss": issuer, "aud": audience, "sub": "123", "email": email, "name": "Person", "iat": now, "exp": now + 600}
+    return jwt.encode(signer, payload).decode()
+
+
+class GoogleTokenVerifierTests(AuditedAPITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.signer, cls.public_pem = new_key("key-1")
+
+    def setUp(self):
+        self.stub = StubCertServer()
+        self.stub.certs = {"key-1": self.public_pem}
+        self.verifier = GoogleTokenVerifier(certs_url=self.stub.url, audience=AUDIENCE, refresh_margin=60)
+
+    def tearDown(self):
+        self.verifier.session.close()
+        self.stub.stop()
+
+    def test_certs_are_fetched_once_for_many_logins(self):
+        for _ in range(20):
+            claims = self.verifier.verify(google_token(self.signer))
+        self.assertEqual(claims["email"], "person@gmail.com")
+        self.assertEqual(self.stub.hits, 1)
+        self.assertGreater(self.verifier.stats()["expires_in"], 3500)
+
+    def test_rejects_wrong_audience_issuer_and_signature(self):
+        other_signer, _ = new_key("key-1")
+        for token in (
+            google_token(self.signer, audience="someone-else"),
+            google_token(self.signer, issuer="https://evil.example.com"),
+            google_token(other_signer),
+        ):
+            with self.assertRaises(ValueError):
+                self.verifier.verify(token)
+
+    def test_unknown_key_id_forces_a_single_refresh(self):
+        self.verifier.verify(google_token(self.signer))
+        rotated_signer, rotated_pem = new_key("key-2")
+        self.stub.certs = {"key-1": self.public_pem, "key-2": rotated_pem}
+
+        self.verifier._fetched_at -= 120
+        self.assertEqual(self.verifier.verify(google_token(rotated_signer))["email"], "person@gmail.com")
+        self.assertEqual(self.stub.hits, 2)
+
+        # Unknown ids right after a refresh are rejected without another fetch.
+        stray_signer, _ = new_key("key-3")
+        with self.assertRaises(ValueError):
+            self.verifier.verify(google_token(stray_signer))
+        self.assertEqual(self.stub.hits, 2)
+
+    def test_near_expiry_refreshes_in_background(self):
+        self.stub.max_age = 30
+        self.verifier.verify(google_token(self.signer))
+        self.verifier.verify(google_token(self.signer))
+        deadline = time.monotonic() + 5
+        while self.stub.hits < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.stub.hits, 2)
+
+    def test_google_login_view_uses_verifier(self):
+        with patch("users.views.google_verifier", self.verifier), patch("users.views.send_welcome_email_task.delay"):
+            response = self.client.post(reverse("google-login"), {"token": google_token(self.signer)}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(User.objects.filter(email="person@gmail.com", role="client").exists())
+
+            response = self.client.post(reverse("google-login"), {"token": "not-a-token"}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,29 @@
+import os
+
+from django.test import SimpleTestCase
+
+from users.hashing import HashPoolSaturated, PasswordHashPool
+
+
+class PasswordHashPoolTests(SimpleTestCase):
+
+    def setUp(self):
+        self.pool = PasswordHashPool(workers=1, max_pending=1, timeout=30)
+        self.addCleanup(lambda: self.pool._executor and self.pool._executor.shutdown())
+
+    def test_killed_worker_is_replaced(self):
+        with self.assertRaises(HashPoolSaturated):
+            self.pool.run(os._exit, 1)
+        self.assertEqual(self.pool.run(abs, -3), 3)
+        self.assertEqual(self.pool.stats()["pending"], 0)
+
+    def test_submit_to_broken_pool_releases_its_slot(self):
+        executor = self.pool._get_executor()
+        # break the pool behind the hash pool's back, as an OOM kill between calls would
+        with self.assertRaises(Exception):
+            executor.submit(os._exit, 1).result()
+
+        with self.assertRaises(HashPoolSaturated):
+            self.pool.run(abs, -3)
+        self.assertEqual(self.pool.stats()["pending"], 0)
+        self.assertEqual(self.pool.run(abs, -3), 3)
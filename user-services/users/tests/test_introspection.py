@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from users.introspection import introspect_tokens, revoked_jtis, user_status
+from users.tasks import introspect_tokens_task
+from users.tests.base import AuditedAPITestCase
+
+User = get_user_model()
+
+
+def access_token(user, lifetime=None):
+    token = RefreshToken.for_user(user).access_token
+    if lifetime is not None:
+        token.set_exp(lifetime=lifetime)
+    return str(token)
+
+
+class TokenIntrospectionTests(AuditedAPITestCase):
+
+    def setUp(self):
+        revoked_jtis.clear()
+        user_status.clear()
+        self.client_user = User.objects.create_user(email="client@gmail.com", password="ClientPass123!", role="client")
+        self.advocate = User.objects.create_user(email="advocate@gmail.com", password="AdvocatePass123!", role="advocate")
+        self.url = reverse("validate-token")
+
+    def test_single_token(self):
+        token = access_token(self.advocate)
+        response = self.client.post(self.url, {"token": token}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+        self.assertTrue(data["active"])
+        self.assertEqual((data["user_id"], data["role"]), (self.advocate.id, "advocate"))
+        self.assertEqual(data["exp"], AccessToken(token)["exp"])
+
+    def test_batch_is_ordered_and_costs_one_query(self):
+        tokens = [access_token(self.client_user), "garbage", access_token(self.advocate),
+                  access_token(self.client_user, lifetime=timedelta(seconds=-1))]
+        revoked_jtis.ensure_fresh()
+        with self.assertNumQueries(1):
+            results = introspect_tokens(tokens)
+        self.assertEqual([r["active"] for r in results], [True, False, True, False])
+        self.assertEqual(results[0]["role"], "client")
+
+        with self.assertNumQueries(0):
+            introspect_tokens(tokens)
+
+        response = self.client.post(self.url, {"tokens": tokens}, format="json")
+        self.assertEqual([r["active"] for r in response.data["data"]["results"]], [True, False, True, False])
+
+    def test_logout_revokes_token(self):
+        token = access_token(self.client_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(self.client.post(reverse("logout")).status_code, status.HTTP_200_OK)
+
+        self.assertFalse(introspect_tokens([token])[0]["active"])
+        # The revoked token no longer authenticates against user-service itself.
+        self.assertEqual(self.client.post(reverse("logout")).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Other workers learn about it from the table on their next sync.
+        revoked_jtis.clear()
+        self.assertFalse(introspect_tokens([token])[0]["active"])
+
+    def test_deactivated_user_is_inactive_after_cache_expiry(self):
+        token = access_token(self.client_user)
+        self.assertTrue(introspect_tokens([token])[0]["active"])
+        User.objects.filter(pk=self.client_user.pk).update(is_active=False)
+        user_status.clear()
+        self.assertFalse(introspect_tokens([token])[0]["active"])
+
+    def test_rejects_bad_payloads(self):
+        self.assertEqual(self.client.post(self.url, {}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(self.url, {"tokens": "abc"}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(TOKEN_INTROSPECTION_MAX_TOKENS=2):
+            response = self.client.post(self.url, {"tokens": ["a", "b", "c"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_task_rejects_oversized_batches(self):
+        tokens = [access_token(self.client_user) for _ in range(3)]
+        with self.settings(TOKEN_INTROSPECTION_MAX_TOKENS=2):
+            with self.assertRaises(ValueError):
+                introspect_tokens_task(tokens)
+            self.assertEqual(len(introspect_tokens_task(tokens[:2])), 2)
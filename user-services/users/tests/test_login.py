@@ -0,0 +1,62 @@
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework import status
+from django.contrib.auth import get_user_model
+
+from users.hashing import password_hash_pool
+from users.throttles import login_failures, mfa_failures
+from users.tests.base import AuditedAPITestCase
+
+User = get_user_model()
+
+
+class LoginHashPoolTests(AuditedAPITestCase):
+
+    def setUp(self):
+        login_failures.clear()
+        mfa_failures.clear()
+        self.user = User.objects.create_user(email="client@gmail.com", password="ClientPass123!", role="client")
+        self.url = reverse("login")
+
+    def login(self, password):
+        return self.client.post(self.url, {"email": "client@gmail.com", "password": password}, format="json")
+
+    def test_login_success(self):
+        response = self.login("ClientPass123!")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("tokens", response.data["data"])
+
+    def test_wrong_password_and_unknown_email(self):
+        self.assertEqual(self.login("WrongPass12!").status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {"email": "nobody@gmail.com", "password": "x"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_inactive_user_cannot_login(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.login("ClientPass123!").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_repeated_failures_are_throttled_without_hashing(self):
+        for _ in range(login_failures.limit):
+            self.assertEqual(self.login("WrongPass12!").status_code, status.HTTP_400_BAD_REQUEST)
+
+        with patch.object(password_hash_pool, "run", wraps=password_hash_pool.run) as run:
+            response = self.login("ClientPass123!")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        run.assert_not_called()
+
+    def test_saturated_pool_fails_fast(self):
+        with patch.object(password_hash_pool, "max_pending", 0):
+            response = self.login("ClientPass123!")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("Retry-After", response)
+
+    @patch("users.views.send_welcome_email_task.delay")
+    def test_register_hashes_in_pool(self, mock_welcome):
+        with patch.object(password_hash_pool, "run", wraps=password_hash_pool.run) as run:
+            response = self.client.post(reverse("user-register"), {
+                "email": "new@gmail.com", "password": "NewPass123!", "confirm_password": "NewPass123!",
+            }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        run.assert_called_once()
+        self.assertTrue(User.objects.get(email="new@gmail.com").check_password("NewPass123!"))
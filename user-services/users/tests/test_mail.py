@@ -0,0 +1,105 @@
+from unittest.mock import patch
+
+from celery.exceptions import Retry
+from django.test import SimpleTestCase
+
+from users.mail import MailDispatcher, build_welcome_message
+from users.tasks import send_notification_email_task, send_welcome_emails_task
+
+
+class FakeConnection:
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.sent = []
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        recipient = messages[0].to[0]
+        if self.failures.get(recipient, 0):
+            self.failures[recipient] -= 1
+            raise OSError("connection reset")
+        self.sent.extend(messages)
+        return len(messages)
+
+
+class MailDispatcherTests(SimpleTestCase):
+
+    def make_dispatcher(self, failures=None, max_retries=3):
+        self.connections = []
+        failures = failures if failures is not None else {}
+
+        def factory(fail_silently=False):
+            connection = FakeConnection(failures)
+            self.connections.append(connection)
+            return connection
+        return MailDispatcher(batch_size=10, idle_timeout=60, max_retries=max_retries, connection_factory=factory)
+
+    def messages(self, count):
+        return [build_welcome_message(f"user{i}@example.com", f"User {i}") for i in range(count)]
+
+    def test_batches_and_calls_share_one_connection(self):
+        dispatcher = self.make_dispatcher()
+        dispatcher.deliver(self.messages(25))
+        dispatcher.deliver(self.messages(1))
+
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(len(self.connections[0].sent), 26)
+        stats = dispatcher.stats()
+        self.assertEqual((stats["sent"], stats["failed"]), (26, 0))
+        self.assertEqual(stats["batches"], 4)
+
+    def test_idle_connection_is_reopened(self):
+        dispatcher = self.make_dispatcher()
+        dispatcher.deliver(self.messages(1))
+        dispatcher._last_used -= 61
+        dispatcher.deliver(self.messages(1))
+        self.assertEqual([len(c.sent) for c in self.connections], [1, 1])
+
+    def test_failed_messages_are_retried_individually(self):
+        dispatcher = self.make_dispatcher(failures={"user3@example.com": 2})
+        dispatcher.deliver(self.messages(5))
+
+        sent = [m.to[0] for c in self.connections for m in c.sent]
+        self.assertEqual(sorted(sent), sorted(f"user{i}@example.com" for i in range(5)))
+        self.assertEqual(dispatcher.stats()["retried"], 2)
+
+    def test_message_is_dropped_after_max_retries(self):
+        dispatcher = self.make_dispatcher(failures={"user0@example.com": 10}, max_retries=1)
+        dispatcher.deliver(self.messages(2))
+
+        stats = dispatcher.stats()
+        self.assertEqual((stats["sent"], stats["failed"]), (1, 1))
+
+    def test_deliver_sends_before_returning_and_reports_failures(self):
+        dispatcher = self.make_dispatcher(failures={"user1@example.com": 10}, max_retries=1)
+        failed = dispatcher.deliver(self.messages(15))
+
+        self.assertEqual([m.to[0] for m in failed], ["user1@example.com"])
+        self.assertEqual(sum(len(c.sent) for c in self.connections), 14)
+
+
+class MailTaskTests(SimpleTestCase):
+
+    def test_tasks_retry_instead_of_dropping_failed_mail(self):
+        with patch("users.tasks.mail_dispatcher.deliver", side_effect=lambda messages: messages[:1]):
+            with self.assertRaises(Retry):
+                send_notification_email_task.apply(args=["a@example.com", "OTP", "123456"], throw=True)
+
+        def fail_b(messages):
+            return [m for m in messages if m.to[0] == "b@example.com"]
+        with patch("users.tasks.mail_dispatcher.deliver", side_effect=fail_b), \
+                patch.object(send_welcome_emails_task, "retry", side_effect=Retry) as retry:
+            with self.assertRaises(Retry):
+                send_welcome_emails_task.run([("a@example.com", "A"), ("b@example.com", "B")])
+        self.assertEqual(retry.call_args.kwargs["args"], [[("b@example.com", "B")]])
+
+    def test_delivered_mail_completes_the_task(self):
+        with patch("users.tasks.mail_dispatcher.deliver", return_value=[]) as deliver:
+            send_notification_email_task.run("a@example.com", "OTP", "123456")
+        self.assertEqual(deliver.call_args.args[0][0].to, ["a@example.com"])
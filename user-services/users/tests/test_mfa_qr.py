@@ -0,0 +1,87 @@
+from unittest.mock import patch
+import pyotp
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from users import utils
+from users.throttles import mfa_failures
+from users.tests.base import LOCMEM_CACHES
+
+User = get_user_model()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TOTPQRCodeTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        mfa_failures.clear()
+        self.user = User.objects.create_user(email="advocate@gmail.com", password="AdvocatePass123!", role="advocate")
+        self.client.force_authenticate(self.user)
+        response = self.client.post(reverse("enable-mfa"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["data"]["qr_url"].endswith(reverse("mfa-qr")))
+        self.user.refresh_from_db()
+
+    def test_png_and_svg(self):
+        png = self.client.get(reverse("mfa-qr"))
+        self.assertEqual(png.status_code, status.HTTP_200_OK)
+        self.assertEqual(png["Content-Type"], "image/png")
+        self.assertTrue(png.content.startswith(b"\x89PNG"))
+
+        svg = self.client.get(reverse("mfa-qr"), {"type": "svg"})
+        self.assertEqual(svg["Content-Type"], "image/svg+xml")
+        self.assertIn(b"<svg", svg.content)
+
+    def test_render_is_memoized_and_etag_returns_304(self):
+        with patch("users.utils._render_qr", wraps=utils._render_qr) as render:
+            first = self.client.get(reverse("mfa-qr"))
+            second = self.client.get(reverse("mfa-qr"))
+            not_modified = self.client.get(reverse("mfa-qr"), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified.content, b"")
+
+    def test_new_secret_changes_etag(self):
+        etag = self.client.get(reverse("mfa-qr"))["ETag"]
+        self.user.mfa_secret = utils.generate_totp_secret()
+        self.user.save()
+        response = self.client.get(reverse("mfa-qr"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_unknown_type(self):
+        self.assertEqual(self.client.get(reverse("mfa-qr"), {"type": "gif"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def confirm(self, otp):
+        return self.client.post(reverse("confirm-mfa"), {"otp": otp}, format="json")
+
+    def test_enrollment_is_pending_until_confirmed(self):
+        self.assertFalse(self.user.mfa_enabled)
+        self.assertEqual(self.confirm("000000").status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.mfa_enabled)
+
+        response = self.confirm(pyotp.TOTP(self.user.mfa_secret).now())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.mfa_enabled)
+
+    def test_qr_is_gone_once_mfa_is_enabled(self):
+        self.client.get(reverse("mfa-qr"))
+        self.client.get(reverse("mfa-qr"), {"type": "svg"})
+        self.confirm(pyotp.TOTP(self.user.mfa_secret).now())
+
+        self.assertEqual(self.client.get(reverse("mfa-qr")).status_code, status.HTTP_404_NOT_FOUND)
+        for fmt in utils.QR_CONTENT_TYPES:
+            self.assertIsNone(cache.get(f"totp_qr:{self.user.id}:{utils.totp_secret_version(self.user)}:{fmt}"))
+
+    def test_no_qr_without_enrollment(self):
+        other = User.objects.create_user(email="other@gmail.com", password="OtherPass123!", role="advocate")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(reverse("mfa-qr")).status_code, status.HTTP_404_NOT_FOUND)
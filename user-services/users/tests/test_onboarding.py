@@ -0,0 +1,80 @@
+from unittest.mock import patch
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from users.models import AdvocateProfile
+
+User = get_user_model()
+
+
+def advocate_row(n, **overrides):
+    row = {
+        "email": f"advocate{n}@gmail.com",
+        "password": "AdvocatePass123!",
+        "confirm_password": "AdvocatePass123!",
+        "full_name": f"Advocate {n}",
+        "bar_council_id": f"BAR{n}",
+    }
+    row.update(overrides)
+    return row
+
+
+@patch("users.tasks.send_welcome_emails_task.delay")
+class BulkAdvocateOnboardingTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(email="admin@gmail.com", password="AdminPass123!")
+        existing = User.objects.create_user(email="taken@gmail.com", password="TakenPass123!", role="advocate")
+        AdvocateProfile.objects.create(user=existing, full_name="Taken", bar_council_id="BARTAKEN")
+        self.url = reverse("advocate-register") + "?mode=bulk"
+
+    def post(self, rows):
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, {"advocates": rows}, format="json")
+
+    def test_bulk_creates_users_and_profiles(self, mock_mail):
+        response = self.post([advocate_row(i) for i in range(5)])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["data"]["created"]), 5)
+        self.assertEqual(AdvocateProfile.objects.filter(bar_council_id__startswith="BAR").count(), 6)
+
+        user = User.objects.get(email="advocate3@gmail.com")
+        self.assertEqual(user.role, "advocate")
+        self.assertTrue(user.check_password("AdvocatePass123!"))
+        self.assertEqual(user.advocate_profile.full_name, "Advocate 3")
+
+        mock_mail.assert_called_once()
+        self.assertEqual(len(mock_mail.call_args.args[0]), 5)
+
+    @override_settings(PASSWORD_HASH_WORKERS=0)
+    def test_bulk_reports_errors_per_row(self, mock_mail):
+        rows = [
+            advocate_row(1),
+            advocate_row(2, email="taken@gmail.com"),
+            advocate_row(3, bar_council_id="BARTAKEN"),
+            advocate_row(4, email="advocate1@gmail.com"),
+            advocate_row(5, confirm_password="Mismatch123!"),
+            advocate_row(6, bar_council_id="BAR-6"),
+        ]
+        response = self.post(rows)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([c["row"] for c in response.data["data"]["created"]], [0])
+        errors = {e["row"]: e["errors"] for e in response.data["data"]["errors"]}
+        self.assertEqual(sorted(errors), [1, 2, 3, 4, 5])
+        self.assertIn("email", errors[1])
+        self.assertIn("bar_council_id", errors[2])
+        self.assertIn("email", errors[3])
+
+    @override_settings(PASSWORD_HASH_WORKERS=0)
+    def test_bulk_with_no_valid_rows(self, mock_mail):
+        response = self.post([advocate_row(1, email="taken@gmail.com")])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_mail.assert_not_called()
+
+    def test_bulk_requires_admin(self, mock_mail):
+        response = self.client.post(self.url, {"advocates": [advocate_row(1)]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,89 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from users.models import AdvocateProfile, ClientProfile, OutboxEvent
+from users.onboarding import bulk_register_advocates
+from users.outbox import relay_outbox
+from users.tasks import export_user_directory
+
+User = get_user_model()
+
+
+class OutboxRecordingTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="client@gmail.com", password="ClientPass123!", role="client")
+        ClientProfile.objects.create(user=self.user, full_name="Client Name")
+
+    def events(self, user_id=None):
+        return list(OutboxEvent.objects.filter(aggregate_id=user_id or self.user.id).values_list("topic", "payload"))
+
+    def test_user_and_profile_saves_record_the_current_directory_record(self):
+        topic, payload = self.events()[-1]
+        self.assertEqual(topic, "user.upserted")
+        self.assertEqual(payload, {
+            "id": self.user.id, "email": "client@gmail.com", "role": "client",
+            "display_name": "Client Name", "is_active": True,
+        })
+
+    def test_saves_of_unrelated_fields_record_nothing(self):
+        before = OutboxEvent.objects.count()
+        self.user.set_password("Another123!")
+        self.user.save(update_fields=["password"])
+        self.user.client_profile.phone = "123"
+        self.user.client_profile.save(update_fields=["phone"])
+        self.assertEqual(OutboxEvent.objects.count(), before)
+
+    def test_delete_records_a_tombstone(self):
+        user_id = self.user.id
+        self.user.delete()
+        topic, payload = self.events(user_id)[-1]
+        self.assertEqual(topic, "user.deleted")
+        self.assertFalse(payload["is_active"])
+
+    @patch("users.tasks.send_welcome_emails_task.delay")
+    def test_bulk_onboarding_records_one_event_per_advocate(self, mock_mail):
+        rows = [{
+            "email": f"advocate{i}@gmail.com", "password": "AdvocatePass123!", "confirm_password": "AdvocatePass123!",
+            "full_name": f"Advocate {i}", "bar_council_id": f"BAR{i}",
+        } for i in range(3)]
+        created, errors = bulk_register_advocates(rows)
+        ids = {row["user_id"] for row in created}
+        events = OutboxEvent.objects.filter(aggregate_id__in=ids)
+        self.assertEqual(events.count(), 3)
+        self.assertEqual({e.payload["display_name"] for e in events}, {"Advocate 0", "Advocate 1", "Advocate 2"})
+
+
+class OutboxRelayTests(TestCase):
+
+    def setUp(self):
+        for i in range(5):
+            User.objects.create_user(email=f"user{i}@gmail.com", password="UserPass123!", role="client")
+
+    @patch("users.outbox.publish_batch")
+    def test_relay_publishes_in_batches_and_marks_events(self, publish_batch):
+        self.assertEqual(relay_outbox(batch_size=2, max_batches=10), 5)
+        self.assertEqual([len(call.args[0]) for call in publish_batch.call_args_list], [2, 2, 1])
+        self.assertFalse(OutboxEvent.objects.filter(published_at__isnull=True).exists())
+        self.assertEqual(relay_outbox(batch_size=2, max_batches=10), 0)
+
+    @patch("users.outbox.publish_batch", side_effect=ConnectionError("broker down"))
+    def test_failed_publish_leaves_events_pending(self, publish_batch):
+        with self.assertRaises(ConnectionError):
+            relay_outbox(batch_size=10)
+        self.assertEqual(OutboxEvent.objects.filter(published_at__isnull=True).count(), 5)
+
+
+class DirectoryExportTests(TestCase):
+
+    def test_export_pages_by_id(self):
+        users = [User.objects.create_user(email=f"adv{i}@gmail.com", password="UserPass123!", role="advocate") for i in range(3)]
+        AdvocateProfile.objects.create(user=users[0], full_name="First Advocate", bar_council_id="BAR0")
+
+        first = export_user_directory(0, 2)
+        self.assertEqual([row["id"] for row in first], [users[0].id, users[1].id])
+        self.assertEqual(first[0]["display_name"], "First Advocate")
+        self.assertEqual(first[0]["version"], 0)
+        self.assertEqual([row["id"] for row in export_user_directory(first[-1]["id"], 2)], [users[2].id])
@@ -0,0 +1,102 @@
+import datetime
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from users.introspection import introspect_tokens, revoked_jtis, user_status
+from users.models import OTP, RevokedToken
+from users.otp import issue_otp, verify_otp, purge_expired_otps
+from users.throttles import login_failures
+from users.tokens import get_tokens_for_user
+
+User = get_user_model()
+
+
+class PasswordResetFlowTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="client@gmail.com", password="ClientPass123!", role="client")
+
+    @patch("users.views.send_notification_email_task.delay")
+    def test_forget_then_reset_password(self, mock_mail):
+        response = self.client.post(reverse("forget-password"), {"email": "client@gmail.com"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        code = mock_mail.call_args.args[2].split("code is ")[1][:6]
+        otp = OTP.objects.get(user=self.user)
+        self.assertNotEqual(otp.code_hash, code)
+
+        response = self.client.post(reverse("reset-password"), {
+            "email": "client@gmail.com", "otp": code, "new_password": "ResetPass123",
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("ResetPass123"))
+        self.assertFalse(OTP.objects.active().exists())
+
+    @patch("users.introspection.publish")
+    def test_reset_revokes_sessions_issued_before_it(self, mock_publish):
+        revoked_jtis.clear()
+        user_status.clear()
+        tokens = get_tokens_for_user(self.user)
+        version = self.user.claims_version
+        login_failures.failure("client@gmail.com")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("reset-password"), {
+                "email": "client@gmail.com", "otp": issue_otp(self.user), "new_password": "ResetPass123",
+            }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertFalse(introspect_tokens([tokens["access"]])[0]["active"])
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(self.client.post(reverse("logout")).status_code, status.HTTP_401_UNAUTHORIZED)
+        # the other services hear about both tokens in one delta
+        self.assertEqual(len(mock_publish.call_args.args[0]["revoked"]), 2)
+        self.assertEqual(RevokedToken.objects.filter(user=self.user).count(), 2)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.claims_version, version + 1)
+        self.assertNotIn("client@gmail.com", login_failures._failures)
+
+    def test_reset_with_wrong_code(self):
+        issue_otp(self.user)
+        response = self.client.post(reverse("reset-password"), {
+            "email": "client@gmail.com", "otp": "not-it", "new_password": "ResetPass123",
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OTPLifecycleTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="client@gmail.com", password="ClientPass123!", role="client")
+
+    def test_new_code_invalidates_previous(self):
+        issue_otp(self.user)
+        code = issue_otp(self.user)
+        self.assertEqual(OTP.objects.active().count(), 1)
+        self.assertTrue(verify_otp(self.user, code))
+        self.assertFalse(verify_otp(self.user, code))
+
+    @override_settings(OTP_MAX_ATTEMPTS=3)
+    def test_code_is_burned_after_max_attempts(self):
+        code = issue_otp(self.user)
+        wrong = "000000" if code != "000000" else "111111"
+        for _ in range(3):
+            self.assertFalse(verify_otp(self.user, wrong))
+        self.assertFalse(verify_otp(self.user, code))
+
+    def test_expired_code_is_rejected_and_purged(self):
+        code = issue_otp(self.user)
+        issue_otp(self.user)
+        OTP.objects.update(created_at=timezone.now() - datetime.timedelta(minutes=30))
+        self.assertFalse(verify_otp(self.user, code))
+
+        self.assertEqual(purge_expired_otps(batch_size=1), 2)
+        self.assertFalse(OTP.objects.exists())
@@ -0,0 +1,94 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from users.images import generate_profile_thumbnail
+from users.models import AdvocateProfile, ClientProfile
+
+User = get_user_model()
+
+
+def jpeg_upload(name="photo.jpg", size=(1200, 800)):
+    image = Image.new("RGB", size, "red")
+    exif = Image.Exif()
+    exif[0x010F] = "CameraMaker"
+    buffered = BytesIO()
+    image.save(buffered, format="JPEG", exif=exif)
+    return SimpleUploadedFile(name, buffered.getvalue(), content_type="image/jpeg")
+
+
+class ProfileThumbnailTests(APITestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        self.user = User.objects.create_user(email="client@gmail.com", password="ClientPass123!", role="client")
+        self.profile = ClientProfile.objects.create(user=self.user, full_name="Client")
+        self.client.force_authenticate(self.user)
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    @patch("users.tasks.process_profile_image_task.delay")
+    def test_upload_queues_thumbnail_and_task_builds_it(self, mock_task):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(reverse("client-profile-update"), {"profile_image": jpeg_upload()}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_task.assert_called_once()
+
+        kind, profile_id, image_name = mock_task.call_args.args
+        self.profile.refresh_from_db()
+        self.assertFalse(self.profile.profile_thumbnail)
+
+        name = generate_profile_thumbnail(kind, profile_id, image_name)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.profile_thumbnail.name, name)
+        with Image.open(self.profile.profile_thumbnail.path) as thumb:
+            self.assertEqual(thumb.format, "WEBP")
+            self.assertEqual(thumb.size, (256, 256))
+            self.assertFalse(thumb.getexif())
+
+    @patch("users.tasks.process_profile_image_task.delay")
+    def test_new_image_drops_the_old_thumbnail(self, mock_task):
+        advocate = User.objects.create_user(email="advocate@gmail.com", password="AdvocatePass123!", role="advocate")
+        advocate_profile = AdvocateProfile.objects.create(user=advocate, full_name="Advocate", bar_council_id="BC-1")
+        for user, profile, url in ((self.user, self.profile, "client-profile-update"),
+                                   (advocate, advocate_profile, "advocate-profile-update")):
+            profile.profile_image = jpeg_upload("first.jpg")
+            profile.save()
+            old = generate_profile_thumbnail(user.role, profile.id, profile.profile_image.name)
+            storage = profile.profile_thumbnail.storage
+            self.assertTrue(storage.exists(old))
+
+            # a fresh user, as a request would load, rather than one caching the profile from before the task
+            self.client.force_authenticate(User.objects.get(pk=user.pk))
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.put(reverse(url), {"profile_image": jpeg_upload("second.jpg")}, format="multipart")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            # search and detail fall back to the new image until its thumbnail is built
+            profile.refresh_from_db()
+            self.assertFalse(profile.profile_thumbnail)
+            self.assertFalse(storage.exists(old))
+            self.assertEqual(mock_task.call_args.args, (user.role, profile.id, profile.profile_image.name))
+
+    def test_stale_task_does_not_overwrite_newer_upload(self):
+        self.profile.profile_image = jpeg_upload("first.jpg")
+        self.profile.save()
+        stale_name = self.profile.profile_image.name
+        self.profile.profile_image = jpeg_upload("second.jpg")
+        self.profile.save()
+
+        self.assertIsNone(generate_profile_thumbnail("client", self.profile.id, stale_name))
+        self.profile.refresh_from_db()
+        self.assertFalse(self.profile.profile_thumbnail)
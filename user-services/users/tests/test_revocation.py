@@ -0,0 +1,64 @@
+import datetime
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.introspection import revoke_token, revoked_jtis
+from users.models import RevokedToken
+from users.revocation import BloomFilter, build_snapshot
+from users.tasks import publish_revocation_snapshot_task
+
+User = get_user_model()
+
+
+class BloomFilterTests(TestCase):
+
+    def test_round_trip_has_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter.for_capacity(2000, 1e-4)
+        members = [f"jti-{i}" for i in range(2000)]
+        for jti in members:
+            bloom.add(jti)
+
+        restored = BloomFilter.from_dict(bloom.to_dict())
+        self.assertTrue(all(jti in restored for jti in members))
+        false_positives = sum(f"other-{i}" in restored for i in range(20000))
+        self.assertLess(false_positives, 10)
+
+    def test_rejects_unknown_hash_layout(self):
+        data = BloomFilter.for_capacity(10, 0.01).to_dict()
+        data["hash"] = "md5"
+        with self.assertRaises(ValueError):
+            BloomFilter.from_dict(data)
+
+
+class RevocationPublishingTests(TestCase):
+
+    def setUp(self):
+        revoked_jtis.clear()
+        self.user = User.objects.create_user(email="client@gmail.com", password="ClientPass123!", role="client")
+
+    @patch("users.introspection.publish")
+    def test_revoking_publishes_exact_delta_after_commit(self, publish):
+        token = RefreshToken.for_user(self.user).access_token
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_token(token, user=self.user)
+        message = publish.call_args.args[0]
+        self.assertEqual(message["type"], "delta")
+        self.assertEqual(message["revoked"], [[token["jti"], token["exp"]]])
+
+    @patch("users.tasks.publish")
+    def test_snapshot_task_purges_expired_rows_and_fans_out_filter(self, publish):
+        now = timezone.now()
+        RevokedToken.objects.create(jti="live", expires_at=now + datetime.timedelta(hours=1))
+        RevokedToken.objects.create(jti="dead", expires_at=now - datetime.timedelta(seconds=1))
+
+        self.assertEqual(publish_revocation_snapshot_task(), {"purged": 1, "revoked": 1})
+        snapshot = publish.call_args.args[0]
+        self.assertEqual(snapshot["type"], "snapshot")
+        bloom = BloomFilter.from_dict(snapshot["bloom"])
+        self.assertIn("live", bloom)
+        self.assertNotIn("dead", bloom)
+        self.assertEqual(build_snapshot()["count"], 1)
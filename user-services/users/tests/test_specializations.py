@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.models import AdvocateProfile, Specialization
+from users.specializations import specialization_resolver, sync_specializations
+from users.tests.base import LOCMEM_CACHES
+
+User = get_user_model()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SpecializationSyncTests(APITestCase):
+
+    def setUp(self):
+        specialization_resolver.clear()
+        self.user = User.objects.create_user(email="advocate@gmail.com", password="AdvocatePass123!", role="advocate")
+        self.profile = AdvocateProfile.objects.create(user=self.user, full_name="Advocate", bar_council_id="BC-1")
+        self.through = AdvocateProfile.specializations.through
+
+    def names(self):
+        return set(self.profile.specializations.values_list("name", flat=True))
+
+    def test_resolver_creates_unknown_names_and_caches_ids(self):
+        Specialization.objects.create(name="Criminal")
+        ids = specialization_resolver.resolve(["Criminal", " Family ", "Criminal", ""])
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(set(Specialization.objects.values_list("name", flat=True)), {"Criminal", "Family"})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(specialization_resolver.resolve(["Family", "Criminal"]), ids[::-1])
+
+    def test_sync_applies_diff_and_keeps_unchanged_links(self):
+        sync_specializations(self.profile, ["Criminal", "Family"])
+        specialization_resolver.resolve(["Tax"])
+        kept = self.through.objects.get(advocateprofile=self.profile, specialization__name="Criminal").pk
+
+        # one read of the current links, one DELETE, one INSERT
+        with self.assertNumQueries(3):
+            sync_specializations(self.profile, ["Criminal", "Tax"])
+        self.assertEqual(self.names(), {"Criminal", "Tax"})
+        self.assertEqual(self.through.objects.get(advocateprofile=self.profile, specialization__name="Criminal").pk, kept)
+
+        with self.assertNumQueries(1):
+            sync_specializations(self.profile, ["Tax", "Criminal"])
+
+    def test_deleted_specialization_is_not_served_from_cache(self):
+        sync_specializations(self.profile, ["Criminal"])
+        Specialization.objects.filter(name="Criminal").get().delete()
+        sync_specializations(self.profile, ["Criminal"])
+        self.assertEqual(self.names(), {"Criminal"})
+
+    def test_profile_update_replaces_specializations(self):
+        sync_specializations(self.profile, ["Criminal", "Family"])
+        self.client.force_authenticate(self.user)
+        response = self.client.put(reverse("advocate-profile-update"), {"specializations": ["Family", "Tax"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.names(), {"Family", "Tax"})
+
+        response = self.client.put(reverse("advocate-profile-update"), {"full_name": "Renamed"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.names(), {"Family", "Tax"})
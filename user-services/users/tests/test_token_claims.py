@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.introspection import introspect_tokens, user_status
+from users.models import AdvocateProfile, ClientProfile
+from users.tokens import get_tokens_for_user
+from users.tests.base import AuditedAPITestCase
+
+User = get_user_model()
+
+
+class TokenClaimsTests(AuditedAPITestCase):
+
+    def setUp(self):
+        user_status.clear()
+        self.advocate = User.objects.create_user(email="advocate@gmail.com", password="AdvocatePass123!", role="advocate")
+        self.profile = AdvocateProfile.objects.create(user=self.advocate, full_name="Advocate", bar_council_id="BC-1")
+
+    def test_access_token_carries_identity_claims(self):
+        token = AccessToken(get_tokens_for_user(self.advocate)["access"])
+        self.assertEqual(token["email"], "advocate@gmail.com")
+        self.assertEqual(token["role"], "advocate")
+        self.assertEqual(token["profile_id"], self.profile.id)
+        self.assertFalse(token["mfa_enabled"])
+        self.assertFalse(token["mfa_verified"])
+        self.assertEqual(token["claims_version"], 1)
+
+    def test_login_issues_client_profile_claim(self):
+        client_user = User.objects.create_user(email="client@gmail.com", password="ClientPass123!", role="client")
+        profile = ClientProfile.objects.create(user=client_user, full_name="Client")
+        response = self.client.post(reverse("login"), {"email": "client@gmail.com", "password": "ClientPass123!"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        token = AccessToken(response.data["data"]["tokens"]["access"])
+        self.assertEqual((token["role"], token["profile_id"]), ("client", profile.id))
+
+    def test_profile_change_bumps_claims_version(self):
+        access = get_tokens_for_user(self.advocate)["access"]
+        self.assertFalse(introspect_tokens([access])[0]["stale_claims"])
+
+        self.client.force_authenticate(self.advocate)
+        response = self.client.put(reverse("advocate-profile-update"), {"full_name": "Renamed"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.advocate.refresh_from_db()
+        self.assertEqual(self.advocate.claims_version, 2)
+
+        user_status.clear()
+        self.assertTrue(introspect_tokens([access])[0]["stale_claims"])
+        self.assertEqual(AccessToken(get_tokens_for_user(self.advocate)["access"])["claims_version"], 2)
@@ -0,0 +1,44 @@
+# users/throttles.py
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from rest_framework.exceptions import Throttled
+
+
+class FailureThrottle:
+    """
+    In-process counter of recent failures per key (email, user id, ...).
+
+    Once a key has `limit` failures, each within `window` seconds of the
+    previous one, further attempts are refused with 429 before any hashing or
+    OTP check runs. A success clears the key.
+    """
+
+    def __init__(self, limit, window, maxsize=100000):
+        self.limit = limit
+        self.window = window
+        self._failures = TTLCache(maxsize=maxsize, ttl=window)
+        self._lock = threading.Lock()
+
+    def check(self, key):
+        with self._lock:
+            failures = self._failures.get(key, 0)
+        if failures >= self.limit:
+            raise Throttled(wait=self.window, detail="Too many failed attempts, try again later.")
+
+    def failure(self, key):
+        with self._lock:
+            self._failures[key] = self._failures.get(key, 0) + 1
+
+    def success(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._failures.clear()
+
+
+login_failures = FailureThrottle(limit=settings.LOGIN_FAILURE_LIMIT, window=settings.LOGIN_FAILURE_WINDOW)
+mfa_failures = FailureThrottle(limit=settings.LOGIN_FAILURE_LIMIT, window=settings.LOGIN_FAILURE_WINDOW)
@@ -0,0 +1,48 @@
+# users/tokens.py
+import datetime
+
+from django.db.models import F
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import AdvocateProfile, ClientProfile, IssuedToken, User
+
+PROFILE_MODELS = {"client": ClientProfile, "advocate": AdvocateProfile}
+
+
+def token_claims(user, mfa_verified=False):
+    """
+    Identity claims carried by every issued token, so other services can
+    build the caller without looking the user up. `claims_version` moves
+    whenever any of them changes (see bump_claims_version).
+    """
+    profile_model = PROFILE_MODELS.get(user.role)
+    profile_id = profile_model.objects.filter(user_id=user.pk).values_list("id", flat=True).first() if profile_model else None
+    return {
+        "email": user.email,
+        "role": user.role,
+        "profile_id": profile_id,
+        "mfa_enabled": user.mfa_enabled,
+        "mfa_verified": mfa_verified,
+        "claims_version": user.claims_version,
+    }
+
+
+def get_tokens_for_user(user, mfa_verified=False):
+    refresh = RefreshToken.for_user(user)
+    # Set on the refresh token so the derived access token inherits them.
+    for claim, value in token_claims(user, mfa_verified).items():
+        refresh[claim] = value
+    access = refresh.access_token
+    # Recorded so revoke_user_tokens can reach every session of the user
+    IssuedToken.objects.bulk_create([
+        IssuedToken(jti=token["jti"], user=user,
+                    expires_at=datetime.datetime.fromtimestamp(token["exp"], tz=datetime.timezone.utc))
+        for token in (access, refresh)
+    ])
+    return {"access": str(access), "refresh": str(refresh)}
+
+
+def bump_claims_version(user):
+    """Marks tokens issued so far as carrying outdated claims (role, email, profile or MFA changed)."""
+    User.objects.filter(pk=user.pk).update(claims_version=F("claims_version") + 1)
+    user.refresh_from_db(fields=["claims_version"])
@@ -5,9 +5,16 @@ from users.views import (
     LoginView,
     GoogleLoginView,
     EnableMFAView,
+    ConfirmMFAView,
     VerifyMFAView,
     ClientProfileUpdateView,
-    AdvocateProfileUpdateView
+    AdvocateProfileUpdateView,
+    UserDirectoryView,
+    ForgetPasswordView,
+    ResetPasswordView,
+    TOTPQRCodeView,
+    TokenIntrospectionView,
+    LogoutView,
 )
 
 urlpatterns = [
@@ -15,8 +22,15 @@ urlpatterns = [
     path('register/advocate/', AdvocateRegisterView.as_view(), name='advocate-register'),
     path('login/', LoginView.as_view(), name='login'),
     path('login/google/', GoogleLoginView.as_view(), name='google-login'),
+    path('logout/', LogoutView.as_view(), name='logout'),
     path('mfa/enable/', EnableMFAView.as_view(), name='enable-mfa'),
+    path('mfa/confirm/', ConfirmMFAView.as_view(), name='confirm-mfa'),
     path('mfa/verify/', VerifyMFAView.as_view(), name='verify-mfa'),
+    path('mfa/qr/', TOTPQRCodeView.as_view(), name='mfa-qr'),
+    path('password/forget/', ForgetPasswordView.as_view(), name='forget-password'),
+    path('password/reset/', ResetPasswordView.as_view(), name='reset-password'),
     path('profile/client/', ClientProfileUpdateView.as_view(), name='client-profile-update'),
     path('profile/advocate/', AdvocateProfileUpdateView.as_view(), name='advocate-profile-update'),
+    path('directory/', UserDirectoryView.as_view(), name='user-directory'),
+    path('auth/validate-token/', TokenIntrospectionView.as_view(), name='validate-token'),
 ]
@@ -1,7 +1,15 @@
 import pyotp
 import qrcode
+import qrcode.image.svg
 from io import BytesIO
 import base64
+import hashlib
+import hmac
+from django.conf import settings
+from django.core.cache import cache
+
+QR_CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
 
 def generate_totp_secret():
     return pyotp.random_base32()
@@ -13,13 +21,38 @@ def generate_totp_uri(user):
         issuer_name="CaseBridge"
     )
 
-def generate_totp_qr(user):
-    uri = generate_totp_uri(user)
+def totp_secret_version(user):
+    """Opaque id for the user's current TOTP secret; changes whenever the secret does."""
+    digest = hmac.new(settings.SECRET_KEY.encode(), f"{user.email}:{user.mfa_secret}".encode(), hashlib.sha256)
+    return digest.hexdigest()[:20]
+
+def _render_qr(uri, fmt):
     qr = qrcode.QRCode(version=1, box_size=10, border=5)
     qr.add_data(uri)
     qr.make(fit=True)
-    img = qr.make_image(fill_color='black', back_color='white')  
     buffered = BytesIO()
-    img.save(buffered, format="PNG")
-    img_str = base64.b64encode(buffered.getvalue()).decode()
-    return f"data:image/png;base64,{img_str}"
\ No newline at end of file
+    if fmt == "svg":
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buffered)
+    else:
+        qr.make_image(fill_color='black', back_color='white').save(buffered, format="PNG")
+    return buffered.getvalue()
+
+def _totp_qr_key(user, fmt):
+    return f"totp_qr:{user.id}:{totp_secret_version(user)}:{fmt}"
+
+def render_totp_qr(user, fmt="png"):
+    """QR image bytes for the user's TOTP URI, memoized per (user, secret version, format)."""
+    key = _totp_qr_key(user, fmt)
+    image = cache.get(key)
+    if image is None:
+        image = _render_qr(generate_totp_uri(user), fmt)
+        cache.set(key, image, settings.TOTP_QR_CACHE_TTL)
+    return image
+
+def forget_totp_qr(user):
+    """Drops the memoized QR images for the user's current secret; the QR encodes the secret itself."""
+    cache.delete_many([_totp_qr_key(user, fmt) for fmt in QR_CONTENT_TYPES])
+
+def generate_totp_qr(user):
+    img_str = base64.b64encode(render_totp_qr(user, "png")).decode()
+    return f"data:image/png;base64,{img_str}"
@@ -2,18 +2,31 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from django.http import HttpResponse
+from django.db import transaction
+from django.urls import reverse
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
 import pyotp
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
 from django.conf import settings
 
 from .serializers import (
     UserRegisterSerializer, AdvocateRegisterSerializer, LoginSerializer,
-    ClientProfileSerializer, AdvocateProfileSerializer
+    ClientProfileSerializer, AdvocateProfileSerializer,
+    ForgetPasswordSerializer, ResetPasswordSerializer
 )
-from .tasks import send_welcome_email_task
+from .tasks import send_welcome_email_task, send_notification_email_task
+from .hashing import password_hash_pool
+from .otp import issue_otp, verify_otp
+from .directory import get_users_directory
+from .onboarding import bulk_register_advocates, BulkOnboardingError
+from .throttles import login_failures, mfa_failures
+from .images import schedule_profile_thumbnail
+from .google_auth import google_verifier
+from .audit import audit_log
+from .introspection import introspect_tokens, revoke_token, revoke_user_tokens
+from .tokens import get_tokens_for_user, bump_claims_version
+from .utils import generate_totp_uri, render_totp_qr, forget_totp_qr, totp_secret_version, QR_CONTENT_TYPES
 
 User = get_user_model()
 
@@ -25,11 +38,6 @@ def custom_response(message, status_code=200, status_type="success", data=None):
     return Response(response, status=status_code)
 
 
-def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
-    return {"access": str(refresh.access_token), "refresh": str(refresh)}
-
-
 # ------------------------- Registration Views -------------------------
 class UserRegisterView(APIView):
     permission_classes = [AllowAny]
@@ -48,7 +56,11 @@ class AdvocateRegisterView(APIView):
 
     def post(self, request):
         payload = request.data
-        advocates = payload.get("advocates") if isinstance(payload, dict) else (payload if isinstance(payload, list) else [payload])
+        advocates = payload.get("advocates", [payload]) if isinstance(payload, dict) else (payload if isinstance(payload, list) else [payload])
+        if request.query_params.get("mode") == "bulk":
+            if not request.user.is_staff:
+                return custom_response("Bulk onboarding requires an admin", 403, "error")
+            return self.bulk_register(advocates)
         created_users = []
 
         for adv_data in advocates:
@@ -61,6 +73,21 @@ class AdvocateRegisterView(APIView):
 
         return custom_response("Advocate(s) registered successfully", 201, data={"user_ids": [u.id for u in created_users]})
 
+    def bulk_register(self, advocates):
+        if not isinstance(advocates, list) or not advocates:
+            return custom_response("advocates must be a non-empty list", 400, "error")
+        if len(advocates) > settings.BULK_ONBOARDING_MAX_ROWS:
+            return custom_response(f"At most {settings.BULK_ONBOARDING_MAX_ROWS} advocates per request", 400, "error")
+        try:
+            created, errors = bulk_register_advocates(advocates)
+        except BulkOnboardingError as e:
+            return custom_response(str(e), 409, "error")
+
+        data = {"created": created, "errors": errors}
+        if not created:
+            return custom_response("No advocates registered", 400, "error", data=data)
+        return custom_response(f"{len(created)} of {len(advocates)} advocate(s) registered", 201, data=data)
+
 
 # ------------------------- Login Views -------------------------
 class LoginView(APIView):
@@ -68,14 +95,18 @@ class LoginView(APIView):
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        if not serializer.is_valid():
+            audit_log.record("login_failed", email=str(request.data.get("email", "")), request=request)
+            raise ValidationError(serializer.errors)
         user = serializer.validated_data["user"]
 
         if user.mfa_enabled:
             # MFA required, return minimal info
+            audit_log.record("login_mfa_required", user=user, request=request)
             return custom_response("MFA required", data={"user_id": user.id, "mfa_type": user.mfa_type})
 
         tokens = get_tokens_for_user(user)
+        audit_log.record("login_succeeded", user=user, request=request)
         return custom_response("Login successful", data={"user_id": user.id, "role": user.role, "tokens": tokens})
 
 
@@ -87,8 +118,9 @@ class GoogleLoginView(APIView):
         if not token:
             return custom_response("Google token required", 400, "error")
         try:
-            info = id_token.verify_oauth2_token(token, google_requests.Request(), settings.GOOGLE_CLIENT_ID)
+            info = google_verifier.verify(token)
         except ValueError:
+            audit_log.record("google_login_failed", request=request)
             return custom_response("Invalid Google token", 400, "error")
 
         email = info.get("email")
@@ -102,9 +134,11 @@ class GoogleLoginView(APIView):
             send_welcome_email_task.delay(user.email, getattr(user, "client_profile").full_name)
 
         if user.mfa_enabled:
+            audit_log.record("google_login_mfa_required", user=user, request=request)
             return custom_response("MFA required", data={"user_id": user.id, "mfa_type": user.mfa_type})
 
         tokens = get_tokens_for_user(user)
+        audit_log.record("google_login_succeeded", user=user, request=request)
         return custom_response("Google login successful", data={"user_id": user.id, "role": user.role, "tokens": tokens})
 
 
@@ -119,13 +153,67 @@ class EnableMFAView(APIView):
         if user.mfa_enabled:
             return custom_response("MFA already enabled", 400, "error")
 
-        secret = pyotp.random_base32()
-        user.mfa_secret = secret
+        # Enrollment stays pending (and the QR servable) until a code from the new secret is confirmed
+        if user.mfa_secret:
+            forget_totp_qr(user)
+        user.mfa_secret = pyotp.random_base32()
         user.mfa_type = "TOTP"
+        user.save(update_fields=["mfa_secret", "mfa_type"])
+        return custom_response("Scan the QR code and confirm with a code to enable MFA", data={
+            "mfa_type": "TOTP",
+            "totp_uri": generate_totp_uri(user),
+            "qr_url": request.build_absolute_uri(reverse("mfa-qr")),
+            "confirm_url": request.build_absolute_uri(reverse("confirm-mfa")),
+        })
+
+
+class ConfirmMFAView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        user = request.user
+        if user.mfa_enabled:
+            return custom_response("MFA already enabled", 400, "error")
+        if not user.mfa_secret:
+            return custom_response("No MFA enrollment pending", 400, "error")
+        otp = request.data.get("otp")
+        if not otp:
+            return custom_response("Missing fields", 400, "error")
+
+        mfa_failures.check(user.id)
+        if not pyotp.TOTP(user.mfa_secret).verify(otp):
+            mfa_failures.failure(user.id)
+            return custom_response("Invalid OTP", 400, "error")
+        mfa_failures.success(user.id)
+
         user.mfa_enabled = True
-        user.save()
-        totp_uri = pyotp.TOTP(secret).provisioning_uri(name=user.email, issuer_name="YourAppName")
-        return custom_response("MFA enabled", data={"mfa_type": "TOTP", "totp_uri": totp_uri})
+        user.save(update_fields=["mfa_enabled"])
+        bump_claims_version(user)
+        forget_totp_qr(user)
+        return custom_response("MFA enabled", data={"mfa_type": user.mfa_type})
+
+
+class TOTPQRCodeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        # The QR encodes the secret, so it is only served to finish a pending enrollment
+        if user.mfa_enabled or not user.mfa_secret:
+            return custom_response("No MFA enrollment pending", 404, "error")
+        fmt = request.query_params.get("type", "png")
+        if fmt not in QR_CONTENT_TYPES:
+            return custom_response("type must be png or svg", 400, "error")
+
+        # The ETag only depends on the secret, so polling clients get a 304 without a render.
+        etag = f'"{totp_secret_version(user)}-{fmt}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(render_totp_qr(user, fmt), content_type=QR_CONTENT_TYPES[fmt])
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
 
 class VerifyMFAView(APIView):
@@ -143,14 +231,60 @@ class VerifyMFAView(APIView):
         if not user.mfa_enabled:
             return custom_response("MFA not enabled, login successful")
 
+        mfa_failures.check(user.id)
         totp = pyotp.TOTP(user.mfa_secret)
         if not totp.verify(otp):
+            mfa_failures.failure(user.id)
+            audit_log.record("mfa_failed", user=user, request=request)
             return custom_response("Invalid OTP", 400, "error")
+        mfa_failures.success(user.id)
 
-        tokens = get_tokens_for_user(user)
+        tokens = get_tokens_for_user(user, mfa_verified=True)
+        audit_log.record("mfa_verified", user=user, request=request)
         return custom_response("MFA verified", data={"user_id": user.id, "role": user.role, "tokens": tokens})
 
 
+# ------------------------- Password Reset Views -------------------------
+class ForgetPasswordView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = ForgetPasswordSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = User.objects.get(email=serializer.validated_data["email"])
+
+        code = issue_otp(user)
+        send_notification_email_task.delay(
+            user.email,
+            "Your password reset code",
+            f"Your password reset code is {code}. It expires in {settings.OTP_TTL_MINUTES} minutes.",
+        )
+        return custom_response("OTP sent to email")
+
+
+class ResetPasswordView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = ResetPasswordSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        user = User.objects.filter(email=data["email"]).first()
+        if user is None or not verify_otp(user, data["otp"]):
+            return custom_response("Invalid or expired OTP", 400, "error")
+
+        password = password_hash_pool.make_password(data["new_password"])
+        with transaction.atomic():
+            user.password = password
+            user.save(update_fields=["password"])
+            # Whoever prompted the reset must not keep a session
+            bump_claims_version(user)
+            revoke_user_tokens(user)
+        login_failures.success(user.email.lower())
+        return custom_response("Password reset successful")
+
+
 # ------------------------- Profile Update Views -------------------------
 class ClientProfileUpdateView(APIView):
     permission_classes = [IsAuthenticated]
@@ -160,7 +294,11 @@ class ClientProfileUpdateView(APIView):
             return custom_response("Not a client", 403, "error")
         serializer = ClientProfileSerializer(request.user.client_profile, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            profile = serializer.save()
+            if "profile_image" in serializer.validated_data:
+                schedule_profile_thumbnail("client", profile)
+            bump_claims_version(request.user)
         return custom_response("Profile updated successfully")
 
 
@@ -172,5 +310,55 @@ class AdvocateProfileUpdateView(APIView):
             return custom_response("Not an advocate", 403, "error")
         serializer = AdvocateProfileSerializer(request.user.advocate_profile, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            profile = serializer.save()
+            if "profile_image" in serializer.validated_data:
+                schedule_profile_thumbnail("advocate", profile)
+            bump_claims_version(request.user)
         return custom_response("Profile updated successfully")
+
+
+# ------------------------- User Directory Views -------------------------
+class UserDirectoryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ids = request.data.get("ids")
+        if not isinstance(ids, list):
+            return custom_response("ids must be a list", 400, "error")
+        if len(ids) > settings.USER_DIRECTORY_MAX_IDS:
+            return custom_response(f"At most {settings.USER_DIRECTORY_MAX_IDS} ids per request", 400, "error")
+        return custom_response("Users fetched", data={"users": get_users_directory(ids)})
+
+
+# ------------------------- Token Introspection Views -------------------------
+class TokenIntrospectionView(APIView):
+    """
+    Lets other services check access tokens server-side (revocation, deactivated
+    users). Accepts {"token": "..."} or {"tokens": [...]} and answers from
+    in-memory state, so a batch costs at most one query.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def post(self, request):
+        if "tokens" in request.data:
+            tokens = request.data.get("tokens")
+            if not isinstance(tokens, list) or not all(isinstance(t, str) for t in tokens):
+                return custom_response("tokens must be a list of strings", 400, "error")
+            if len(tokens) > settings.TOKEN_INTROSPECTION_MAX_TOKENS:
+                return custom_response(f"At most {settings.TOKEN_INTROSPECTION_MAX_TOKENS} tokens per request", 400, "error")
+            return custom_response("Tokens introspected", data={"results": introspect_tokens(tokens)})
+
+        token = request.data.get("token")
+        if not isinstance(token, str) or not token:
+            return custom_response("token or tokens required", 400, "error")
+        return custom_response("Token introspected", data=introspect_tokens([token])[0])
+
+
+class LogoutView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        revoke_token(request.auth, user=request.user)
+        return custom_response("Logged out successfully")